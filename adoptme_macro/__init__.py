@@ -7,4 +7,17 @@ __all__ = [
     "hotkeys",
     "overlay",
     "runner",
+    "metrics",
+    "table_view",
+    "ui_queue",
+    "journal",
+    "storage_writer",
+    "profile_store",
+    "binfmt",
+    "dot_table",
+    "schema",
+    "spatial",
+    "history",
+    "tracing",
+    "profiling",
 ]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, List, Tuple
+
+from .models import AppState, Dot, Settings
+
+
+# Packed profile layout (all integers little-endian):
+#
+#   header    magic b"AMDT", u16 version, u16 flags, u32 dot count
+#   settings  u32 length + compact UTF-8 JSON
+#   strings   u32 count, u32[count] byte lengths, concatenated UTF-8
+#   ids       FLAG_HEX_IDS: 16 raw bytes per dot, else u32 string index per dot
+#   columns   i32 x[n], i32 y[n], u8 click_type[n], u32 name[n], i32 key[n], i32 delay[n]
+#
+# click_type is an index into CLICK_TYPES, or into the string table (offset by
+# len(CLICK_TYPES)) for values outside it when FLAG_EXTRA_TYPES is set.
+# key and delay use -1 for None.
+
+MAGIC = b"AMDT"
+VERSION = 1
+SUFFIX = ".amdots"
+
+FLAG_HEX_IDS = 1
+FLAG_EXTRA_TYPES = 2
+
+CLICK_TYPES = ("click", "double", "hold", "key")
+
+_HEADER = struct.Struct("<4sHHI")
+_U32 = struct.Struct("<I")
+_SWAP = sys.byteorder != "little"
+
+
+def _column(typecode: str, values) -> bytes:
+    a = array(typecode, values)
+    if _SWAP:
+        a.byteswap()
+    return a.tobytes()
+
+
+def _read_column(typecode: str, buf: memoryview, offset: int, n: int):
+    a = array(typecode)
+    end = offset + a.itemsize * n
+    if end > len(buf):
+        raise ValueError("Truncated profile")
+    a.frombytes(buf[offset:end])
+    if _SWAP:
+        a.byteswap()
+    return a, end
+
+
+def _is_hex_id(s: str) -> bool:
+    if len(s) != 32 or s != s.lower():
+        return False
+    try:
+        bytes.fromhex(s)
+    except ValueError:
+        return False
+    return True
+
+
+def dumps(state: AppState) -> bytes:
+    dots = state.dots
+    strings: List[str] = []
+    index: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        i = index.get(s)
+        if i is None:
+            i = index[s] = len(strings)
+            strings.append(s)
+        return i
+
+    flags = 0
+    hex_ids = all(_is_hex_id(d.id) for d in dots)
+    if hex_ids:
+        flags |= FLAG_HEX_IDS
+        id_col = b"".join(bytes.fromhex(d.id) for d in dots)
+    else:
+        id_col = _column("I", [intern(d.id) for d in dots])
+
+    types: List[int] = []
+    for d in dots:
+        try:
+            types.append(CLICK_TYPES.index(d.click_type))
+        except ValueError:
+            flags |= FLAG_EXTRA_TYPES
+            t = len(CLICK_TYPES) + intern(d.click_type)
+            if t > 255:
+                raise ValueError(f"Too many distinct click types to pack: {d.click_type!r}")
+            types.append(t)
+
+    names = [intern(d.name) for d in dots]
+    keys = [-1 if d.key is None else intern(str(d.key)) for d in dots]
+    delays = [-1 if d.delay_override_ms is None else int(d.delay_override_ms) for d in dots]
+
+    settings = json.dumps(state.settings.to_dict(), separators=(",", ":")).encode("utf-8")
+    encoded = [s.encode("utf-8") for s in strings]
+
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, flags, len(dots)),
+        _U32.pack(len(settings)),
+        settings,
+        _U32.pack(len(encoded)),
+        _column("I", [len(b) for b in encoded]),
+        b"".join(encoded),
+        id_col,
+        _column("i", [d.x for d in dots]),
+        _column("i", [d.y for d in dots]),
+        bytes(types),
+        _column("I", names),
+        _column("i", keys),
+        _column("i", delays),
+    ]
+    return b"".join(parts)
+
+
+def _read_prefix(buf: memoryview) -> Tuple[int, int, Settings, int]:
+    if len(buf) < _HEADER.size + _U32.size:
+        raise ValueError("Truncated profile")
+    magic, version, flags, n = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a packed profile")
+    if version > VERSION:
+        raise ValueError(f"Unsupported packed profile version {version}")
+    off = _HEADER.size
+
+    (slen,) = _U32.unpack_from(buf, off)
+    off += _U32.size
+    if off + slen > len(buf):
+        raise ValueError("Truncated profile")
+    settings = Settings.from_dict(json.loads(bytes(buf[off : off + slen]).decode("utf-8")))
+    return flags, n, settings, off + slen
+
+
+def read_header(data: bytes) -> Tuple[int, Settings]:
+    """Dot count and settings from the start of a packed profile, without decoding the dots."""
+    _flags, n, settings, _off = _read_prefix(memoryview(data))
+    return n, settings
+
+
+def loads(data: bytes) -> AppState:
+    buf = memoryview(data)
+    flags, n, settings, off = _read_prefix(buf)
+
+    (count,) = _U32.unpack_from(buf, off)
+    off += _U32.size
+    lengths, off = _read_column("I", buf, off, count)
+    strings: List[str] = []
+    for ln in lengths:
+        strings.append(bytes(buf[off : off + ln]).decode("utf-8"))
+        off += ln
+
+    ids: List[str]
+    if flags & FLAG_HEX_IDS:
+        end = off + 16 * n
+        raw = bytes(buf[off:end])
+        ids = [raw[i : i + 16].hex() for i in range(0, 16 * n, 16)]
+        off = end
+    else:
+        idx, off = _read_column("I", buf, off, n)
+        ids = [strings[i] for i in idx]
+
+    xs, off = _read_column("i", buf, off, n)
+    ys, off = _read_column("i", buf, off, n)
+    types = bytes(buf[off : off + n])
+    off += n
+    names, off = _read_column("I", buf, off, n)
+    keys, off = _read_column("i", buf, off, n)
+    delays, off = _read_column("i", buf, off, n)
+
+    nt = len(CLICK_TYPES)
+    dots: List[Dot] = []
+    for i in range(n):
+        t = types[i]
+        k = keys[i]
+        dl = delays[i]
+        dots.append(
+            Dot(
+                id=ids[i],
+                name=strings[names[i]],
+                x=xs[i],
+                y=ys[i],
+                click_type=CLICK_TYPES[t] if t < nt else strings[t - nt],
+                key=None if k < 0 else strings[k],
+                delay_override_ms=None if dl < 0 else dl,
+            )
+        )
+    return AppState(settings=settings, dots=dots)
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .models import Dot
+
+
+CLICK_TYPES = ("click", "double", "hold", "key")
+_NONE = -1
+
+
+class DotView:
+    """A ``Dot``-like handle onto one row of a :class:`DotTable`.
+
+    Reads and writes go straight to the table's columns. The table keeps
+    ``_i`` current when rows move, so a view stays attached to its dot; when
+    its row is removed the view keeps a private copy of it, like a ``Dot``
+    taken out of a list.
+    """
+
+    __slots__ = ("_t", "_i")
+
+    def __init__(self, table: "DotTable", row: int) -> None:
+        self._t = table
+        self._i = row
+
+    @property
+    def id(self) -> str:
+        return self._t._ids[self._i]
+
+    @id.setter
+    def id(self, v: str) -> None:
+        self._t._ids[self._i] = str(v)
+
+    @property
+    def name(self) -> str:
+        return self._t._names[self._i]
+
+    @name.setter
+    def name(self, v: str) -> None:
+        self._t._names[self._i] = str(v)
+
+    @property
+    def x(self) -> int:
+        return self._t._x[self._i]
+
+    @x.setter
+    def x(self, v: int) -> None:
+        self._t._x[self._i] = int(v)
+
+    @property
+    def y(self) -> int:
+        return self._t._y[self._i]
+
+    @y.setter
+    def y(self, v: int) -> None:
+        self._t._y[self._i] = int(v)
+
+    @property
+    def click_type(self) -> str:
+        return self._t._type_name(self._t._types[self._i])
+
+    @click_type.setter
+    def click_type(self, v: str) -> None:
+        self._t._types[self._i] = self._t._type_code(str(v))
+
+    @property
+    def key(self) -> Optional[str]:
+        return self._t._keys[self._i]
+
+    @key.setter
+    def key(self, v: Optional[str]) -> None:
+        self._t._keys[self._i] = v
+
+    @property
+    def delay_override_ms(self) -> Optional[int]:
+        v = self._t._delay[self._i]
+        return None if v == _NONE else v
+
+    @delay_override_ms.setter
+    def delay_override_ms(self, v: Optional[int]) -> None:
+        self._t._delay[self._i] = _NONE if v is None else max(0, int(v))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._t.row_dict(self._i)
+
+    def to_dot(self) -> Dot:
+        return Dot(**self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (DotView, Dot)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"DotView({self.to_dict()!r})"
+
+
+class DotTable(MutableSequence):
+    """Column-oriented container for dots.
+
+    Coordinates and delays live in ``array('i')`` columns and click types in
+    an ``array('B')`` of enum codes; ids, names and keys are plain lists.
+    Indexing yields :class:`DotView` objects, created on first access, so
+    code written against ``List[Dot]`` keeps working while bulk edits
+    (``set_positions``, ``offset``, ``scale``, ``set_delay``) run over whole
+    columns at once.
+    """
+
+    # AppState.pack_dots() switches to a table at this size.
+    THRESHOLD = 2000
+
+    def __init__(self, dots: Iterable[Any] = ()) -> None:
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._x = array("i")
+        self._y = array("i")
+        self._types = array("B")
+        self._keys: List[Optional[str]] = []
+        self._delay = array("i")
+        self._extra_types: List[str] = []
+        self._views: List[Optional[DotView]] = []
+        self.extend(dots)
+
+    # -- enum helpers -------------------------------------------------------
+
+    def _type_code(self, name: str) -> int:
+        try:
+            return CLICK_TYPES.index(name)
+        except ValueError:
+            pass
+        if name not in self._extra_types:
+            if len(CLICK_TYPES) + len(self._extra_types) >= 256:
+                raise ValueError(f"Too many distinct click types: {name!r}")
+            self._extra_types.append(name)
+        return len(CLICK_TYPES) + self._extra_types.index(name)
+
+    def _type_name(self, code: int) -> str:
+        if code < len(CLICK_TYPES):
+            return CLICK_TYPES[code]
+        return self._extra_types[code - len(CLICK_TYPES)]
+
+    # -- sequence protocol --------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _view(self, i: int) -> DotView:
+        v = self._views[i]
+        if v is None:
+            v = self._views[i] = DotView(self, i)
+        return v
+
+    def __getitem__(self, i: Union[int, slice]):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self._view(j) for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("DotTable index out of range")
+        return self._view(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._view(i)
+
+    def __setitem__(self, i: Union[int, slice], dot: Any) -> None:  # type: ignore[override]
+        if isinstance(i, slice):
+            rows = list(range(*i.indices(len(self))))
+            dots = list(dot)
+            if len(rows) != len(dots):
+                raise ValueError("DotTable slice assignment must keep the length")
+            for r, d in zip(rows, dots):
+                self[r] = d
+            return
+        if i < 0:
+            i += len(self)
+        if isinstance(dot, DotView) and dot._t is self and dot._i == i:
+            return
+        # An existing view of row ``i`` now shows the new values.
+        self._write_row(i, dot.to_dict())
+
+    def _write_row(self, i: int, d: Dict[str, Any]) -> None:
+        self._ids[i] = str(d["id"])
+        self._names[i] = str(d.get("name") or "")
+        self._x[i] = int(d.get("x") or 0)
+        self._y[i] = int(d.get("y") or 0)
+        self._types[i] = self._type_code(str(d.get("click_type") or "click"))
+        self._keys[i] = d.get("key")
+        delay = d.get("delay_override_ms")
+        self._delay[i] = _NONE if delay is None else max(0, int(delay))
+
+    def __delitem__(self, i: Union[int, slice]) -> None:  # type: ignore[override]
+        if isinstance(i, slice):
+            drop = set(range(*i.indices(len(self))))
+            self._take([r for r in range(len(self)) if r not in drop])
+            return
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("DotTable index out of range")
+        self._detach((i,))
+        for col in (self._ids, self._names, self._x, self._y, self._types, self._keys, self._delay, self._views):
+            del col[i]
+        for j in range(i, n - 1):
+            v = self._views[j]
+            if v is not None:
+                v._i = j
+
+    def insert(self, i: int, dot: Any) -> None:
+        n = len(self)
+        if i < 0:
+            i = max(0, i + n)
+        i = min(i, n)
+        self._ids.insert(i, "")
+        self._names.insert(i, "")
+        self._x.insert(i, 0)
+        self._y.insert(i, 0)
+        self._types.insert(i, 0)
+        self._keys.insert(i, None)
+        self._delay.insert(i, _NONE)
+        self._views.insert(i, None)
+        self._write_row(i, dot.to_dict())
+        for j in range(i + 1, n + 1):
+            v = self._views[j]
+            if v is not None:
+                v._i = j
+
+    def append(self, dot: Any) -> None:
+        self.insert(len(self), dot)
+
+    def extend(self, dots: Iterable[Any]) -> None:
+        for d in dots:
+            self.append(d)
+
+    def clear(self) -> None:
+        self._detach(range(len(self)))
+        self._ids.clear()
+        self._names.clear()
+        self._keys.clear()
+        self._views.clear()
+        for col in (self._x, self._y, self._types, self._delay):
+            del col[:]
+
+    def _take(self, rows: Sequence[int]) -> None:
+        """Keep only ``rows``, in that order (views follow their rows)."""
+        kept = set(rows)
+        self._detach(r for r in range(len(self)) if r not in kept)
+        self._ids = [self._ids[r] for r in rows]
+        self._names = [self._names[r] for r in rows]
+        self._keys = [self._keys[r] for r in rows]
+        self._x = array("i", (self._x[r] for r in rows))
+        self._y = array("i", (self._y[r] for r in rows))
+        self._types = array("B", (self._types[r] for r in rows))
+        self._delay = array("i", (self._delay[r] for r in rows))
+        self._views = [self._views[r] for r in rows]
+        for j, v in enumerate(self._views):
+            if v is not None:
+                v._i = j
+
+    def _detach(self, rows: Iterable[int]) -> None:
+        """Move views of ``rows`` (about to be dropped) onto one-row copies of their data."""
+        for r in rows:
+            v = self._views[r]
+            if v is not None:
+                solo = DotTable((Dot(**self.row_dict(r)),))
+                solo._views[0] = v
+                v._t, v._i = solo, 0
+                self._views[r] = None
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        rows = sorted(range(len(self)), key=(lambda r: key(self._view(r))) if key else (lambda r: self._ids[r]), reverse=reverse)
+        self._take(rows)
+
+    def remove_ids(self, ids: Iterable[str]) -> int:
+        drop = set(ids)
+        rows = [r for r, dot_id in enumerate(self._ids) if dot_id not in drop]
+        removed = len(self) - len(rows)
+        if removed:
+            self._take(rows)
+        return removed
+
+    # -- bulk edits ---------------------------------------------------------
+
+    def set_positions(self, x: int, y: int) -> None:
+        n = len(self)
+        self._x = array("i", [int(x)]) * n
+        self._y = array("i", [int(y)]) * n
+
+    def offset(self, dx: int, dy: int) -> None:
+        dx, dy = int(dx), int(dy)
+        self._x = array("i", [v + dx for v in self._x])
+        self._y = array("i", [v + dy for v in self._y])
+
+    def scale(self, fx: float, fy: float) -> None:
+        self._x = array("i", [int(round(v * fx)) for v in self._x])
+        self._y = array("i", [int(round(v * fy)) for v in self._y])
+
+    def set_delay(self, ms: Optional[int]) -> None:
+        self._delay = array("i", [_NONE if ms is None else max(0, int(ms))]) * len(self)
+
+    # -- conversion ---------------------------------------------------------
+
+    def row_dict(self, i: int) -> Dict[str, Any]:
+        delay = self._delay[i]
+        return {
+            "id": self._ids[i],
+            "name": self._names[i],
+            "x": self._x[i],
+            "y": self._y[i],
+            "click_type": self._type_name(self._types[i]),
+            "key": self._keys[i],
+            "delay_override_ms": None if delay == _NONE else delay,
+        }
+
+    def row_tuples(self) -> List[Tuple[Any, ...]]:
+        """Rows as ``(id, name, x, y, click_type, key, delay_override_ms)`` tuples."""
+        names = CLICK_TYPES + tuple(self._extra_types)
+        return [
+            (i, n, x, y, names[t], k, None if dl == _NONE else dl)
+            for i, n, x, y, t, k, dl in zip(self._ids, self._names, self._x, self._y, self._types, self._keys, self._delay)
+        ]
+
+    def to_dots(self) -> List[Dot]:
+        return [Dot(**self.row_dict(i)) for i in range(len(self))]
+
+    def copy(self) -> "DotTable":
+        t = DotTable()
+        t._ids = list(self._ids)
+        t._names = list(self._names)
+        t._keys = list(self._keys)
+        t._x = array("i", self._x)
+        t._y = array("i", self._y)
+        t._types = array("B", self._types)
+        t._delay = array("i", self._delay)
+        t._extra_types = list(self._extra_types)
+        t._views = [None] * len(self)
+        return t
+
+
+# Bulk helpers used by the app; they accept a DotTable or a plain list of dots.
+
+
+def set_positions(dots: Sequence[Any], x: int, y: int) -> None:
+    if isinstance(dots, DotTable):
+        dots.set_positions(x, y)
+        return
+    for d in dots:
+        d.x = x
+        d.y = y
+
+
+def set_delay(dots: Sequence[Any], ms: Optional[int]) -> None:
+    if isinstance(dots, DotTable):
+        dots.set_delay(ms)
+        return
+    for d in dots:
+        d.delay_override_ms = ms
+
+
+def scale_positions(dots: Sequence[Any], fx: float, fy: float) -> None:
+    if isinstance(dots, DotTable):
+        dots.scale(fx, fy)
+        return
+    for d in dots:
+        d.x = int(round(d.x * fx))
+        d.y = int(round(d.y * fy))
+
+
+def remove_ids(dots: List[Any], ids: Iterable[str]) -> int:
+    """Remove dots by id in place; returns how many were removed."""
+    if isinstance(dots, DotTable):
+        return dots.remove_ids(ids)
+    drop = set(ids)
+    before = len(dots)
+    dots[:] = [d for d in dots if d.id not in drop]
+    return before - len(dots)
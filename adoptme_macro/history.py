@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import Dot
+
+
+# A dot frozen as (id, name, x, y, click_type, key, delay_override_ms).
+Row = Tuple[Any, ...]
+
+CHUNK = 32
+
+
+def _rows(dots: Sequence[Any]) -> List[Row]:
+    from .dot_table import DotTable
+
+    if isinstance(dots, DotTable):
+        return dots.row_tuples()
+    return [(d.id, d.name, d.x, d.y, d.click_type, d.key, d.delay_override_ms) for d in dots]
+
+
+def _row_bytes(row: Row) -> int:
+    return sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row if isinstance(v, str))
+
+
+class DotSnapshot:
+    """Immutable dot list stored as a tuple of ``CHUNK``-row tuples.
+
+    Consecutive snapshots share every row and every chunk that did not
+    change, so a step only owns the rows it edited, the chunks holding them
+    and its spine.
+    """
+
+    __slots__ = ("chunks", "length")
+
+    def __init__(self, chunks: Tuple[Tuple[Row, ...], ...], length: int) -> None:
+        self.chunks = chunks
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def row(self, i: int) -> Row:
+        if not 0 <= i < self.length:
+            raise IndexError("snapshot index out of range")
+        return self.chunks[i // CHUNK][i % CHUNK]
+
+    def rows(self) -> Iterable[Row]:
+        for chunk in self.chunks:
+            yield from chunk
+
+    def to_dots(self) -> List[Dot]:
+        return [
+            Dot(id=r[0], name=r[1], x=r[2], y=r[3], click_type=r[4], key=r[5], delay_override_ms=r[6])
+            for r in self.rows()
+        ]
+
+    def full_bytes(self) -> int:
+        """Approximate size of everything this snapshot references."""
+        return (
+            sys.getsizeof(self.chunks)
+            + sum(sys.getsizeof(c) for c in self.chunks)
+            + sum(_row_bytes(r) for r in self.rows())
+        )
+
+    @staticmethod
+    def build(dots: Sequence[Any], prev: Optional["DotSnapshot"] = None) -> Tuple["DotSnapshot", int]:
+        """Snapshot ``dots``, reusing rows and chunks from ``prev``; returns it and the bytes it added."""
+        rows = _rows(dots)
+        if prev is None:
+            chunks = tuple(tuple(rows[i : i + CHUNK]) for i in range(0, len(rows), CHUNK))
+            snap = DotSnapshot(chunks, len(rows))
+            return snap, snap.full_bytes()
+
+        added = 0
+        by_id: Optional[Dict[Any, Row]] = None
+        for i, r in enumerate(rows):
+            old = prev.row(i) if i < prev.length else None
+            if old is not None and old == r:
+                rows[i] = old
+                continue
+            # Rows shift after an insert or delete; find the old copy by id.
+            if by_id is None:
+                by_id = {o[0]: o for o in prev.rows()}
+            old = by_id.get(r[0])
+            if old is not None and old == r:
+                rows[i] = old
+            else:
+                added += _row_bytes(r)
+
+        chunks: List[Tuple[Row, ...]] = []
+        for k, start in enumerate(range(0, len(rows), CHUNK)):
+            part = rows[start : start + CHUNK]
+            old_chunk = prev.chunks[k] if k < len(prev.chunks) else None
+            if old_chunk is not None and len(old_chunk) == len(part) and all(a is b for a, b in zip(old_chunk, part)):
+                chunks.append(old_chunk)
+            else:
+                chunk = tuple(part)
+                chunks.append(chunk)
+                added += sys.getsizeof(chunk)
+        spine = tuple(chunks)
+        added += sys.getsizeof(spine)
+        return DotSnapshot(spine, len(rows)), added
+
+
+class _Step:
+    __slots__ = ("snapshot", "label", "cost")
+
+    def __init__(self, snapshot: DotSnapshot, label: str, cost: int) -> None:
+        self.snapshot = snapshot
+        self.label = label
+        self.cost = cost
+
+
+class History:
+    """Undo/redo over dot lists, bounded by an approximate memory budget.
+
+    ``commit`` records the dots after an edit; ``undo``/``redo`` return the
+    snapshot to restore (any step is a list index away). The oldest steps are
+    dropped once the steps' combined cost exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.max_bytes = max(1, int(max_bytes))
+        self._steps: List[_Step] = []
+        self._pos = -1
+        self.bytes = 0
+
+    def reset(self, dots: Sequence[Any]) -> None:
+        snap, cost = DotSnapshot.build(dots)
+        self._steps = [_Step(snap, "", cost)]
+        self._pos = 0
+        self.bytes = cost
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    @property
+    def current(self) -> Optional[DotSnapshot]:
+        return self._steps[self._pos].snapshot if self._steps else None
+
+    def commit(self, dots: Sequence[Any], label: str = "") -> bool:
+        """Record ``dots`` as a new step; False when nothing changed."""
+        if not self._steps:
+            self.reset(dots)
+            return False
+        prev = self._steps[self._pos].snapshot
+        snap, cost = DotSnapshot.build(dots, prev)
+        if snap.chunks == prev.chunks:
+            return False
+        for step in self._steps[self._pos + 1 :]:
+            self.bytes -= step.cost
+        del self._steps[self._pos + 1 :]
+        self._steps.append(_Step(snap, label, cost))
+        self._pos += 1
+        self.bytes += cost
+        self._trim()
+        return True
+
+    def _trim(self) -> None:
+        while self.bytes > self.max_bytes and self._pos > 0:
+            dropped = self._steps.pop(0)
+            self._pos -= 1
+            # The new oldest step now owns everything it references.
+            base = self._steps[0]
+            full = base.snapshot.full_bytes()
+            self.bytes += full - base.cost - dropped.cost
+            base.cost = full
+
+    def can_undo(self) -> bool:
+        return self._pos > 0
+
+    def can_redo(self) -> bool:
+        return 0 <= self._pos < len(self._steps) - 1
+
+    def undo_label(self) -> Optional[str]:
+        return self._steps[self._pos].label if self.can_undo() else None
+
+    def redo_label(self) -> Optional[str]:
+        return self._steps[self._pos + 1].label if self.can_redo() else None
+
+    def undo(self) -> Optional[DotSnapshot]:
+        if not self.can_undo():
+            return None
+        self._pos -= 1
+        return self._steps[self._pos].snapshot
+
+    def redo(self) -> Optional[DotSnapshot]:
+        if not self.can_redo():
+            return None
+        self._pos += 1
+        return self._steps[self._pos].snapshot
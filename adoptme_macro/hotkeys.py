@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import logging
+import time
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
-from pynput import keyboard  # type: ignore
+if TYPE_CHECKING:
+    from pynput import keyboard  # type: ignore
 
 
 def _normalize_hotkey(hk: str) -> str:
@@ -51,7 +54,130 @@ class HotkeyConfig:
     emergency_stop: str = "<ctrl>+<shift>+s"
 
 
+# Side-specific modifier names folded onto the generic ones used in bindings.
+_MODIFIER_ALIASES = {
+    "ctrl_l": "ctrl",
+    "ctrl_r": "ctrl",
+    "shift_l": "shift",
+    "shift_r": "shift",
+    "shift": "shift",
+    "alt_l": "alt",
+    "alt_r": "alt",
+    "alt_gr": "alt",
+    "cmd_l": "cmd",
+    "cmd_r": "cmd",
+}
+
+
+# A key-down older than this with no repeat is treated as a lost key-up
+# (focus change, lock screen, UAC prompt) and dropped from the held set.
+HOTKEY_STALE_S = 30.0
+
+Bindings = Union[Dict[str, Callable[[], None]], Iterable[Tuple[str, Callable[[], None]]]]
+
+
+def parse_hotkey(hk: str) -> FrozenSet[str]:
+    """The set of key names that make up ``hk`` (e.g. ``{"ctrl", "shift", "s"}``)."""
+    out = set()
+    for part in _normalize_hotkey(hk).split("+"):
+        if not part:
+            continue
+        name = part[1:-1] if part.startswith("<") and part.endswith(">") else part
+        out.add(_MODIFIER_ALIASES.get(name, name))
+    return frozenset(out)
+
+
+class HotkeyMatcher:
+    """Matches key press/release events against a binding table.
+
+    The table maps key-name sets to callbacks and is replaced wholesale by
+    ``bind`` (a single reference swap), so rebinding never leaves a window
+    where no binding is active. A combo fires once when its last key goes
+    down while all of its keys are held; other held keys (movement keys in
+    game) are ignored, and when several combos match the largest wins.
+    Auto-repeat does not re-fire, and keys whose key-up was lost expire
+    after ``stale_s``.
+    """
+
+    def __init__(self, mapping: Optional[Bindings] = None, stale_s: float = HOTKEY_STALE_S) -> None:
+        # (combo -> callback, key -> combos containing it, largest first)
+        self._bound: Tuple[Dict[FrozenSet[str], Callable[[], None]], Dict[str, List[FrozenSet[str]]]] = ({}, {})
+        self._pressed: Dict[str, float] = {}
+        self.stale_s = float(stale_s)
+        if mapping:
+            self.bind(mapping)
+
+    def bind(self, mapping: Bindings) -> None:
+        """Replace the binding table; a dict or ``(hotkey, callback)`` pairs."""
+        items = mapping.items() if isinstance(mapping, dict) else mapping
+        table: Dict[FrozenSet[str], Callable[[], None]] = {}
+        for hk, fn in items:
+            combo = parse_hotkey(hk)
+            if combo in table:
+                raise ValueError(f"Hotkey {hk!r} is bound twice")
+            table[combo] = fn
+        by_key: Dict[str, List[FrozenSet[str]]] = {}
+        for combo in sorted(table, key=len, reverse=True):
+            for name in combo:
+                by_key.setdefault(name, []).append(combo)
+        self._bound = (table, by_key)
+
+    def bindings(self) -> Dict[FrozenSet[str], Callable[[], None]]:
+        return dict(self._bound[0])
+
+    def press(self, name: Optional[str]) -> Optional[Callable[[], None]]:
+        """Feed a key-down; returns the callback to run, if this completed a combo."""
+        if not name:
+            return None
+        name = _MODIFIER_ALIASES.get(name, name)
+        now = time.monotonic()
+        pressed = self._pressed
+        repeat = name in pressed
+        pressed[name] = now
+        if repeat:
+            return None
+        cutoff = now - self.stale_s
+        for k in [k for k, t in pressed.items() if t < cutoff]:
+            del pressed[k]
+        table, by_key = self._bound
+        for combo in by_key.get(name, ()):
+            if all(k in pressed for k in combo):
+                return table[combo]
+        return None
+
+    def release(self, name: Optional[str]) -> None:
+        if name:
+            self._pressed.pop(_MODIFIER_ALIASES.get(name, name), None)
+
+    def reset(self) -> None:
+        self._pressed.clear()
+
+
+def _key_name(key: Any) -> Optional[str]:
+    """Name of a (canonical) pynput key: its character, its Key name, or ``vk<N>``."""
+    char = getattr(key, "char", None)
+    if char and char.isprintable():
+        return char.lower()
+    name = getattr(key, "name", None)
+    if name:
+        return str(name)
+    vk = getattr(key, "vk", None)
+    if vk is None:
+        return None
+    # With Ctrl held Windows reports letters as control characters (Ctrl+S is
+    # "\x13"); the virtual key code of a letter or digit is its ASCII code.
+    if 0x30 <= vk <= 0x39 or 0x41 <= vk <= 0x5A:
+        return chr(vk).lower()
+    return f"vk{vk}"
+
+
 class HotkeyManager:
+    """Global hotkeys on one long-lived pynput keyboard listener.
+
+    ``update`` only swaps the matcher's binding table; the listener thread
+    keeps running, so no hotkey (emergency stop included) is ever unhooked.
+    """
+
     def __init__(
         self,
         config: HotkeyConfig,
@@ -63,18 +189,29 @@ class HotkeyManager:
         self._on_start_stop = on_start_stop
         self._on_pause_resume = on_pause_resume
         self._on_emergency_stop = on_emergency_stop
-        self._listener: Optional[keyboard.GlobalHotKeys] = None
+        self.matcher = HotkeyMatcher(self._mapping(config))
+        self._listener: Optional[keyboard.Listener] = None
+        self._logger = logging.getLogger("adoptme_macro")
+        # perf_counter() time of the key event that fired the running callback.
+        self.last_event_t = 0.0
+
+    def _mapping(self, config: HotkeyConfig) -> List[Tuple[str, Callable[[], None]]]:
+        return [
+            (config.start_stop, self._on_start_stop),
+            (config.pause_resume, self._on_pause_resume),
+            (config.emergency_stop, self._on_emergency_stop),
+        ]
 
     def start(self) -> None:
-        mapping: Dict[str, Callable[[], None]] = {
-            _normalize_hotkey(self._config.start_stop): self._on_start_stop,
-            _normalize_hotkey(self._config.pause_resume): self._on_pause_resume,
-            _normalize_hotkey(self._config.emergency_stop): self._on_emergency_stop,
-        }
-        new_listener = keyboard.GlobalHotKeys(mapping)
-        self.stop()
-        self._listener = new_listener
-        self._listener.start()
+        if self._listener is not None:
+            return
+        # pynput pulls in the platform keyboard hooks; only pay for that once hotkeys start.
+        from pynput import keyboard  # type: ignore
+
+        listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
+        self.matcher.reset()
+        self._listener = listener
+        listener.start()
 
     def stop(self) -> None:
         if self._listener is not None:
@@ -83,7 +220,48 @@ class HotkeyManager:
             except Exception:
                 pass
             self._listener = None
+        self.matcher.reset()
 
     def update(self, config: HotkeyConfig) -> None:
+        """Rebind; raises ValueError for an invalid or duplicated hotkey and keeps the old bindings."""
+        self.matcher.bind(self._mapping(config))
         self._config = config
         self.start()
+
+    def _canonical(self, key: Any) -> Any:
+        listener = self._listener
+        if listener is None:
+            return key
+        try:
+            return listener.canonical(key)
+        except Exception:
+            return key
+
+    def _name(self, key: Any) -> Optional[str]:
+        # Key members (f6, ctrl_l, ...) are named before canonicalising:
+        # canonical() turns non-modifier Keys into bare vk KeyCodes, which
+        # have neither a char nor a name.
+        name = getattr(key, "name", None)
+        if name:
+            return _MODIFIER_ALIASES.get(name, name)
+        char = getattr(key, "char", None)
+        if char and not char.isprintable():
+            return _key_name(key)  # canonical() would keep the char and drop the vk
+        return _key_name(self._canonical(key))
+
+    def _on_press(self, key: Any) -> None:
+        t0 = time.perf_counter()
+        fn = self.matcher.press(self._name(key))
+        if fn is None:
+            return
+        self.last_event_t = t0
+        try:
+            fn()
+        except Exception:
+            try:
+                self._logger.exception("Hotkey callback failed")
+            except Exception:
+                pass
+
+    def _on_release(self, key: Any) -> None:
+        self.matcher.release(self._name(key))
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from .models import AppState, Dot, Settings
+
+if TYPE_CHECKING:
+    from .storage_writer import StorageWriter
+
+
+# Record shapes, one compact JSON object per line:
+#   {"op": "dot", "dot": {...}}          insert or replace a dot (appended if new)
+#   {"op": "del", "ids": [...]}          remove dots
+#   {"op": "clear"}                      remove every dot
+#   {"op": "order", "ids": [...]}        reorder dots
+#   {"op": "settings", "values": {...}}  changed settings keys
+# Every record carries absolute values, so replaying records that are already
+# part of the snapshot (e.g. after a crash between snapshot and truncate) is harmless.
+
+
+class ChangeJournal:
+    """Append-only log of small edits made since the last full config snapshot."""
+
+    COMPACT_RECORDS = 500
+    COMPACT_BYTES = 256 * 1024
+
+    def __init__(self, path: Path, writer: Optional["StorageWriter"] = None) -> None:
+        self._path = path
+        self._writer = writer
+        self._settings: Optional[Dict[str, Any]] = None
+        self.records = 0
+        try:
+            self.bytes = path.stat().st_size
+        except OSError:
+            self.bytes = 0
+
+    def reset(self, state: AppState) -> None:
+        """Call after a snapshot of ``state`` was written (and the journal truncated)."""
+        self._settings = state.settings.to_dict()
+        self.records = 0
+        self.bytes = 0
+
+    def resume(self, state: AppState) -> int:
+        """Call after loading ``state`` with this journal replayed on top.
+
+        The replayed records stay on disk until the next snapshot, so they
+        count toward compaction; returns how many there are.
+        """
+        self._settings = state.settings.to_dict()
+        try:
+            raw = self._path.read_bytes()
+        except OSError:
+            raw = b""
+        self.records = sum(1 for line in raw.splitlines() if line.strip())
+        self.bytes = len(raw)
+        return self.records
+
+    def needs_compaction(self) -> bool:
+        return self.records >= self.COMPACT_RECORDS or self.bytes >= self.COMPACT_BYTES
+
+    def record(
+        self,
+        dots: Iterable[Dot] = (),
+        removed: Iterable[str] = (),
+        order: Optional[List[str]] = None,
+        settings: Optional[Settings] = None,
+        cleared: bool = False,
+    ) -> None:
+        records: List[Dict[str, Any]] = []
+        if cleared:
+            records.append({"op": "clear"})
+        removed = list(removed)
+        if removed:
+            records.append({"op": "del", "ids": removed})
+        for d in dots:
+            records.append({"op": "dot", "dot": d.to_dict()})
+        if order is not None:
+            records.append({"op": "order", "ids": list(order)})
+        if settings is not None:
+            current = settings.to_dict()
+            base = self._settings or {}
+            changed = {k: v for k, v in current.items() if base.get(k, object()) != v}
+            if changed:
+                records.append({"op": "settings", "values": changed})
+                self._settings = current
+        if records:
+            self._append(records)
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        text = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+        data = text.encode("utf-8")
+        if self._writer is not None:
+            self._writer.append(self._path, data)
+        else:
+            with open(self._path, "ab") as f:
+                f.write(data)
+        self.records += len(records)
+        self.bytes += len(data)
+
+
+def apply_record(state: AppState, rec: Dict[str, Any], pos: Optional[Dict[str, int]] = None) -> Optional[Dict[str, int]]:
+    """Apply one record to ``state``.
+
+    ``pos`` is an optional id -> index cache for ``state.dots``; the (possibly
+    rebuilt or invalidated) cache is returned so replaying many records stays linear.
+    """
+    op = rec.get("op")
+    if op == "dot":
+        dot = Dot.from_dict(rec.get("dot") or {})
+        if pos is None:
+            pos = {d.id: i for i, d in enumerate(state.dots)}
+        i = pos.get(dot.id)
+        if i is None:
+            pos[dot.id] = len(state.dots)
+            state.dots.append(dot)
+        else:
+            state.dots[i] = dot
+        return pos
+    if op == "del":
+        ids = set(rec.get("ids") or [])
+        state.dots = [d for d in state.dots if d.id not in ids]
+    elif op == "clear":
+        state.dots = []
+    elif op == "order":
+        order = {dot_id: i for i, dot_id in enumerate(rec.get("ids") or [])}
+        state.dots.sort(key=lambda d: order.get(d.id, len(order)))
+    elif op == "settings":
+        values = rec.get("values") or {}
+        state.settings = Settings.from_dict({**state.settings.to_dict(), **values})
+        return pos
+    return None
+
+
+def replay(state: AppState, path: Path) -> int:
+    """Apply journal records in ``path`` on top of ``state``; returns how many were applied."""
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return 0
+
+    applied = 0
+    pos: Optional[Dict[str, int]] = None
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            # A torn final write after a crash; everything before it is intact.
+            break
+        if isinstance(rec, dict):
+            pos = apply_record(state, rec, pos)
+            applied += 1
+    return applied
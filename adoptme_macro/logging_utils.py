@@ -1,58 +1,280 @@
 from __future__ import annotations
 
+import atexit
+import gzip
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
 from pathlib import Path
+from typing import List, Optional
 
 from .models import Settings
 from .storage import logs_dir
 
 
+# Records waiting for the writer thread; beyond this new records are dropped
+# (and counted) instead of blocking the thread that logs them.
+LOG_QUEUE_SIZE = 10_000
+
+_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+
+# macro.log is rotated once it reaches LOG_MAX_BYTES or is LOG_ROTATE_SECONDS
+# old; rotated files are gzipped and the oldest are deleted once all of them
+# together exceed LOG_BUDGET_BYTES.
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_ROTATE_SECONDS = 24 * 60 * 60
+LOG_BUDGET_BYTES = 50 * 1024 * 1024
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler over a bounded queue that never blocks the caller."""
+
+    def __init__(self, q: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Appends to one file, rotating it by size or age.
+
+    A rotated file is renamed to ``<name>.<timestamp>`` and gzipped on a
+    short-lived thread so the log writer is not held up; afterwards the
+    oldest rotated files are removed until they fit in ``budget_bytes``.
+    The time the current file was started is kept in ``<name>-start`` so its
+    age survives restarts that keep appending to it.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        max_bytes: int = LOG_MAX_BYTES,
+        interval_s: float = LOG_ROTATE_SECONDS,
+        budget_bytes: int = LOG_BUDGET_BYTES,
+    ) -> None:
+        super().__init__(str(filename), mode="a", maxBytes=max_bytes, backupCount=0, encoding="utf-8")
+        self.interval_s = float(interval_s)
+        self.budget_bytes = int(budget_bytes)
+        self._rollover_at = self._next_rollover(Path(self.baseFilename))
+        self._compressors: List[threading.Thread] = []
+
+    def _next_rollover(self, path: Path) -> float:
+        # Age counts from the file's first write. mtime is only the last write,
+        # so it is a fallback for a file that predates the start sidecar.
+        start: Optional[float] = None
+        try:
+            st = path.stat()
+            if st.st_size:
+                start = _read_segment_start(path)
+                if start is None:
+                    start = getattr(st, "st_birthtime", st.st_mtime)
+                    _write_segment_start(path, start)
+        except OSError:
+            pass
+        if start is None:
+            start = time.time()
+            _write_segment_start(path, start)
+        return start + self.interval_s if self.interval_s > 0 else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if time.time() >= self._rollover_at:
+            return 1
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None  # type: ignore[assignment]
+        base = Path(self.baseFilename)
+        try:
+            if base.exists() and base.stat().st_size > 0:
+                rotated = _rotated_name(base)
+                os.replace(base, rotated)
+                t = threading.Thread(target=self._compress, args=(rotated,), name="log-compress", daemon=True)
+                self._compressors = [c for c in self._compressors if c.is_alive()] + [t]
+                t.start()
+        finally:
+            now = time.time()
+            _write_segment_start(base, now)
+            self._rollover_at = now + self.interval_s if self.interval_s > 0 else float("inf")
+            self.stream = self._open()
+
+    def _compress(self, path: Path) -> None:
+        gz = path.with_name(path.name + ".gz")
+        tmp = gz.with_name(gz.name + ".tmp")
+        try:
+            with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp, gz)
+            path.unlink()
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        prune_logs(Path(self.baseFilename), self.budget_bytes)
+
+    def close(self) -> None:
+        super().close()
+        for t in self._compressors:
+            t.join(timeout=5.0)
+        self._compressors = []
+
+
+def _segment_start_path(base: Path) -> Path:
+    # Not "<name>.<suffix>", so rotated_logs() and pruning never pick it up.
+    return base.with_name(base.name + "-start")
+
+
+def _read_segment_start(base: Path) -> Optional[float]:
+    try:
+        return float(_segment_start_path(base).read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_segment_start(base: Path, start: float) -> None:
+    try:
+        _segment_start_path(base).write_text(f"{start:.3f}\n", encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _rotated_name(base: Path) -> Path:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    candidate = base.with_name(f"{base.name}.{stamp}")
+    n = 1
+    while candidate.exists() or candidate.with_name(candidate.name + ".gz").exists():
+        candidate = base.with_name(f"{base.name}.{stamp}-{n}")
+        n += 1
+    return candidate
+
+
+def rotated_logs(base: Path) -> List[Path]:
+    """Rotated copies of ``base`` (compressed or not), oldest first."""
+    out = [p for p in base.parent.glob(base.name + ".*") if not p.name.endswith(".tmp")]
+    return sorted(out, key=lambda p: (p.stat().st_mtime, p.name))
+
+
+def prune_logs(base: Path, budget_bytes: int) -> int:
+    """Delete the oldest rotated logs until they fit in ``budget_bytes``; returns how many were removed."""
+    try:
+        files = [(p, p.stat().st_size) for p in rotated_logs(base)]
+    except OSError:
+        return 0
+    total = sum(size for _p, size in files)
+    removed = 0
+    for p, size in files:
+        if total <= budget_bytes:
+            break
+        try:
+            p.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def tail_lines(path: Path, n: int = 200, block: int = 8192) -> List[str]:
+    """The last ``n`` lines of ``path``, reading backwards from the end in ``block``-sized steps."""
+    if n <= 0:
+        return []
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks: List[bytes] = []
+        newlines = 0
+        # n lines need n newlines before them, plus one more unless we hit the start.
+        while pos > 0 and newlines <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+        data = b"".join(reversed(chunks))
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if pos > 0 and lines:
+        lines = lines[1:]  # the first line may be cut
+    return lines[-n:]
+
+
+_queue_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def configure_logging(settings: Settings) -> logging.Logger:
+    """Route the app logger through a bounded queue to a background writer thread.
+
+    The file and console handlers run on the QueueListener's thread, so a
+    slow disk never stalls the caller. The logger's own level follows
+    ``debug_mode``; Logger caches that check, so a disabled ``debug()`` call
+    returns before a record is built.
+    """
+    global _queue_handler, _listener
+
     logger = logging.getLogger("adoptme_macro")
 
     if getattr(logger, "_configured", False):
         _apply_logger_settings(logger, settings)
         return logger
 
-    logger.setLevel(logging.DEBUG)
-
-    fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+    level = _level(settings)
+    logger.setLevel(level)
 
-    level = logging.DEBUG if settings.debug_mode else logging.INFO
+    fmt = logging.Formatter(_FORMAT)
+    handlers: List[logging.Handler] = []
 
     if settings.enable_logs:
-        log_path = _log_file_path()
-        fh = logging.FileHandler(str(log_path), mode="w", encoding="utf-8")
+        fh = CompressingRotatingFileHandler(log_file_path())
         fh.setLevel(level)
         fh.setFormatter(fmt)
-        logger.addHandler(fh)
+        handlers.append(fh)
 
     sh = logging.StreamHandler()
     sh.setLevel(level)
     sh.setFormatter(fmt)
-    logger.addHandler(sh)
+    handlers.append(sh)
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(_queue_handler)
+    atexit.register(shutdown_logging)
 
     logger._configured = True  # type: ignore[attr-defined]
     return logger
 
 
+def _level(settings: Settings) -> int:
+    return logging.DEBUG if settings.debug_mode else logging.INFO
+
+
 def _apply_logger_settings(logger: logging.Logger, settings: Settings) -> None:
-    level = logging.DEBUG if settings.debug_mode else logging.INFO
+    level = _level(settings)
+    try:
+        logger.setLevel(level)
+    except Exception:
+        pass
 
-    file_handlers: list[logging.Handler] = []
-    stream_handlers: list[logging.Handler] = []
-    for h in list(getattr(logger, "handlers", []) or []):
-        if isinstance(h, logging.FileHandler):
-            file_handlers.append(h)
-        elif isinstance(h, logging.StreamHandler):
-            stream_handlers.append(h)
+    handlers = list(_listener.handlers) if _listener is not None else []
+    file_handlers = [h for h in handlers if isinstance(h, logging.FileHandler)]
 
-    for h in file_handlers:
-        try:
-            h.setLevel(level)
-        except Exception:
-            pass
-    for h in stream_handlers:
+    for h in handlers:
         try:
             h.setLevel(level)
         except Exception:
@@ -61,24 +283,59 @@ def _apply_logger_settings(logger: logging.Logger, settings: Settings) -> None:
     if settings.enable_logs:
         if not file_handlers:
             try:
-                fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-                fh = logging.FileHandler(str(_log_file_path()), mode="a", encoding="utf-8")
+                fh = CompressingRotatingFileHandler(log_file_path())
                 fh.setLevel(level)
-                fh.setFormatter(fmt)
-                logger.addHandler(fh)
+                fh.setFormatter(logging.Formatter(_FORMAT))
+                handlers.append(fh)
             except Exception:
                 pass
     else:
+        for h in file_handlers:
+            handlers.remove(h)
+
+    if _listener is not None:
+        # The listener reads this tuple per record; swapping it is atomic.
+        _listener.handlers = tuple(handlers)
+    if not settings.enable_logs:
         for h in file_handlers:
             try:
-                logger.removeHandler(h)
+                h.close()
             except Exception:
                 pass
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def shutdown_logging() -> None:
+    """Drain the queue and stop the writer thread (safe to call more than once)."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    try:
+        listener.stop()
+    except Exception:
+        pass
+    logger = logging.getLogger("adoptme_macro")
+    if _queue_handler is not None and _queue_handler.dropped:
+        msg = f"Logging dropped {_queue_handler.dropped} records (queue full)"
+        record = logger.makeRecord(logger.name, logging.WARNING, __file__, 0, msg, None, None)
+        for h in listener.handlers:
             try:
-                h.close()
+                h.handle(record)
             except Exception:
                 pass
+    for h in listener.handlers:
+        try:
+            h.close()
+        except Exception:
+            pass
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+    logger._configured = False  # type: ignore[attr-defined]
 
 
-def _log_file_path() -> Path:
+def log_file_path() -> Path:
     return logs_dir() / "macro.log"
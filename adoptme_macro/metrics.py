@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class LatencyStats:
+    def __init__(self, maxlen: int = 512) -> None:
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=maxlen)
+        self._count = 0
+        self._max = 0.0
+
+    def add(self, ms: float) -> None:
+        ms = float(ms)
+        with self._lock:
+            self._samples.append(ms)
+            self._count += 1
+            if ms > self._max:
+                self._max = ms
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+            peak = self._max
+        if not samples:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        return {
+            "count": count,
+            "mean": sum(samples) / len(samples),
+            "p50": samples[len(samples) // 2],
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "max": peak,
+        }
+
+
+_lock = threading.Lock()
+_stats: Dict[str, LatencyStats] = {}
+
+
+def stats(name: str) -> LatencyStats:
+    with _lock:
+        st = _stats.get(name)
+        if st is None:
+            st = LatencyStats()
+            _stats[name] = st
+        return st
+
+
+def record(name: str, ms: float) -> None:
+    stats(name).add(ms)
+
+
+def snapshot_all() -> Dict[str, Dict[str, float]]:
+    with _lock:
+        items = list(_stats.items())
+    return {name: st.snapshot() for name, st in items}
+
+
+def format_stats(name: str) -> str:
+    s = stats(name).snapshot()
+    return f"{name}: n={int(s['count'])} mean={s['mean']:.2f}ms p95={s['p95']:.2f}ms max={s['max']:.2f}ms"
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import itertools
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 from uuid import uuid4
 
+from .schema import SCHEMA_VERSION, Schema
+
 
 @dataclass
 class Dot:
@@ -16,27 +19,11 @@ class Dot:
     delay_override_ms: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "x": self.x,
-            "y": self.y,
-            "click_type": self.click_type,
-            "key": self.key,
-            "delay_override_ms": self.delay_override_ms,
-        }
+        return DOT_SCHEMA.to_dict(self)
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Dot":
-        return Dot(
-            id=str(data.get("id") or uuid4().hex),
-            name=str(data.get("name") or ""),
-            x=int(data.get("x") or 0),
-            y=int(data.get("y") or 0),
-            click_type=str(data.get("click_type") or "click"),
-            key=data.get("key"),
-            delay_override_ms=data.get("delay_override_ms"),
-        )
+    def from_dict(data: Dict[str, Any], issues: Optional[List[str]] = None) -> "Dot":
+        return DOT_SCHEMA.from_dict(data, issues)
 
 
 @dataclass
@@ -61,6 +48,7 @@ class Settings:
     default_infinite_loops: bool = True
     debug_mode: bool = False
     enable_logs: bool = True
+    trace_runs: bool = False
     autosave_config: bool = True
 
     test_mode: bool = False
@@ -76,52 +64,37 @@ class Settings:
 
     post_action: str = "none"  # none | beep | message | close
 
+    profile_store: str = "json"  # json | sqlite
+    undo_memory_mb: int = 16
+
     tos_accepted_version: int = 0
     discord_prompt_shown: bool = False
     access_key_accepted: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "start_stop_hotkey": self.start_stop_hotkey,
-            "pause_resume_hotkey": self.pause_resume_hotkey,
-            "pause_on_window_change": self.pause_on_window_change,
-            "auto_resume_on_focus": self.auto_resume_on_focus,
-            "window_check_interval_ms": self.window_check_interval_ms,
-            "loop_delay_ms": self.loop_delay_ms,
-            "click_delay_ms": self.click_delay_ms,
-            "loop_count": self.loop_count,
-            "max_loops": self.max_loops,
-            "mouse_speed": self.mouse_speed,
-            "click_speed_ms": self.click_speed_ms,
-            "randomize_order": self.randomize_order,
-            "random_delay_pct": self.random_delay_pct,
-            "minimize_on_start": self.minimize_on_start,
-            "restore_on_stop": self.restore_on_stop,
-            "default_infinite_loops": self.default_infinite_loops,
-            "debug_mode": self.debug_mode,
-            "enable_logs": self.enable_logs,
-            "autosave_config": self.autosave_config,
-            "test_mode": self.test_mode,
-            "overlay_opacity": self.overlay_opacity,
-            "theme": self.theme,
-            "show_dot_numbers": self.show_dot_numbers,
-            "show_coordinates": self.show_coordinates,
-            "lock_dots": self.lock_dots,
-            "enable_roblox_mode": self.enable_roblox_mode,
-            "click_backend": self.click_backend,
-            "post_action": self.post_action,
-            "tos_accepted_version": self.tos_accepted_version,
-            "discord_prompt_shown": self.discord_prompt_shown,
-            "access_key_accepted": self.access_key_accepted,
-        }
+        return SETTINGS_SCHEMA.to_dict(self)
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Settings":
-        s = Settings()
-        for k, v in (data or {}).items():
-            if hasattr(s, k):
-                setattr(s, k, v)
-        return s
+    def from_dict(data: Dict[str, Any], issues: Optional[List[str]] = None) -> "Settings":
+        return SETTINGS_SCHEMA.from_dict(data, issues)
+
+
+# Shared by every AppState so versions stay unique when the app swaps states.
+_versions = itertools.count(1)
+
+
+@dataclass
+class StateChanges:
+    """What changed since the last ``AppState.take_changes()``."""
+
+    settings: bool = False
+    order: bool = False  # dots were cleared or reordered
+    all_dots: bool = False  # a bulk edit touched every dot
+    dots: Set[str] = field(default_factory=set)  # ids added or edited
+    removed: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.settings or self.order or self.all_dots or self.dots or self.removed)
 
 
 @dataclass
@@ -129,16 +102,182 @@ class AppState:
     settings: Settings = field(default_factory=Settings)
     dots: List[Dot] = field(default_factory=list)
 
+    # Bumped by every mutation method below; consumers compare it with the
+    # value they last saw to skip work when nothing changed.
+    version: int = field(default=0, init=False, compare=False, repr=False)
+    _changes: StateChanges = field(default_factory=StateChanges, init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.version = next(_versions)
+
+    def _bump(self) -> None:
+        self.version = next(_versions)
+
+    def take_changes(self) -> StateChanges:
+        changes, self._changes = self._changes, StateChanges()
+        return changes
+
+    def touch_all(self) -> None:
+        """Mark everything changed (e.g. after replacing the state wholesale)."""
+        self._changes.settings = True
+        self._changes.all_dots = True
+        self._bump()
+
+    def update_settings(self, **values: Any) -> bool:
+        changed = False
+        for k, v in values.items():
+            if not hasattr(self.settings, k):
+                raise AttributeError(f"Unknown setting {k!r}")
+            if getattr(self.settings, k) != v:
+                setattr(self.settings, k, v)
+                changed = True
+        if changed:
+            self._changes.settings = True
+            self._bump()
+        return changed
+
+    def add_dot(self, dot: Dot) -> Dot:
+        """Append ``dot``; returns the stored element (a view when dots live in a DotTable)."""
+        self.dots.append(dot)
+        stored = self.dots[-1]
+        self.touch_dot(stored)
+        return stored
+
+    def find_dot(self, dot_id: str) -> Optional[Dot]:
+        for d in self.dots:
+            if d.id == dot_id:
+                return d
+        return None
+
+    def update_dot(self, dot_id: str, **values: Any) -> Optional[Dot]:
+        d = self.find_dot(dot_id)
+        if d is None:
+            return None
+        for k, v in values.items():
+            if k == "id" or not hasattr(d, k):
+                raise AttributeError(f"Cannot set dot field {k!r}")
+            setattr(d, k, v)
+        self.touch_dot(d)
+        return d
+
+    def touch_dot(self, dot: Dot) -> None:
+        """Record an edit made directly on ``dot`` (e.g. an overlay drag)."""
+        self._changes.dots.add(dot.id)
+        self._changes.removed.discard(dot.id)
+        self._bump()
+
+    def remove_dots(self, ids: Iterable[str]) -> int:
+        from . import dot_table
+
+        ids = set(ids)
+        n = dot_table.remove_ids(self.dots, ids)
+        if n:
+            self._changes.removed |= ids
+            self._changes.dots -= ids
+            self._bump()
+        return n
+
+    def clear_dots(self) -> None:
+        self.dots.clear()
+        self._changes.order = True
+        self._changes.dots.clear()
+        self._changes.removed.clear()
+        self._bump()
+
+    def replace_dots(self, dots: List[Dot]) -> None:
+        """Swap in a whole new dot list (undo/redo)."""
+        self.dots = dots
+        self.pack_dots()
+        self._changes.all_dots = True
+        self._bump()
+
+    def set_all_positions(self, x: int, y: int) -> None:
+        from . import dot_table
+
+        dot_table.set_positions(self.dots, x, y)
+        self._changes.all_dots = True
+        self._bump()
+
+    def set_all_delays(self, ms: Optional[int]) -> None:
+        from . import dot_table
+
+        dot_table.set_delay(self.dots, ms)
+        self._changes.all_dots = True
+        self._bump()
+
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "schema_version": SCHEMA_VERSION,
             "settings": self.settings.to_dict(),
             "dots": [d.to_dict() for d in self.dots],
         }
 
+    def copy(self) -> "AppState":
+        """Independent copy; Settings and Dot only hold immutable values, so one level is enough."""
+        if isinstance(self.dots, list):
+            dots = [Dot(d.id, d.name, d.x, d.y, d.click_type, d.key, d.delay_override_ms) for d in self.dots]
+        else:
+            dots = self.dots.copy()
+        return AppState(settings=Settings.from_dict(self.settings.to_dict()), dots=dots)
+
+    def pack_dots(self, threshold: Optional[int] = None) -> bool:
+        """Move ``dots`` into a column-backed DotTable once there are at least ``threshold`` of them."""
+        from .dot_table import DotTable
+
+        if isinstance(self.dots, DotTable):
+            return True
+        limit = DotTable.THRESHOLD if threshold is None else threshold
+        if len(self.dots) < limit:
+            return False
+        self.dots = DotTable(self.dots)  # type: ignore[assignment]
+        return True
+
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "AppState":
-        settings = Settings.from_dict((data or {}).get("settings") or {})
-        dots = [Dot.from_dict(x) for x in ((data or {}).get("dots") or [])]
-        if not dots:
-            dots = []
+    def from_dict(data: Dict[str, Any], issues: Optional[List[str]] = None) -> "AppState":
+        """Build state from its JSON form; conversions and dropped values are reported in ``issues``."""
+        data = data or {}
+        version = data.get("schema_version", 0)
+        if issues is not None:
+            if isinstance(version, int) and version > SCHEMA_VERSION:
+                issues.append(f"schema_version {version} is newer than supported ({SCHEMA_VERSION})")
+            for k in data:
+                if k not in _APPSTATE_KEYS:
+                    issues.append(f"AppState: unknown key {k!r}")
+        settings = Settings.from_dict(data.get("settings") or {}, issues)
+        dot_from_dict = DOT_SCHEMA.from_dict
+        dots = [dot_from_dict(x, issues) for x in (data.get("dots") or [])]
         return AppState(settings=settings, dots=dots)
+
+
+DOT_SCHEMA = Schema(
+    Dot,
+    {
+        "id": {"required": True},
+        "click_type": {"choices": ("click", "double", "hold", "key")},
+        "delay_override_ms": {"min": 0},
+    },
+)
+
+SETTINGS_SCHEMA = Schema(
+    Settings,
+    {
+        "window_check_interval_ms": {"min": 50, "max": 60_000},
+        "loop_delay_ms": {"min": 0, "max": 3_600_000},
+        "click_delay_ms": {"min": 0, "max": 3_600_000},
+        "loop_count": {"min": 0},
+        "max_loops": {"min": 0},
+        "mouse_speed": {"min": 0, "max": 100},
+        "click_speed_ms": {"min": 0, "max": 60_000},
+        "random_delay_pct": {"min": 0, "max": 100},
+        "overlay_opacity": {"min": 0.2, "max": 1.0},
+        "theme": {"choices": ("dark", "light")},
+        "click_backend": {"choices": ("autoit", "win32")},
+        "post_action": {"choices": ("none", "beep", "message", "close")},
+        "profile_store": {"choices": ("json", "sqlite")},
+        "undo_memory_mb": {"min": 1, "max": 1024},
+        "tos_accepted_version": {"min": 0},
+    },
+)
+
+# "header" is the profile summary block written ahead of the state (see storage).
+_APPSTATE_KEYS = frozenset({"schema_version", "settings", "dots", "header"})
@@ -3,13 +3,18 @@ from __future__ import annotations
 import tkinter as tk
 import sys
 import ctypes
-from typing import Callable, Dict
+import time
+from typing import Callable, Dict, Iterator, List, Optional
 
+from . import metrics
 from .models import Dot, Settings
 
 
 _TRANSPARENT_COLOR = "#010203"
 
+# Drag motion is coalesced to roughly one repaint per display frame (~60 Hz).
+_DRAG_FRAME_MS = 16
+
 
 def _hex_to_colorref(color: str) -> int:
     c = (color or "").lstrip("#")
@@ -48,11 +53,13 @@ class DotOverlay:
         index: int,
         settings: Settings,
         on_moved: Callable[[Dot], None],
+        on_drag: Optional[Callable[[Dot], None]] = None,
     ) -> None:
         self.dot = dot
         self.index = index
         self.settings = settings
         self._on_moved = on_moved
+        self._on_drag_preview = on_drag
 
         self._win = tk.Toplevel(root)
         self._win.overrideredirect(True)
@@ -66,7 +73,8 @@ class DotOverlay:
             pass
 
         self._size = 44
-        self._win.geometry(f"{self._size}x{self._size}+{max(0, dot.x - 22)}+{max(0, dot.y - 22)}")
+        self._placed: tuple[int, int] | None = None
+        self.place()
 
         self._canvas = tk.Canvas(
             self._win,
@@ -91,6 +99,10 @@ class DotOverlay:
 
         self._drag_off_x = 0
         self._drag_off_y = 0
+        self._drag_target: tuple[int, int] | None = None
+        self._drag_event_t = 0.0
+        self._drag_job = None
+        self._drag_moved = False
 
         self._locked = False
         self.set_locked(bool(settings.lock_dots))
@@ -109,18 +121,81 @@ class DotOverlay:
     def _on_down(self, event: tk.Event) -> None:
         self._drag_off_x = event.x
         self._drag_off_y = event.y
+        self._drag_moved = False
 
     def _on_drag(self, event: tk.Event) -> None:
-        x = self._win.winfo_pointerx() - self._drag_off_x
-        y = self._win.winfo_pointery() - self._drag_off_y
+        if self._drag_target is None:
+            self._drag_event_t = time.perf_counter()
+        self._drag_target = (int(event.x_root) - self._drag_off_x, int(event.y_root) - self._drag_off_y)
+        if self._drag_job is None:
+            self._drag_job = self._win.after(_DRAG_FRAME_MS, self._flush_drag)
+
+    def _flush_drag(self) -> None:
+        self._drag_job = None
+        target = self._drag_target
+        if target is None:
+            return
+        self._drag_target = None
+
+        x, y = target
+        self._win.geometry(f"{self._size}x{self._size}+{x}+{y}")
+        self._placed = (x, y)
+
+        self.dot.x = int(x + self._size // 2)
+        self.dot.y = int(y + self._size // 2)
+        self._drag_moved = True
+        if self.settings.show_coordinates:
+            self._render_label()
+        if self._on_drag_preview is not None:
+            self._on_drag_preview(self.dot)
+
+        t0 = self._drag_event_t
+        try:
+            self._win.after_idle(lambda: metrics.record("overlay.drag_latency", (time.perf_counter() - t0) * 1000.0))
+        except Exception:
+            pass
+
+    def _on_up(self, _event: tk.Event) -> None:
+        self._cancel_drag_job()
+        self._flush_drag()
+        if self._drag_moved:
+            self._drag_moved = False
+            self._on_moved(self.dot)
+
+    def place(self) -> bool:
+        x = max(0, int(self.dot.x) - self._size // 2)
+        y = max(0, int(self.dot.y) - self._size // 2)
+        if self._placed == (x, y):
+            return False
         self._win.geometry(f"{self._size}x{self._size}+{x}+{y}")
+        self._placed = (x, y)
+        return True
 
-        cx = x + self._size // 2
-        cy = y + self._size // 2
-        self.dot.x = int(cx)
-        self.dot.y = int(cy)
+    def sync(self, dot: Dot, index: int) -> None:
+        self.dot = dot
+        moved = self.place()
+        if index != self.index:
+            self.index = index
+            self._render_label()
+        elif moved and self.settings.show_coordinates:
+            self._render_label()
+
+    def reset(self, dot: Dot, index: int, settings: Settings) -> None:
+        """Re-target a pooled overlay window at another dot."""
+        self._cancel_flash()
+        self._cancel_drag_job()
+        self._drag_target = None
+        self._drag_moved = False
+        try:
+            self._canvas.itemconfigure(self._circle, fill="#4F8CFF")
+        except Exception:
+            pass
+        if settings is not self.settings:
+            self.apply_settings(settings)
+        self.dot = dot
+        self.index = index
+        self.place()
         self._render_label()
-        self._on_moved(self.dot)
 
     def _render_label(self) -> None:
         parts: list[str] = []
@@ -141,19 +216,33 @@ class DotOverlay:
         else:
             self._win.withdraw()
 
-    def destroy(self) -> None:
+    def _cancel_flash(self) -> None:
         if getattr(self, "_flash_job", None) is not None:
             try:
                 self._win.after_cancel(self._flash_job)
             except Exception:
                 pass
             self._flash_job = None
+
+    def _cancel_drag_job(self) -> None:
+        if self._drag_job is not None:
+            try:
+                self._win.after_cancel(self._drag_job)
+            except Exception:
+                pass
+            self._drag_job = None
+
+    def destroy(self) -> None:
+        self._cancel_flash()
+        self._cancel_drag_job()
         try:
             self._win.destroy()
         except Exception:
             pass
 
     def update_index(self, index: int) -> None:
+        if index == self.index:
+            return
         self.index = index
         self._render_label()
 
@@ -182,11 +271,13 @@ class DotOverlay:
             try:
                 self._win.unbind("<ButtonPress-1>")
                 self._win.unbind("<B1-Motion>")
+                self._win.unbind("<ButtonRelease-1>")
             except Exception:
                 pass
         else:
             self._win.bind("<ButtonPress-1>", self._on_down)
             self._win.bind("<B1-Motion>", self._on_drag)
+            self._win.bind("<ButtonRelease-1>", self._on_up)
 
         _set_click_through(self._win, self._locked)
 
@@ -196,12 +287,7 @@ class DotOverlay:
         except Exception:
             return
 
-        if getattr(self, "_flash_job", None) is not None:
-            try:
-                self._win.after_cancel(self._flash_job)
-            except Exception:
-                pass
-            self._flash_job = None
+        self._cancel_flash()
 
         def restore() -> None:
             try:
@@ -216,16 +302,27 @@ class DotOverlay:
 
 
 class OverlayManager:
-    def __init__(self, root: tk.Misc, settings: Settings, on_dot_moved: Callable[[Dot], None]) -> None:
+    # Withdrawn overlay windows kept around for reuse; anything beyond this is destroyed.
+    POOL_MAX = 64
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        settings: Settings,
+        on_dot_moved: Callable[[Dot], None],
+        on_dot_dragging: Optional[Callable[[Dot], None]] = None,
+    ) -> None:
         self._root = root
         self._settings = settings
         self._on_dot_moved = on_dot_moved
+        self._on_dot_dragging = on_dot_dragging
         self._overlays: Dict[str, DotOverlay] = {}
+        self._pool: List[DotOverlay] = []
         self._visible = True
 
     def set_settings(self, settings: Settings) -> None:
         self._settings = settings
-        for ov in self._overlays.values():
+        for ov in list(self._overlays.values()) + self._pool:
             ov.apply_settings(settings)
 
     def set_locked(self, locked: bool) -> None:
@@ -241,26 +338,52 @@ class OverlayManager:
         return self._visible
 
     def add_dot(self, dot: Dot, index: int) -> None:
-        ov = DotOverlay(self._root, dot, index=index, settings=self._settings, on_moved=self._on_dot_moved)
+        ov = self._acquire(dot, index)
         self._overlays[dot.id] = ov
         ov.set_visible(self._visible)
 
     def remove_dot(self, dot_id: str) -> None:
         ov = self._overlays.pop(dot_id, None)
         if ov is not None:
-            ov.destroy()
+            self._release(ov)
 
     def clear(self) -> None:
         for ov in list(self._overlays.values()):
+            self._release(ov)
+        self._overlays.clear()
+
+    def destroy(self) -> None:
+        for ov in list(self._overlays.values()) + self._pool:
             ov.destroy()
         self._overlays.clear()
+        self._pool.clear()
 
     def rebuild(self, dots: list[Dot]) -> None:
-        visible = self._visible
-        self.clear()
+        """Bring the overlays in line with ``dots``, touching only what changed.
+
+        Overlays are matched by ``Dot.id``: kept ones are moved/relabelled in
+        place, new dots take a pooled window when one is free, and overlays whose
+        dot disappeared go back to the pool.
+        """
+        for _ in self.rebuild_steps(dots):
+            pass
+
+    def rebuild_steps(self, dots: list[Dot]) -> Iterator[None]:
+        """Same as :meth:`rebuild`, yielding after each overlay so callers can spread it over frames."""
+        wanted = {d.id for d in dots}
+        for dot_id in [k for k in self._overlays if k not in wanted]:
+            ov = self._overlays.pop(dot_id, None)
+            if ov is not None:
+                self._release(ov)
+                yield
+
         for idx, dot in enumerate(dots):
-            self.add_dot(dot, index=idx)
-        self.set_visible(visible)
+            ov = self._overlays.get(dot.id)
+            if ov is None:
+                self.add_dot(dot, index=idx)
+            else:
+                ov.sync(dot, idx)
+            yield
 
     def reindex(self, dots: list[Dot]) -> None:
         for idx, dot in enumerate(dots):
@@ -273,6 +396,27 @@ class OverlayManager:
         if ov is not None:
             ov.flash()
 
+    def _acquire(self, dot: Dot, index: int) -> DotOverlay:
+        if self._pool:
+            ov = self._pool.pop()
+            ov.reset(dot, index, self._settings)
+            return ov
+        return DotOverlay(
+            self._root,
+            dot,
+            index=index,
+            settings=self._settings,
+            on_moved=self._on_dot_moved,
+            on_drag=self._on_dot_dragging,
+        )
+
+    def _release(self, ov: DotOverlay) -> None:
+        if len(self._pool) >= self.POOL_MAX:
+            ov.destroy()
+            return
+        ov.set_visible(False)
+        self._pool.append(ov)
+
 
 def _set_click_through(win: tk.Toplevel, enabled: bool) -> None:
     if sys.platform != "win32":
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from . import storage
+from .models import AppState, Dot, Settings
+from .storage_writer import StorageWriter
+
+
+PROFILE_STORES = ("json", "sqlite")
+
+
+class ProfileCache:
+    """Small LRU of parsed profiles.
+
+    Entries are validated against a caller-supplied stamp (file mtime and
+    size, or the database row's mtime), so an edited profile is re-read. The
+    cache hands out copies: the app mutates the state it loads. Loads run on
+    the storage writer while saves invalidate from the Tk thread, so every
+    access takes ``_lock``.
+    """
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, AppState]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, stamp: Hashable) -> Optional[AppState]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            state = entry[1]
+        return state.copy()
+
+    def put(self, key: Hashable, stamp: Hashable, state: AppState) -> None:
+        entry = (stamp, state.copy())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = (100.0 * self.hits / total) if total else 0.0
+        return f"profile cache: {self.hits}/{total} hits ({rate:.0f}%), {len(self)}/{self.max_entries} entries"
+
+
+class JsonProfileStore:
+    """One file per profile under ``profiles/`` (the original layout)."""
+
+    kind = "json"
+
+    def __init__(self, writer: Optional[StorageWriter] = None) -> None:
+        self._writer = writer
+        self.cache = ProfileCache()
+
+    def list(self, search: str = "") -> List[storage.ProfileSummary]:
+        out = storage.list_profiles(writer=self._writer)
+        needle = search.strip().lower()
+        if needle:
+            out = [p for p in out if needle in p.name.lower()]
+        return out
+
+    def load(self, name: str) -> AppState:
+        path = storage.profile_path(name)
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        state = self.cache.get(path, stamp)
+        if state is None:
+            state = storage.decode_profile(path)
+            self.cache.put(path, stamp, state)
+        return state
+
+    def save(self, name: str, state: AppState) -> None:
+        self.cache.invalidate(storage.profile_path(name))
+        storage.save_profile(name, state, writer=self._writer)
+
+    def delete(self, name: str) -> None:
+        self.cache.invalidate(storage.profile_path(name))
+        storage.delete_profile(name)
+
+    def close(self) -> None:
+        pass
+
+
+# 2: tags moved from a ",a,b," column on profiles to the profile_tags table.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    dot_count INTEGER NOT NULL,
+    settings TEXT NOT NULL,
+    dots BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_mtime ON profiles (mtime DESC);
+CREATE INDEX IF NOT EXISTS profiles_dot_count ON profiles (dot_count);
+CREATE INDEX IF NOT EXISTS profiles_name_nocase ON profiles (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS profile_tags (
+    name TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (name, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS profile_tags_tag ON profile_tags (tag);
+"""
+
+
+def _encode_dots(dots: Sequence[Dot]) -> bytes:
+    rows = [[d.id, d.name, d.x, d.y, d.click_type, d.key, d.delay_override_ms] for d in dots]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode_dots(blob: bytes) -> List[Dot]:
+    rows = json.loads(zlib.decompress(blob).decode("utf-8"))
+    return [
+        Dot(id=str(r[0]), name=str(r[1]), x=int(r[2]), y=int(r[3]), click_type=str(r[4]), key=r[5], delay_override_ms=r[6])
+        for r in rows
+    ]
+
+
+def _clean_tags(tags: Iterable[str]) -> List[str]:
+    return sorted({t.strip().lower() for t in tags if t and t.strip()})
+
+
+def _prefix_like(text: str) -> str:
+    # A pattern with no leading wildcard can use profiles_name_nocase.
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class SqliteProfileStore:
+    """All profiles in one SQLite file.
+
+    Name, mtime and dot count are indexed columns and tags live in an
+    indexed ``profile_tags`` table, so listing and searching (name prefix or
+    exact tag) are single indexed queries instead of a directory scan;
+    settings are kept as JSON text and dots as a zlib-compressed row array.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path: Path, writer: Optional[StorageWriter] = None) -> None:
+        self._path = path
+        self._writer = writer
+        self._lock = threading.Lock()
+        self.cache = ProfileCache()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            version = int(self._conn.execute("PRAGMA user_version").fetchone()[0])
+            self._conn.executescript(_SCHEMA)
+            if version < 2:
+                self._migrate_tag_column()
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _migrate_tag_column(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(profiles)")}
+        if "tags" not in columns:
+            return
+        rows = self._conn.execute("SELECT name, tags FROM profiles WHERE tags != ''").fetchall()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO profile_tags (name, tag) VALUES (?, ?)",
+            [(name, tag) for name, text in rows for tag in text.split(",") if tag],
+        )
+        self._conn.execute("DROP INDEX IF EXISTS profiles_tags")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0])
+
+    def list(self, search: str = "", tag: str = "") -> List[storage.ProfileSummary]:
+        sql = "SELECT name, mtime, dot_count, settings FROM profiles"
+        where: List[str] = []
+        args: List[object] = []
+        if search.strip():
+            where.append("(name LIKE ? ESCAPE '\\' OR name IN (SELECT name FROM profile_tags WHERE tag = ?))")
+            args += [_prefix_like(search.strip()), search.strip().lower()]
+        if tag.strip():
+            where.append("name IN (SELECT name FROM profile_tags WHERE tag = ?)")
+            args.append(tag.strip().lower())
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY mtime DESC"
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        out: List[storage.ProfileSummary] = []
+        for name, mtime, dot_count, settings_text in rows:
+            try:
+                settings = Settings.from_dict(json.loads(settings_text))
+            except Exception:
+                settings = Settings()
+            out.append(
+                storage.ProfileSummary(
+                    name=str(name),
+                    mtime=float(mtime),
+                    dot_count=int(dot_count),
+                    loop_count=int(settings.loop_count or 0),
+                    loop_delay_ms=int(settings.loop_delay_ms or 0),
+                    click_delay_ms=int(settings.click_delay_ms or 0),
+                )
+            )
+        return out
+
+    def load(self, name: str) -> AppState:
+        name = storage.safe_profile_name(name)
+        with self._lock:
+            row = self._conn.execute("SELECT mtime, dot_count FROM profiles WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"No profile named {name!r}")
+            stamp = (row[0], row[1])
+            state = self.cache.get(name, stamp)
+            if state is not None:
+                return state
+            row = self._conn.execute("SELECT settings, dots FROM profiles WHERE name = ?", (name,)).fetchone()
+        state = AppState(settings=Settings.from_dict(json.loads(row[0])), dots=_decode_dots(row[1]))
+        with self._lock:
+            self.cache.put(name, stamp, state)
+        return state
+
+    def save(self, name: str, state: AppState, tags: Optional[Iterable[str]] = None, mtime: Optional[float] = None) -> None:
+        name = storage.safe_profile_name(name)
+        # Snapshot on the caller's thread; encoding and the write may run on the writer.
+        settings = state.settings.to_dict()
+        dots = [Dot(**d.to_dict()) for d in state.dots]
+        tag_list = None if tags is None else _clean_tags(tags)
+        when = time.time() if mtime is None else float(mtime)
+
+        def write() -> None:
+            self._upsert(name, when, settings, dots, tag_list)
+
+        if self._writer is not None:
+            self._writer.call((self._path, name), write)
+        else:
+            write()
+
+    def _upsert(self, name: str, mtime: float, settings: dict, dots: List[Dot], tags: Optional[List[str]]) -> None:
+        settings_text = json.dumps(settings, separators=(",", ":"))
+        blob = _encode_dots(dots)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO profiles (name, mtime, dot_count, settings, dots) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET mtime = excluded.mtime, dot_count = excluded.dot_count, "
+                "settings = excluded.settings, dots = excluded.dots",
+                (name, mtime, len(dots), settings_text, blob),
+            )
+            if tags is not None:
+                self._conn.execute("DELETE FROM profile_tags WHERE name = ?", (name,))
+                self._conn.executemany("INSERT INTO profile_tags (name, tag) VALUES (?, ?)", [(name, t) for t in tags])
+            self.cache.invalidate(name)
+
+    def delete(self, name: str) -> None:
+        name = storage.safe_profile_name(name)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+            self._conn.execute("DELETE FROM profile_tags WHERE name = ?", (name,))
+            self.cache.invalidate(name)
+
+    def tags(self, name: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tag FROM profile_tags WHERE name = ? ORDER BY tag", (storage.safe_profile_name(name),)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def import_json(self, directory: Optional[Path] = None) -> int:
+        """Copy every file profile in ``directory`` into the database, keeping mtimes and header tags."""
+        directory = directory or storage.profiles_dir()
+        count = 0
+        for p in sorted(directory.iterdir()):
+            if p.suffix.lower() not in storage.PROFILE_SUFFIXES:
+                continue
+            try:
+                state = storage.decode_profile(p)
+                mtime = p.stat().st_mtime
+                tags = storage.read_profile_header(p).get("tags")
+            except Exception:
+                continue
+            tag_list = _clean_tags(str(t) for t in tags) if isinstance(tags, list) else None
+            self._upsert(p.stem, mtime, state.settings.to_dict(), state.dots, tag_list)
+            count += 1
+        return count
+
+    def export_json(self, directory: Optional[Path] = None) -> int:
+        """Write every profile back out as ``<name>.json`` with its stored mtime; tags go in the header."""
+        directory = directory or storage.profiles_dir()
+        count = 0
+        for summary in self.list():
+            state = self.load(summary.name)
+            path = directory / f"{summary.name}.json"
+            header = storage.profile_header(state.settings, len(state.dots))
+            tags = self.tags(summary.name)
+            if tags:
+                header["tags"] = tags
+            storage.atomic_write_json(path, {"header": header, **state.to_dict()})
+            os.utime(path, (summary.mtime, summary.mtime))
+            count += 1
+        return count
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.flush(timeout=5.0)
+        with self._lock:
+            self._conn.close()
+
+
+def sqlite_path() -> Path:
+    return storage.project_dir() / "profiles.sqlite3"
+
+
+def open_profile_store(kind: str, writer: Optional[StorageWriter] = None):
+    if kind == "sqlite":
+        return SqliteProfileStore(sqlite_path(), writer=writer)
+    return JsonProfileStore(writer=writer)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import CodeType
+from typing import Dict, List, Optional, Tuple
+
+# cProfile only sees the thread that enabled it, so the app profiler samples
+# every thread's stack from a background thread instead; at this rate the
+# sampler is lost in the noise. tracemalloc is the expensive part (allocations
+# get several times slower), which is why profiling is opt-in.
+PROFILE_SAMPLE_INTERVAL_S = 0.01
+PROFILE_MEMORY_INTERVAL_S = 60.0
+PROFILE_MAX_DEPTH = 64
+PROFILE_TOP = 30
+
+# (filename, first line, function name)
+FuncKey = Tuple[str, int, str]
+
+# Innermost Python frames of a thread that is parked rather than working:
+# (path suffix, function). Samples stopped in one of these are skipped, so
+# idle queue/event waits, the Tk event loop and the pynput message loop do
+# not swamp the self-time table. time.sleep() runs in C and cannot be told
+# apart from its caller this way.
+_IDLE_FRAMES = (
+    ("threading.py", "wait"),  # Event/Condition waits, queue.Queue.get
+    ("threading.py", "_wait_for_tstate_lock"),  # Thread.join
+    ("selectors.py", "select"),
+    ("tkinter/__init__.py", "mainloop"),
+    ("pynput/_util/win32.py", "__iter__"),  # GetMessage loop
+)
+
+# Profilers can overlap (a new one starts while the last report is still being
+# written), so tracemalloc is shared: the first user that finds it off starts
+# it, and it is stopped only when the last of those users releases it.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_started = False
+
+
+def _acquire_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_started = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    with _tracemalloc_lock:
+        _tracemalloc_users = max(0, _tracemalloc_users - 1)
+        if _tracemalloc_users == 0 and _tracemalloc_started:
+            tracemalloc.stop()
+            _tracemalloc_started = False
+
+
+def _func_label(key: FuncKey) -> str:
+    filename, line, name = key
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+class SamplingProfiler:
+    """Whole-app CPU sampler plus periodic ``tracemalloc`` snapshots.
+
+    A daemon thread reads ``sys._current_frames()`` every ``interval_s`` and
+    counts the stacks of all other threads, skipping those parked in a known
+    wait (see ``_IDLE_FRAMES``). Counts are wall-clock samples, not CPU time:
+    a thread blocked in C outside those waits is still counted. Every
+    ``memory_interval_s`` it
+    compares a ``tracemalloc`` snapshot against the one taken at start.
+    :meth:`stop` writes a text report and a collapsed-stack file (for
+    flamegraph tools) and returns the report path.
+    """
+
+    def __init__(
+        self,
+        interval_s: float = PROFILE_SAMPLE_INTERVAL_S,
+        memory_interval_s: float = PROFILE_MEMORY_INTERVAL_S,
+        max_depth: int = PROFILE_MAX_DEPTH,
+        top: int = PROFILE_TOP,
+    ) -> None:
+        self.interval_s = float(interval_s)
+        self.memory_interval_s = float(memory_interval_s)
+        self.max_depth = int(max_depth)
+        self.top = int(top)
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._idle_code: Dict[CodeType, bool] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self.samples = 0
+        self.idle = 0
+        self._self: Counter[FuncKey] = Counter()
+        self._cumulative: Counter[FuncKey] = Counter()
+        self._stacks: Counter[str] = Counter()
+        self._threads: Counter[str] = Counter()
+        self._memory: List[str] = []
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._tracing = False
+        self._started_at = 0.0
+        self._stopped_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._reset()
+        self._stop.clear()
+        _acquire_tracemalloc()
+        self._tracing = True
+        self._baseline = self._snapshot()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self, directory: Optional[Path] = None) -> Optional[Path]:
+        """Stop sampling and write ``profile-<timestamp>.txt`` (and ``.folded``) to ``directory``, ``logs/`` by default."""
+        t = self._thread
+        if t is None:
+            return None
+        self._stop.set()
+        t.join(timeout=2.0)
+        self._thread = None
+        self._stopped_at = time.perf_counter()
+        self._record_memory()
+        if self._tracing:
+            _release_tracemalloc()
+            self._tracing = False
+        self._baseline = None
+
+        if directory is None:
+            from .storage import logs_dir
+
+            directory = logs_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        base = directory / time.strftime("profile-%Y%m%d-%H%M%S")
+        report = base.with_suffix(".txt")
+        report.write_text(self.report(), encoding="utf-8")
+        base.with_suffix(".folded").write_text(
+            "".join(f"{stack} {n}\n" for stack, n in self._stacks.most_common()), encoding="utf-8"
+        )
+        return report
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        next_memory = time.perf_counter() + self.memory_interval_s
+        while not self._stop.wait(self.interval_s):
+            self._sample(own)
+            if time.perf_counter() >= next_memory:
+                next_memory += self.memory_interval_s
+                self._record_memory()
+
+    def _sample(self, own: int) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if self._is_idle(frame.f_code):
+                self.idle += 1
+                continue
+            stack: List[FuncKey] = []
+            f = frame
+            while f is not None and len(stack) < self.max_depth:
+                code = f.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                f = f.f_back
+            if not stack:
+                continue
+            tname = names.get(ident, str(ident))
+            self._threads[tname] += 1
+            self._self[stack[0]] += 1
+            self._cumulative.update(set(stack))
+            self._stacks[";".join([tname] + [k[2] for k in reversed(stack)])] += 1
+        self.samples += 1
+
+    def _is_idle(self, code: CodeType) -> bool:
+        idle = self._idle_code.get(code)
+        if idle is None:
+            path = code.co_filename.replace("\\", "/")
+            idle = any(code.co_name == name and path.endswith(suffix) for suffix, name in _IDLE_FRAMES)
+            self._idle_code[code] = idle
+        return idle
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+
+    def _record_memory(self) -> None:
+        if self._baseline is None or not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        elapsed = time.perf_counter() - self._started_at
+        lines = [f"[{elapsed:8.1f} s] traced {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB; growth since start:"]
+        diff = self._snapshot().compare_to(self._baseline, "lineno")
+        for stat in [d for d in diff if d.size_diff > 0][:10]:
+            lines.append(f"    {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {stat.traceback[0]}")
+        self._memory.append("\n".join(lines))
+
+    def report(self) -> str:
+        end = self._stopped_at if self._thread is None else time.perf_counter()
+        elapsed = max(0.0, end - self._started_at)
+        out = [
+            f"Profiled {elapsed:.1f} s (wall clock), {self.samples} samples every {self.interval_s * 1000:.1f} ms",
+            f"Thread stacks parked in a wait were skipped ({self.idle}); the rest are wall-clock samples, not CPU time.",
+            "",
+        ]
+
+        out.append("Samples per thread (not waiting):")
+        for name, n in self._threads.most_common():
+            out.append(f"  {n:8d}  {name}")
+
+        total = sum(self._self.values()) or 1
+        for title, counter in (("Self time (leaf frame):", self._self), ("Cumulative (on stack):", self._cumulative)):
+            out += ["", title, f"  {'samples':>8} {'%':>6}  function"]
+            for key, n in counter.most_common(self.top):
+                out.append(f"  {n:8d} {n * 100.0 / total:6.1f}  {_func_label(key)}")
+
+        out += ["", "Memory (tracemalloc):"]
+        out += self._memory or ["  no snapshots"]
+        return "\n".join(out) + "\n"
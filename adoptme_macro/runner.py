@@ -7,8 +7,10 @@ import time
 from dataclasses import dataclass
 from typing import Callable, List, Optional
 
+from . import metrics
 from .input_backend import InputBackend
 from .models import Dot, Settings
+from .tracing import Tracer, TracingBackend, trace_path
 
 
 @dataclass
@@ -46,6 +48,12 @@ class MacroRunner:
         self._pause = threading.Event()
 
         self._status = RunnerStatus(state="STOPPED")
+        self._stop_requested_at: Optional[float] = None
+
+        # Set to a Tracer to record spans for the next run; the buffer is
+        # written to logs/ when the run ends. None means tracing is off.
+        self.tracer: Optional[Tracer] = None
+        self._paused_at: Optional[int] = None
 
     def status(self) -> RunnerStatus:
         with self._lock:
@@ -63,6 +71,7 @@ class MacroRunner:
                 return
             self._stop.clear()
             self._pause.clear()
+            self._stop_requested_at = None
             self._status = RunnerStatus(state="RUNNING", current_dot_index=0, current_loop=0, paused_reason=None)
 
         self._thread = threading.Thread(target=self._run, args=(preview,), daemon=True)
@@ -94,6 +103,26 @@ class MacroRunner:
         if was_active:
             self._on_stopped()
 
+    def request_stop(self, t0: Optional[float] = None) -> bool:
+        """Halt the run loop without blocking; safe to call from any thread.
+
+        ``t0`` is the ``perf_counter()`` time of the triggering event (e.g. a
+        hotkey press). The run thread finishes the stop itself (status,
+        ``on_stopped``) as soon as it sees the signal. Returns False when
+        nothing was running.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            t = self._thread
+            if t is None or not t.is_alive() or self._status.state == "STOPPED":
+                return False
+            self._stop_requested_at = now if t0 is None else t0
+        self._stop.set()
+        self._pause.clear()
+        if t0 is not None:
+            metrics.record("runner.stop_signal", (now - t0) * 1000.0)
+        return True
+
     def pause(self, reason: str = "user") -> None:
         with self._lock:
             if self._status.state != "RUNNING":
@@ -101,6 +130,10 @@ class MacroRunner:
             self._status.state = "PAUSED"
             self._status.paused_reason = reason
         self._pause.set()
+        tr = self.tracer
+        if tr is not None:
+            self._paused_at = tr.now()
+            tr.instant("pause", "runner", {"reason": reason})
         self._on_status(self.status())
 
     def resume(self, reason: str = "user") -> None:
@@ -112,6 +145,10 @@ class MacroRunner:
             self._status.state = "RUNNING"
             self._status.paused_reason = None
         self._pause.clear()
+        tr, t0 = self.tracer, self._paused_at
+        if tr is not None and t0 is not None:
+            self._paused_at = None
+            tr.complete("paused", "runner", t0, {"resumed_by": reason})
         self._on_status(self.status())
 
     def toggle_start_stop(self) -> None:
@@ -129,10 +166,15 @@ class MacroRunner:
             self.resume(reason="user")
 
     def _run(self, preview: bool) -> None:
+        # Read once: toggling tracing takes effect on the next run.
+        tr = self.tracer
+        backend = TracingBackend(self._backend, tr) if tr is not None else self._backend
         try:
             while not self._stop.is_set():
                 settings = self._get_settings()
-                dots = list(self._get_dots())
+                # Plain copies: the UI thread keeps editing the live dots
+                # (possibly DotTable views) while this run uses its snapshot.
+                dots = [Dot(**d.to_dict()) for d in self._get_dots()]
                 if not dots:
                     self.stop(join=False)
                     return
@@ -165,6 +207,7 @@ class MacroRunner:
                         self.stop(join=False)
                         return
 
+                    loop_t0 = tr.now() if tr is not None else 0
                     for i in order:
                         if self._stop.is_set():
                             return
@@ -185,19 +228,27 @@ class MacroRunner:
                             delta = delay_ms * (random.uniform(-pct, pct) / 100.0)
                             delay_ms = int(max(0, delay_ms + delta))
 
+                        dot_t0 = tr.now() if tr is not None else 0
                         if preview:
                             self._on_flash_dot(dot.id)
                         else:
-                            self._execute_dot(dot, settings)
-
-                        if self._wait_with_pause(delay_ms / 1000.0):
+                            self._execute_dot(dot, settings, backend)
+                        if tr is not None:
+                            tr.complete(
+                                "dot", "runner", dot_t0,
+                                {"index": i + 1, "type": dot.click_type, "x": dot.x, "y": dot.y, "wait_ms": delay_ms},
+                            )
+
+                        if self._wait_with_pause(delay_ms / 1000.0, tr):
                             return
 
                     with self._lock:
                         self._status.current_loop += 1
+                    if tr is not None:
+                        tr.complete("loop", "runner", loop_t0, {"loop": loop_index + 1})
                     self._on_status(self.status())
 
-                    if self._wait_with_pause(max(0, int(settings.loop_delay_ms)) / 1000.0):
+                    if self._wait_with_pause(max(0, int(settings.loop_delay_ms)) / 1000.0, tr):
                         return
         except Exception:
             try:
@@ -209,9 +260,42 @@ class MacroRunner:
             except Exception:
                 pass
         finally:
+            self._finish_requested_stop()
+            if tr is not None:
+                self._dump_trace(tr)
+            return
+
+    def _finish_requested_stop(self) -> None:
+        with self._lock:
+            requested = self._stop_requested_at
+            self._stop_requested_at = None
+        if requested is None:
             return
+        metrics.record("runner.stop_latency", (time.perf_counter() - requested) * 1000.0)
+        try:
+            self.stop(join=False)
+        except Exception:
+            pass
 
-    def _wait_with_pause(self, seconds: float) -> bool:
+    def _dump_trace(self, tr: Tracer) -> None:
+        self._paused_at = None
+        if not tr.count:
+            return
+        try:
+            path = tr.dump(trace_path())
+            self._logger.info("Wrote run trace (%d events, %d dropped) to %s", tr.count, tr.dropped, path)
+        except Exception:
+            self._logger.exception("Failed to write run trace")
+        finally:
+            tr.clear()
+
+    def _wait_with_pause(self, seconds: float, tr: Optional[Tracer] = None) -> bool:
+        if tr is not None:
+            t0 = tr.now()
+            try:
+                return self._wait_with_pause(seconds)
+            finally:
+                tr.complete("wait", "runner", t0, {"ms": int(seconds * 1000)})
         remaining = float(max(0.0, seconds))
         while remaining > 0 and not self._stop.is_set():
             if self._pause.is_set():
@@ -226,16 +310,17 @@ class MacroRunner:
 
         return self._stop.is_set()
 
-    def _execute_dot(self, dot: Dot, settings: Settings) -> None:
-        self._backend.move(dot.x, dot.y, speed=int(settings.mouse_speed))
+    def _execute_dot(self, dot: Dot, settings: Settings, backend: Optional[InputBackend] = None) -> None:
+        backend = backend or self._backend
+        backend.move(dot.x, dot.y, speed=int(settings.mouse_speed))
         if dot.click_type == "click":
-            self._backend.click(dot.x, dot.y)
+            backend.click(dot.x, dot.y)
         elif dot.click_type == "double":
-            self._backend.double_click(dot.x, dot.y, click_speed_ms=int(settings.click_speed_ms))
+            backend.double_click(dot.x, dot.y, click_speed_ms=int(settings.click_speed_ms))
         elif dot.click_type == "hold":
-            self._backend.hold_click(dot.x, dot.y, hold_ms=int(settings.click_speed_ms))
+            backend.hold_click(dot.x, dot.y, hold_ms=int(settings.click_speed_ms))
         elif dot.click_type == "key":
             if dot.key:
-                self._backend.key_press(dot.key)
+                backend.key_press(dot.key)
         else:
-            self._backend.click(dot.x, dot.y)
+            backend.click(dot.x, dot.y)
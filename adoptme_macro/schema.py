@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Version of the on-disk AppState layout ("schema_version" in config and
+# profiles). Files without the key are version 0 and load unchanged.
+SCHEMA_VERSION = 1
+
+_MISSING = object()
+_TYPES = {"str": str, "int": int, "float": float, "bool": bool}
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off", ""}
+
+
+@dataclasses.dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    type: type
+    nullable: bool
+    default: Any
+    factory: Optional[Callable[[], Any]]
+    min: Optional[float] = None
+    max: Optional[float] = None
+    choices: Optional[Tuple[str, ...]] = None
+    required: bool = False  # an empty value is replaced by the default
+
+    def make_default(self) -> Any:
+        return self.factory() if self.factory is not None else self.default
+
+
+def _parse_type(annotation: Any) -> Tuple[type, bool]:
+    text = annotation if isinstance(annotation, str) else getattr(annotation, "__name__", str(annotation))
+    nullable = text.startswith("Optional[") and text.endswith("]")
+    if nullable:
+        text = text[len("Optional[") : -1]
+    if text not in _TYPES:
+        raise TypeError(f"Unsupported field type for schema: {annotation!r}")
+    return _TYPES[text], nullable
+
+
+def _convert(spec: FieldSpec, value: Any) -> Any:
+    """Best-effort conversion of ``value`` to the field's type; raises ValueError/TypeError."""
+    t = spec.type
+    if t is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in _TRUE | _FALSE:
+            return value.strip().lower() in _TRUE
+        raise ValueError(value)
+    if t is int:
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, float):
+            if value != value or value in (float("inf"), float("-inf")):
+                raise ValueError(value)
+            return int(round(value))
+        if isinstance(value, str):
+            return int(round(float(value.strip())))
+        return int(value)
+    if t is float:
+        if isinstance(value, str):
+            value = value.strip()
+        out = float(value)
+        if out != out:
+            raise ValueError(value)
+        return out
+    if isinstance(value, (dict, list)):
+        raise TypeError(value)
+    return str(value)
+
+
+def _make_coercer(spec: FieldSpec, owner: str) -> Callable[[Any, Optional[List[str]]], Any]:
+    label = f"{owner}.{spec.name}"
+
+    def coerce(value: Any, issues: Optional[List[str]]) -> Any:
+        if value is _MISSING or (spec.required and not value):
+            return spec.make_default()
+        if value is None and spec.nullable:
+            return None
+        try:
+            if value is None:
+                raise ValueError(value)
+            out = _convert(spec, value)
+        except (TypeError, ValueError, OverflowError):
+            out = spec.make_default()
+            if issues is not None:
+                issues.append(f"{label}: invalid value {value!r}, using {out!r}")
+            return out
+        if spec.choices is not None and out not in spec.choices:
+            default = spec.make_default()
+            if issues is not None:
+                issues.append(f"{label}: {out!r} is not one of {', '.join(spec.choices)}, using {default!r}")
+            return default
+        clamped = out
+        if spec.min is not None and clamped < spec.min:
+            clamped = type(out)(spec.min)
+        if spec.max is not None and clamped > spec.max:
+            clamped = type(out)(spec.max)
+        if issues is not None and clamped != value:
+            issues.append(f"{label}: {value!r} adjusted to {clamped!r}")
+        return clamped
+
+    return coerce
+
+
+class Schema:
+    """Serializer/validator for a flat dataclass, built once from its fields.
+
+    ``to_dict`` and ``from_dict`` are generated Python functions with one
+    straight-line statement per field: values that already have the right
+    type and range are taken as-is, anything else goes through a per-field
+    coercer that converts, clamps or falls back to the default and records
+    what it did in ``issues``.
+    """
+
+    def __init__(self, cls: type, constraints: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        constraints = constraints or {}
+        unknown = set(constraints) - {f.name for f in dataclasses.fields(cls)}
+        if unknown:
+            raise ValueError(f"Constraints for unknown {cls.__name__} fields: {sorted(unknown)}")
+
+        specs: List[FieldSpec] = []
+        for f in dataclasses.fields(cls):
+            t, nullable = _parse_type(f.type)
+            factory = f.default_factory if f.default_factory is not dataclasses.MISSING else None  # type: ignore[misc]
+            default = None if f.default is dataclasses.MISSING else f.default
+            c = constraints.get(f.name, {})
+            choices = c.get("choices")
+            specs.append(
+                FieldSpec(
+                    name=f.name,
+                    type=t,
+                    nullable=nullable,
+                    default=default,
+                    factory=factory,
+                    min=c.get("min"),
+                    max=c.get("max"),
+                    choices=tuple(choices) if choices is not None else None,
+                    required=bool(c.get("required", False)),
+                )
+            )
+
+        self.cls = cls
+        self.fields: Sequence[FieldSpec] = tuple(specs)
+        self.names = frozenset(s.name for s in specs)
+        self.to_dict: Callable[[Any], Dict[str, Any]] = self._compile_to_dict()
+        self.from_dict: Callable[..., Any] = self._compile_from_dict()
+
+    def _compile_to_dict(self) -> Callable[[Any], Dict[str, Any]]:
+        items = ", ".join(f"{s.name!r}: o.{s.name}" for s in self.fields)
+        src = f"def to_dict(o):\n    return {{{items}}}\n"
+        ns: Dict[str, Any] = {}
+        exec(compile(src, f"<schema {self.cls.__name__}.to_dict>", "exec"), ns)
+        return ns["to_dict"]
+
+    def _compile_from_dict(self) -> Callable[..., Any]:
+        # Helpers are bound as keyword defaults so the generated body only
+        # touches fast locals.
+        env: Dict[str, Any] = {"_MISSING": _MISSING, "_new": object.__new__, "_cls": self.cls, "_known": self.names}
+        body: List[str] = [
+            "    if data.__class__ is not dict:",
+            "        if issues is not None and data is not None:",
+            f"            issues.append('{self.cls.__name__}: expected an object, got ' + type(data).__name__)",
+            "        data = {}",
+            "    g = data.get",
+        ]
+        for i, s in enumerate(self.fields):
+            env[f"_c{i}"] = _make_coercer(s, self.cls.__name__)
+            env[f"_t{i}"] = s.type
+            ok = f"v{i}.__class__ is _t{i}"
+            if s.required:
+                ok += f" and v{i}"
+            if s.choices is not None:
+                env[f"_ch{i}"] = frozenset(s.choices)
+                ok += f" and v{i} in _ch{i}"
+            if s.min is not None:
+                ok += f" and v{i} >= {s.min!r}"
+            if s.max is not None:
+                ok += f" and v{i} <= {s.max!r}"
+            if s.nullable:
+                ok = f"v{i} is None or ({ok})"
+            body.append(f"    v{i} = g({s.name!r}, _MISSING)")
+            body.append(f"    if not ({ok}):")
+            body.append(f"        v{i} = _c{i}(v{i}, issues)")
+        body += [
+            "    if issues is not None:",
+            "        for k in data:",
+            "            if k not in _known:",
+            f"                issues.append('{self.cls.__name__}: unknown key ' + repr(k))",
+            "    o = _new(_cls)",
+        ]
+        body += [f"    o.{s.name} = v{i}" for i, s in enumerate(self.fields)]
+        body.append("    return o")
+        params = ", ".join(f"{k}={k}" for k in env)
+        src = f"def from_dict(data, issues=None, *, {params}):\n" + "\n".join(body) + "\n"
+        ns: Dict[str, Any] = dict(env)
+        exec(compile(src, f"<schema {self.cls.__name__}.from_dict>", "exec"), ns)
+        return ns["from_dict"]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Radius of the drawn dot in DotOverlay (44 px window, 6 px inset).
+HIT_RADIUS = 16
+
+
+class SpatialIndex:
+    """Uniform grid hash of dot positions, keyed by dot id.
+
+    Each dot lives in the ``cell``-sized square containing it, so radius
+    queries only look at the handful of cells overlapping the query circle.
+    Positions are updated one dot at a time (``move``) while dragging, or
+    brought in line with a whole dot list by ``sync``.
+
+    The app uses it for the "already a dot here" check while recording and
+    for Merge Duplicates. Overlays still get their own pointer events: each
+    dot is a separate DotOverlay window, so Tk does that hit-testing.
+    """
+
+    def __init__(self, cell: int = 32) -> None:
+        if cell <= 0:
+            raise ValueError("cell size must be positive")
+        self.cell = int(cell)
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._pos: Dict[str, Tuple[int, int]] = {}
+
+    def _key(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.cell, y // self.cell)
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, dot_id: object) -> bool:
+        return dot_id in self._pos
+
+    def position(self, dot_id: str) -> Optional[Tuple[int, int]]:
+        return self._pos.get(dot_id)
+
+    def move(self, dot_id: str, x: int, y: int) -> None:
+        """Insert ``dot_id`` or update its position."""
+        x, y = int(x), int(y)
+        old = self._pos.get(dot_id)
+        if old == (x, y):
+            return
+        key = self._key(x, y)
+        if old is not None:
+            old_key = self._key(*old)
+            if old_key != key:
+                self._discard(old_key, dot_id)
+                self._cells.setdefault(key, set()).add(dot_id)
+        else:
+            self._cells.setdefault(key, set()).add(dot_id)
+        self._pos[dot_id] = (x, y)
+
+    def remove(self, dot_id: str) -> None:
+        old = self._pos.pop(dot_id, None)
+        if old is not None:
+            self._discard(self._key(*old), dot_id)
+
+    def _discard(self, key: Tuple[int, int], dot_id: str) -> None:
+        bucket = self._cells.get(key)
+        if bucket is not None:
+            bucket.discard(dot_id)
+            if not bucket:
+                del self._cells[key]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._pos.clear()
+
+    def sync(self, dots: Iterable[Any]) -> None:
+        """Match the index to ``dots``: moved dots are re-bucketed, missing ones dropped."""
+        seen: Set[str] = set()
+        for d in dots:
+            seen.add(d.id)
+            self.move(d.id, d.x, d.y)
+        for dot_id in [k for k in self._pos if k not in seen]:
+            self.remove(dot_id)
+
+    def within(self, x: int, y: int, radius: float) -> List[str]:
+        """Ids of dots within ``radius`` px of (x, y), nearest first."""
+        r = max(0.0, float(radius))
+        r2 = r * r
+        x0, y0 = self._key(int(x - r), int(y - r))
+        x1, y1 = self._key(int(x + r), int(y + r))
+        found: List[Tuple[float, str]] = []
+        pos = self._pos
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for dot_id in bucket:
+                    px, py = pos[dot_id]
+                    d2 = (px - x) ** 2 + (py - y) ** 2
+                    if d2 <= r2:
+                        found.append((d2, dot_id))
+        found.sort()
+        return [dot_id for _d2, dot_id in found]
+
+    def hit(self, x: int, y: int, radius: float = HIT_RADIUS) -> Optional[str]:
+        """The dot drawn under (x, y), if any."""
+        ids = self.within(x, y, radius)
+        return ids[0] if ids else None
+
+    def near_duplicates(self, order: Iterable[str], radius: float) -> Dict[str, List[str]]:
+        """Dots within ``radius`` px of a dot kept before them, scanning ids in ``order``.
+
+        Maps each kept dot to the later dots it covers. Overlap is not
+        chained: a dot that only touches a covered dot is kept itself.
+        """
+        kept: Dict[str, List[str]] = {}
+        for dot_id in order:
+            pos = self._pos.get(dot_id)
+            if pos is None:
+                continue
+            owner = next((o for o in self.within(pos[0], pos[1], radius) if o in kept), None)
+            if owner is None:
+                kept[dot_id] = []
+            else:
+                kept[owner].append(dot_id)
+        return {k: v for k, v in kept.items() if v}
+
+
+def duplicate_ids(dots: Iterable[Any], radius: float, index: Optional[SpatialIndex] = None) -> List[str]:
+    """Ids to drop: each dot lying within ``radius`` of an earlier dot that is kept."""
+    dots = list(dots)
+    if index is None:
+        index = SpatialIndex()
+        index.sync(dots)
+    covered = index.near_duplicates([d.id for d in dots], radius)
+    drop = {dot_id for ids in covered.values() for dot_id in ids}
+    return [d.id for d in dots if d.id in drop]
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import json
 import os
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional
 
-from .models import AppState
+from . import binfmt, journal
+from .models import AppState, Settings
+from .storage_writer import StorageWriter, atomic_write_bytes, encode_json
 
 
 def project_dir() -> Path:
@@ -16,70 +20,266 @@ def config_path() -> Path:
     return project_dir() / "config.json"
 
 
+def journal_path() -> Path:
+    return project_dir() / "config.journal"
+
+
 def profiles_dir() -> Path:
     p = project_dir() / "profiles"
     p.mkdir(parents=True, exist_ok=True)
     return p
 
 
+def profile_index_path() -> Path:
+    return project_dir() / "profiles_index.json"
+
+
 def logs_dir() -> Path:
     p = project_dir() / "logs"
     p.mkdir(parents=True, exist_ok=True)
     return p
 
 
-def _atomic_write_json(path: Path, data: object) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
-    os.replace(tmp, path)
+def atomic_write_json(path: Path, data: object) -> None:
+    """Write ``data`` as JSON to ``path`` via a temp file and rename."""
+    atomic_write_bytes(path, encode_json(data))
 
 
-def load_config() -> AppState:
+def load_config(issues: Optional[List[str]] = None) -> AppState:
+    """Load config.json plus the change journal; invalid values are reported in ``issues``."""
     path = config_path()
-    if not path.exists():
-        return AppState()
+    state = AppState()
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            state = AppState.from_dict(data, issues)
+        except Exception as e:
+            if issues is not None:
+                issues.append(f"config.json unreadable, using defaults: {e}")
+            state = AppState()
 
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return AppState.from_dict(data)
+        journal.replay(state, journal_path())
     except Exception:
-        return AppState()
+        pass
+    return state
 
 
-def save_config(state: AppState) -> None:
-    _atomic_write_json(config_path(), state.to_dict())
+def save_config(state: AppState, writer: Optional[StorageWriter] = None) -> None:
+    if writer is not None:
+        writer.write_json(config_path(), state.to_dict(), covers=(journal_path(),))
+        return
+    atomic_write_json(config_path(), state.to_dict())
+    # The snapshot now contains every journaled edit.
+    try:
+        journal_path().unlink()
+    except FileNotFoundError:
+        pass
 
 
-def _profile_path(name: str) -> Path:
+def safe_profile_name(name: str) -> str:
     safe = "".join(c for c in name if c.isalnum() or c in (" ", "-", "_", ".")).strip()
     if not safe:
         raise ValueError("Profile name is required")
-    return profiles_dir() / f"{safe}.json"
+    return safe
+
+
+# Profile file formats by suffix: pretty JSON (default) and the packed binfmt
+# layout, which is much smaller and faster for profiles with thousands of dots.
+PROFILE_SUFFIXES = (".json", binfmt.SUFFIX)
+
+
+def decode_profile(path: Path) -> AppState:
+    """Read a profile file in whichever format its suffix names."""
+    if path.suffix.lower() == binfmt.SUFFIX:
+        return binfmt.loads(path.read_bytes())
+    return AppState.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _encode_packed(data: dict) -> bytes:
+    return binfmt.dumps(AppState.from_dict(data))
+
+
+def profile_path(name: str) -> Path:
+    """Path for profile ``name``.
+
+    A name ending in a known suffix selects that format explicitly; otherwise
+    the existing file (in any format) is used, falling back to JSON.
+    """
+    safe = safe_profile_name(name)
+    root = profiles_dir()
+    if Path(safe).suffix.lower() in PROFILE_SUFFIXES:
+        return root / safe
+    for suffix in PROFILE_SUFFIXES:
+        p = root / f"{safe}{suffix}"
+        if p.exists():
+            return p
+    return root / f"{safe}.json"
+
+
+def profile_files() -> List[Path]:
+    return [p for p in profiles_dir().iterdir() if p.is_file() and p.suffix.lower() in PROFILE_SUFFIXES]
+
+
+@dataclass
+class ProfileSummary:
+    """What the Profiles list shows; read from a profile's header without parsing its dots."""
+
+    name: str
+    mtime: float
+    dot_count: int = 0
+    loop_count: int = 0
+    loop_delay_ms: int = 0
+    click_delay_ms: int = 0
+
 
+HEADER_VERSION = 1
+_HEADER_PROBE = 4096
 
-def list_profiles() -> List[Tuple[str, float]]:
-    out: List[Tuple[str, float]] = []
-    for p in profiles_dir().glob("*.json"):
+
+def profile_header(settings: Settings, dot_count: int) -> Dict[str, Any]:
+    return {
+        "version": HEADER_VERSION,
+        "dot_count": dot_count,
+        "loop_count": settings.loop_count,
+        "loop_delay_ms": settings.loop_delay_ms,
+        "click_delay_ms": settings.click_delay_ms,
+    }
+
+
+def _summary_from(name: str, mtime: float, header: Dict[str, Any]) -> ProfileSummary:
+    def num(key: str) -> int:
         try:
-            out.append((p.stem, p.stat().st_mtime))
-        except Exception:
-            continue
-    out.sort(key=lambda x: x[1], reverse=True)
+            return int(header.get(key) or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    return ProfileSummary(
+        name=name,
+        mtime=mtime,
+        dot_count=num("dot_count"),
+        loop_count=num("loop_count"),
+        loop_delay_ms=num("loop_delay_ms"),
+        click_delay_ms=num("click_delay_ms"),
+    )
+
+
+_HEADER_START = re.compile(r'\s*\{\s*"header"\s*:\s*')
+
+
+def _leading_header(text: str) -> Optional[Dict[str, Any]]:
+    """The ``"header"`` object when it is the first member of the JSON object in ``text``."""
+    m = _HEADER_START.match(text)
+    if m is None:
+        return None
+    try:
+        header, _end = json.JSONDecoder().raw_decode(text, m.end())
+    except ValueError:
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def read_profile_header(path: Path) -> Dict[str, Any]:
+    """Header of a profile file, reading only its first few KB when possible."""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER_PROBE)
+        if path.suffix.lower() == binfmt.SUFFIX:
+            try:
+                dot_count, settings = binfmt.read_header(head)
+            except ValueError:
+                dot_count, settings = binfmt.read_header(head + f.read())
+            return profile_header(settings, dot_count)
+
+    header = _leading_header(head.decode("utf-8", errors="ignore"))
+    if header is not None:
+        return header
+    # Written before profiles had a header (or it did not fit in the probe):
+    # parse it once; the index remembers the result.
+    state = decode_profile(path)
+    return profile_header(state.settings, len(state.dots))
+
+
+def list_profiles(writer: Optional[StorageWriter] = None) -> List[ProfileSummary]:
+    """Summaries of every profile, newest first.
+
+    Headers are cached in ``profiles_index.json`` keyed by file name and
+    only re-read for files whose mtime or size changed. An updated index is
+    saved through ``writer`` when given, so listing never blocks on the write.
+    """
+    index_path = profile_index_path()
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if not isinstance(index, dict) or index.get("version") != HEADER_VERSION:
+            index = {}
+    except Exception:
+        index = {}
+    cached: Dict[str, Any] = index.get("files") or {}
+
+    files: Dict[str, Any] = {}
+    out: List[ProfileSummary] = []
+    dirty = False
+    with os.scandir(profiles_dir()) as it:
+        for entry in it:
+            stem, suffix = os.path.splitext(entry.name)
+            if suffix.lower() not in PROFILE_SUFFIXES:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            rec = cached.get(entry.name)
+            if not rec or rec.get("stamp") != stamp:
+                try:
+                    header = read_profile_header(Path(entry.path))
+                except Exception:
+                    header = {}
+                rec = {"stamp": stamp, "header": header}
+                dirty = True
+            files[entry.name] = rec
+            out.append(_summary_from(stem, st.st_mtime, rec["header"]))
+
+    if dirty or len(files) != len(cached):
+        index = {"version": HEADER_VERSION, "files": files}
+        if writer is not None:
+            writer.write_json(index_path, index)
+        else:
+            try:
+                atomic_write_json(index_path, index)
+            except OSError:
+                pass
+
+    out.sort(key=lambda x: x.mtime, reverse=True)
     return out
 
 
 def load_profile(name: str) -> AppState:
-    path = _profile_path(name)
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return AppState.from_dict(data)
+    return decode_profile(profile_path(name))
 
 
-def save_profile(name: str, state: AppState) -> None:
-    _atomic_write_json(_profile_path(name), state.to_dict())
+def save_profile(name: str, state: AppState, writer: Optional[StorageWriter] = None) -> None:
+    path = profile_path(name)
+    # Saving under an explicit suffix converts the profile: drop other-format copies.
+    others = tuple(path.with_suffix(s) for s in PROFILE_SUFFIXES if s != path.suffix.lower())
+    if path.suffix.lower() == binfmt.SUFFIX:
+        encode, data = _encode_packed, state.to_dict()
+    else:
+        # Header first, so listing can read it without parsing the dots.
+        encode, data = encode_json, {"header": profile_header(state.settings, len(state.dots)), **state.to_dict()}
+    if writer is not None:
+        writer.write(path, data, encode, covers=others)
+        return
+    atomic_write_bytes(path, encode(data))
+    for p in others:
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
 
 
 def delete_profile(name: str) -> None:
-    path = _profile_path(name)
+    path = profile_path(name)
     if path.exists():
         path.unlink()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from . import metrics
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def encode_json(data: Any) -> bytes:
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+class _Op:
+    __slots__ = ("kind", "data", "covers", "encode")
+
+    def __init__(
+        self,
+        kind: str,
+        data: Any = None,
+        covers: Tuple[Path, ...] = (),
+        encode: Callable[[Any], bytes] = encode_json,
+    ) -> None:
+        self.kind = kind
+        self.data = data
+        self.covers = covers
+        self.encode = encode
+
+
+class StorageWriter:
+    """Performs file writes on a dedicated thread.
+
+    Callers hand over already-detached data (e.g. ``AppState.to_dict()``), so
+    the Tk thread only pays for the snapshot; JSON encoding and disk I/O happen
+    here. Pending operations are keyed by path: a newer write replaces an older
+    one that has not run yet, appends to the same file are merged, and a write
+    whose bytes match the last ones written to that path is skipped.
+    """
+
+    def __init__(self, on_error: Optional[Callable[[Any, BaseException], None]] = None) -> None:
+        self._on_error = on_error
+        self._pending: "OrderedDict[Hashable, _Op]" = OrderedDict()
+        self._hashes: Dict[Path, str] = {}
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+
+        self.written = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+        self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self._thread.start()
+
+    def write_json(self, path: Path, data: Any, covers: Iterable[Path] = ()) -> None:
+        self.write(path, data, encode_json, covers)
+
+    def write(self, path: Path, data: Any, encode: Callable[[Any], bytes], covers: Iterable[Path] = ()) -> None:
+        """Replace ``path`` with ``encode(data)``.
+
+        ``covers`` lists files made redundant by this write (the change
+        journal for a config snapshot): their pending operations are dropped
+        and the files are removed once ``path`` is on disk.
+        """
+        covers = tuple(covers)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StorageWriter is closed")
+            if self._pending.pop(path, None) is not None:
+                self.coalesced += 1
+            for p in covers:
+                if self._pending.pop(p, None) is not None:
+                    self.coalesced += 1
+            self._pending[path] = _Op("write", data, covers, encode)
+            self._cond.notify()
+
+    def append(self, path: Path, data: bytes) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StorageWriter is closed")
+            op = self._pending.get(path)
+            if op is not None and op.kind == "append":
+                op.data += data
+                self.coalesced += 1
+            else:
+                self._pending[path] = _Op("append", bytearray(data))
+            self._cond.notify()
+
+    def call(self, key: Hashable, fn: Callable[[], None]) -> None:
+        """Run ``fn`` on the writer thread; a pending call with the same key is replaced."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StorageWriter is closed")
+            if self._pending.pop(key, None) is not None:
+                self.coalesced += 1
+            self._pending[key] = _Op("call", fn)
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every pending operation has run; False on timeout.
+
+        From inside a ``call`` (on the writer thread) everything queued before
+        it has already run, so this returns at once instead of waiting on itself.
+        """
+        with self._cond:
+            if threading.current_thread() is self._thread:
+                return not self._pending
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        ok = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return ok
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                path, op = self._pending.popitem(last=False)
+                self._busy = True
+
+            try:
+                self._execute(path, op)
+            except Exception as e:
+                if self._on_error is not None:
+                    try:
+                        self._on_error(path, e)
+                    except Exception:
+                        pass
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _execute(self, path: Any, op: _Op) -> None:
+        t0 = time.perf_counter()
+        if op.kind == "call":
+            op.data()
+            self.written += 1
+        elif op.kind == "append":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(op.data)
+            self._hashes.pop(path, None)
+            self.written += 1
+        else:
+            data = op.encode(op.data)
+            digest = hashlib.sha256(data).hexdigest()
+            if self._hashes.get(path) == digest and path.exists():
+                self.skipped += 1
+            else:
+                atomic_write_bytes(path, data)
+                self._hashes[path] = digest
+                self.written += 1
+            for p in op.covers:
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+                self._hashes.pop(p, None)
+        metrics.record("storage.write", (time.perf_counter() - t0) * 1000.0)
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .models import Dot
+
+
+class RowIndex:
+    """Sorted/filtered view over a dot list, stored as positions into that list."""
+
+    def __init__(
+        self,
+        sort_keys: Dict[str, Callable[[Dot], Any]],
+        match: Callable[[Dot, str], bool],
+    ) -> None:
+        self._sort_keys = sort_keys
+        self._match = match
+        self.sort_column: Optional[str] = None
+        self.sort_reverse = False
+        self.filter_text = ""
+        self._dots: Sequence[Dot] = ()
+        self._rows: Sequence[int] = range(0)
+        self._row_of: Optional[Dict[str, int]] = None
+
+    def is_identity(self) -> bool:
+        return self.sort_column is None and not self.filter_text
+
+    def rebuild(self, dots: Sequence[Dot]) -> None:
+        self._dots = dots
+        self._row_of = None
+        if self.is_identity():
+            self._rows = range(len(dots))
+            return
+
+        rows: List[int] = list(range(len(dots)))
+        if self.filter_text:
+            needle = self.filter_text.lower()
+            rows = [i for i in rows if self._match(dots[i], needle)]
+        if self.sort_column is not None:
+            key = self._sort_keys[self.sort_column]
+            rows.sort(key=lambda i: key(dots[i]), reverse=self.sort_reverse)
+        self._rows = rows
+
+    def set_sort(self, column: Optional[str]) -> None:
+        if column is not None and column == self.sort_column:
+            if self.sort_reverse:
+                self.sort_column = None
+                self.sort_reverse = False
+            else:
+                self.sort_reverse = True
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self.rebuild(self._dots)
+
+    def set_filter(self, text: str) -> None:
+        self.filter_text = (text or "").strip()
+        self.rebuild(self._dots)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def window(self, start: int, count: int) -> List[Dot]:
+        dots = self._dots
+        return [dots[i] for i in self._rows[start : start + count]]
+
+    def row_of(self, dot_id: str) -> Optional[int]:
+        if self._row_of is None:
+            dots = self._dots
+            self._row_of = {dots[i].id: r for r, i in enumerate(self._rows)}
+        return self._row_of.get(dot_id)
+
+
+def _dot_matches(d: Dot, needle: str) -> bool:
+    return needle in (d.name or "").lower() or needle in d.click_type or needle in (d.key or "").lower()
+
+
+def sync_window(
+    tree: Any,
+    shown: List[str],
+    rows: Dict[str, tuple],
+    window: Sequence[Dot],
+    row_values: Callable[[Dot], tuple],
+    first_row: int = 0,
+) -> List[str]:
+    """Make ``tree`` show exactly ``window``, in order, touching only what differs.
+
+    ``shown`` is the item ids currently in the tree, in order, and ``rows``
+    caches each item's ``(values, stripe)``; ``rows`` is updated in place and
+    the new order is returned. Items that stay are kept (moved only if their
+    relative order changed) and only rows whose values or stripe changed are
+    rewritten. ``first_row`` is the window's row number, for the stripes.
+    """
+    ids = [d.id for d in window]
+    if ids != shown:
+        wanted = set(ids)
+        removed = [i for i in shown if i not in wanted]
+        if removed:
+            tree.delete(*removed)
+            for dot_id in removed:
+                rows.pop(dot_id, None)
+        # Scrolling keeps the survivors in order, so only new rows go in;
+        # re-sorting needs every row placed.
+        kept = [i for i in shown if i in wanted]
+        in_order = kept == [i for i in ids if i in rows]
+        for pos, dot_id in enumerate(ids):
+            if dot_id not in rows:
+                tree.insert("", pos, iid=dot_id)
+                rows[dot_id] = ()
+            elif not in_order:
+                tree.move(dot_id, "", pos)
+
+    for pos, d in enumerate(window):
+        row = (row_values(d), "even" if ((first_row + pos) % 2 == 0) else "odd")
+        prev = rows.get(d.id)
+        if prev == row:
+            continue
+        if not prev or prev[0] != row[0]:
+            tree.item(d.id, values=row[0], tags=(row[1],))
+        else:
+            tree.item(d.id, tags=(row[1],))
+        rows[d.id] = row
+    return ids
+
+
+DOT_SORT_KEYS: Dict[str, Callable[[Dot], Any]] = {
+    "name": lambda d: (d.name or "").lower(),
+    "x": lambda d: int(d.x),
+    "y": lambda d: int(d.y),
+    "type": lambda d: d.click_type,
+    "delay": lambda d: -1 if d.delay_override_ms is None else int(d.delay_override_ms),
+}
+
+
+class VirtualDotTable:
+    """A ``ttk.Treeview`` that only materializes the rows currently on screen.
+
+    The dot list stays the source of truth; the Treeview holds at most one
+    screenful of items, keyed by ``Dot.id``, and is re-filled from a
+    :class:`RowIndex` as the user scrolls, sorts or filters.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        columns: Sequence[Tuple[str, str, int]],
+        get_dots: Callable[[], Sequence[Dot]],
+        row_values: Callable[[Dot], tuple],
+        on_select: Callable[[], None],
+    ) -> None:
+        self._get_dots = get_dots
+        self._row_values = row_values
+        self._on_select = on_select
+        self._titles = {col: title for col, title, _w in columns}
+
+        self._index = RowIndex(DOT_SORT_KEYS, _dot_matches)
+        self._offset = 0
+        self._visible = 20
+        self._selected_id: Optional[str] = None
+        self._rows: Dict[str, tuple] = {}
+        self._order: List[str] = []
+
+        self.tree = ttk.Treeview(
+            master,
+            columns=tuple(col for col, _t, _w in columns),
+            show="headings",
+            selectmode="browse",
+        )
+        for col, title, w in columns:
+            self.tree.heading(col, text=title, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=w, anchor=("w" if col == "name" else "center"))
+
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self._on_scrollbar)
+
+        self.tree.bind("<<TreeviewSelect>>", lambda _e: self._on_tree_select())
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda _e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda _e: self.scroll(3))
+        self.tree.bind("<Up>", lambda _e: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda _e: self._step_selection(1))
+        self.tree.bind("<Prior>", lambda _e: self._step_selection(-self._visible))
+        self.tree.bind("<Next>", lambda _e: self._step_selection(self._visible))
+
+    def selected_id(self) -> Optional[str]:
+        return self._selected_id
+
+    def select(self, dot_id: Optional[str]) -> None:
+        changed = dot_id != self._selected_id
+        self._selected_id = dot_id
+        if dot_id is not None:
+            row = self._index.row_of(dot_id)
+            if row is not None and not (self._offset <= row < self._offset + self._visible):
+                self._offset = self._clamp_offset(row - self._visible // 2)
+        self._render()
+        if changed and dot_id is not None:
+            self._on_select()
+
+    def refresh(self, changed: Optional[Sequence[str]] = None) -> None:
+        """Re-read the dot list; ``changed`` hints that only those dots' values moved."""
+        dots = self._get_dots()
+        if changed is None or not self._index.is_identity() or len(self._index) != len(dots):
+            self._index.rebuild(dots)
+            if self._selected_id is not None and not any(d.id == self._selected_id for d in dots):
+                self._selected_id = None
+        self._offset = self._clamp_offset(self._offset)
+        self._render()
+
+    def sort_by(self, column: Optional[str]) -> None:
+        self._index.set_sort(column)
+        for col, title in self._titles.items():
+            arrow = ""
+            if col == self._index.sort_column:
+                arrow = " ▼" if self._index.sort_reverse else " ▲"
+            self.tree.heading(col, text=title + arrow)
+        self._render()
+
+    def set_filter(self, text: str) -> None:
+        self._index.set_filter(text)
+        self._offset = 0
+        self._render()
+
+    def scroll(self, rows: int) -> None:
+        offset = self._clamp_offset(self._offset + int(rows))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _clamp_offset(self, offset: int) -> int:
+        return max(0, min(int(offset), len(self._index) - self._visible))
+
+    def _render(self) -> None:
+        tree = self.tree
+        rows = self._rows
+        window = self._index.window(self._offset, self._visible)
+        self._order = sync_window(tree, self._order, rows, window, self._row_values, self._offset)
+
+        sel = self._selected_id
+        shown = tree.selection()
+        if sel is not None and sel in rows:
+            if tuple(shown) != (sel,):
+                tree.selection_set(sel)
+        elif shown:
+            tree.selection_remove(*shown)
+
+        total = len(self._index)
+        if total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + self._visible) / total))
+
+    def _on_tree_select(self) -> None:
+        sel = self.tree.selection()
+        if not sel:
+            # Rows scrolled out of the window drop their Treeview selection;
+            # the logical selection is kept by id.
+            return
+        dot_id = str(sel[0])
+        if dot_id == self._selected_id:
+            return
+        self._selected_id = dot_id
+        self._on_select()
+
+    def _step_selection(self, delta: int) -> str:
+        total = len(self._index)
+        if total <= 0:
+            return "break"
+        row = self._index.row_of(self._selected_id) if self._selected_id is not None else None
+        row = 0 if row is None else max(0, min(total - 1, row + delta))
+        dot = self._index.window(row, 1)[0]
+        if row < self._offset:
+            self._offset = row
+        elif row >= self._offset + self._visible:
+            self._offset = self._clamp_offset(row - self._visible + 1)
+        self.select(dot.id)
+        return "break"
+
+    def _on_scrollbar(self, *args: str) -> None:
+        total = len(self._index)
+        if not args or total <= 0:
+            return
+        if args[0] == "moveto":
+            self._offset = self._clamp_offset(round(float(args[1]) * total))
+            self._render()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= max(1, self._visible - 1)
+            self.scroll(step)
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        delta = int(getattr(event, "delta", 0) or 0)
+        if delta:
+            self.scroll(-3 if delta > 0 else 3)
+        return "break"
+
+    def _on_configure(self, event: tk.Event) -> None:
+        try:
+            row_h = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or 20)
+        except Exception:
+            row_h = 20
+        # Leave room for the heading row.
+        visible = max(1, (int(event.height) - row_h) // max(1, row_h))
+        if visible != self._visible:
+            self._visible = visible
+            self._offset = self._clamp_offset(self._offset)
+            self._render()
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .input_backend import InputBackend
+
+
+# (name, category, start ns, duration ns or None for an instant, thread id, args)
+Event = Tuple[str, str, int, Optional[int], int, Optional[Dict[str, Any]]]
+
+
+class Tracer:
+    """Fixed-size ring buffer of trace spans, exported as Chrome ``trace_event`` JSON.
+
+    The buffer is allocated up front and recording only stores a tuple in
+    the next slot, so it is cheap enough for per-click spans; once full the
+    oldest events are overwritten. Callers keep a ``Tracer`` or ``None`` and
+    test for it, which is all tracing costs when it is off.
+    """
+
+    def __init__(self, capacity: int = 65536) -> None:
+        self.capacity = max(1, int(capacity))
+        self._events: List[Optional[Event]] = [None] * self.capacity
+        self._seq = itertools.count()
+        self._total = 0
+        self._threads: Dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+
+    now = staticmethod(time.perf_counter_ns)
+
+    def _put(self, event: Event) -> None:
+        i = next(self._seq)
+        self._events[i % self.capacity] = event
+        self._total = i + 1
+        tid = event[4]
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+
+    def complete(self, name: str, cat: str, t0: int, args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a span that started at ``t0`` (from :meth:`now`) and ends now."""
+        self._put((name, cat, t0, time.perf_counter_ns() - t0, threading.get_ident(), args))
+
+    def instant(self, name: str, cat: str, args: Optional[Dict[str, Any]] = None) -> None:
+        self._put((name, cat, time.perf_counter_ns(), None, threading.get_ident(), args))
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args: Any) -> Iterator[None]:
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, t0, args or None)
+
+    @property
+    def count(self) -> int:
+        return min(self._total, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self._total - self.capacity)
+
+    def events(self) -> List[Event]:
+        """Recorded events, oldest first."""
+        total = self._total
+        if total <= self.capacity:
+            out = self._events[:total]
+        else:
+            start = total % self.capacity
+            out = self._events[start:] + self._events[:start]
+        return [e for e in out if e is not None]
+
+    def clear(self) -> None:
+        self._events = [None] * self.capacity
+        self._seq = itertools.count()
+        self._total = 0
+        self._origin = time.perf_counter_ns()
+
+    def to_chrome(self) -> Dict[str, Any]:
+        origin = self._origin
+        trace: List[Dict[str, Any]] = []
+        for name, cat, t0, dur, tid, args in self.events():
+            ev: Dict[str, Any] = {"name": name, "cat": cat, "pid": 1, "tid": tid, "ts": (t0 - origin) / 1000.0}
+            if dur is None:
+                ev["ph"] = "i"
+                ev["s"] = "t"
+            else:
+                ev["ph"] = "X"
+                ev["dur"] = dur / 1000.0
+            if args:
+                ev["args"] = args
+            trace.append(ev)
+        for tid, tname in self._threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": tname}})
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+
+    def dump(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f, separators=(",", ":"))
+        tmp.replace(path)
+        return path
+
+
+def trace_path(directory: Optional[Path] = None) -> Path:
+    from .storage import logs_dir
+
+    directory = directory or logs_dir()
+    return directory / time.strftime("trace-%Y%m%d-%H%M%S.json")
+
+
+class TracingBackend(InputBackend):
+    """Wraps an InputBackend so each call is recorded as a ``backend`` span."""
+
+    def __init__(self, inner: InputBackend, tracer: Tracer) -> None:
+        self._inner = inner
+        self._tracer = tracer
+
+    def move(self, x: int, y: int, speed: int) -> None:
+        t0 = self._tracer.now()
+        try:
+            self._inner.move(x, y, speed=speed)
+        finally:
+            self._tracer.complete("move", "backend", t0)
+
+    def click(self, x: int, y: int) -> None:
+        t0 = self._tracer.now()
+        try:
+            self._inner.click(x, y)
+        finally:
+            self._tracer.complete("click", "backend", t0)
+
+    def double_click(self, x: int, y: int, click_speed_ms: int) -> None:
+        t0 = self._tracer.now()
+        try:
+            self._inner.double_click(x, y, click_speed_ms=click_speed_ms)
+        finally:
+            self._tracer.complete("double_click", "backend", t0)
+
+    def hold_click(self, x: int, y: int, hold_ms: int) -> None:
+        t0 = self._tracer.now()
+        try:
+            self._inner.hold_click(x, y, hold_ms=hold_ms)
+        finally:
+            self._tracer.complete("hold_click", "backend", t0)
+
+    def key_press(self, key: str) -> None:
+        t0 = self._tracer.now()
+        try:
+            self._inner.key_press(key)
+        finally:
+            self._tracer.complete("key_press", "backend", t0, {"key": key})
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from . import metrics
+
+
+class UiDispatcher:
+    """Runs callables posted from worker threads on the Tk thread.
+
+    ``post`` never touches Tk itself: it queues the callable and signals a
+    small waker thread, which raises one virtual event on the Tk root per
+    burst. The Tk thread then drains the queue in bounded batches, yielding
+    back to the event loop between batches so a flood of posts cannot freeze
+    the window. A slow fallback poll covers Tcl builds that reject calls from
+    other threads.
+    """
+
+    WAKE_EVENT = "<<UiQueueWake>>"
+    # Consecutive event_generate failures (e.g. posts arriving before
+    # mainloop runs) tolerated before the waker gives up for good.
+    WAKE_MAX_FAILURES = 5
+    WAKE_RETRY_S = 0.05
+
+    def __init__(
+        self,
+        root,
+        on_error: Callable[[], None],
+        batch_max: int = 64,
+        budget_ms: float = 8.0,
+        fallback_ms: int = 1000,
+        wake: bool = True,
+    ) -> None:
+        self._root = root
+        self._on_error = on_error
+        self._batch_max = max(1, int(batch_max))
+        self._budget_s = max(0.001, float(budget_ms) / 1000.0)
+        self._fallback_ms = self._base_fallback_ms = max(1, int(fallback_ms))
+
+        self._queue: "queue.SimpleQueue[Tuple[float, Callable[[], None]]]" = queue.SimpleQueue()
+        self._closed = False
+        self._continue_job = None
+        self._fallback_job = None
+
+        self._wake = threading.Event()
+        self._waker: Optional[threading.Thread] = None
+        if wake:
+            root.bind(self.WAKE_EVENT, lambda _e: self.drain(), add="+")
+            self._waker = threading.Thread(target=self._waker_loop, name="ui-waker", daemon=True)
+            self._waker.start()
+
+        self._fallback_job = root.after(self._fallback_ms, self._fallback_poll)
+
+    def post(self, fn: Callable[[], None]) -> None:
+        if self._closed:
+            return
+        self._queue.put((time.perf_counter(), fn))
+        if self._waker is not None:
+            self._wake.set()
+
+    def drain(self) -> None:
+        self._cancel_continue()
+        if self._closed:
+            return
+        deadline = time.perf_counter() + self._budget_s
+        for _ in range(self._batch_max):
+            try:
+                posted_at, fn = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            metrics.record("ui_queue.post_to_run", (time.perf_counter() - posted_at) * 1000.0)
+            try:
+                fn()
+            except Exception:
+                self._on_error()
+            if self._closed:
+                return
+            if time.perf_counter() >= deadline:
+                break
+
+        if not self._queue.empty() and self._continue_job is None:
+            try:
+                self._continue_job = self._root.after(1, self.drain)
+            except Exception:
+                self._continue_job = None
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._cancel_continue()
+        if self._fallback_job is not None:
+            try:
+                self._root.after_cancel(self._fallback_job)
+            except Exception:
+                pass
+            self._fallback_job = None
+
+    def _cancel_continue(self) -> None:
+        if self._continue_job is None:
+            return
+        try:
+            self._root.after_cancel(self._continue_job)
+        except Exception:
+            pass
+        self._continue_job = None
+
+    def _waker_loop(self) -> None:
+        failures = 0
+        try:
+            while True:
+                self._wake.wait()
+                self._wake.clear()
+                if self._closed:
+                    return
+                try:
+                    self._root.event_generate(self.WAKE_EVENT, when="tail")
+                except Exception as exc:
+                    # Poll quickly while waking fails; the pending posts are
+                    # picked up by the fallback poll.
+                    self._fallback_ms = min(self._base_fallback_ms, 25)
+                    failures += 1
+                    # Non-threaded Tcl rejects every call from this thread.
+                    if "apartment" in str(exc) or failures >= self.WAKE_MAX_FAILURES:
+                        return
+                    time.sleep(self.WAKE_RETRY_S * failures)
+                    self._wake.set()
+                    continue
+                if failures:
+                    failures = 0
+                    self._fallback_ms = self._base_fallback_ms
+        finally:
+            self._waker = None
+
+    def _fallback_poll(self) -> None:
+        self._fallback_job = None
+        if self._closed:
+            return
+        if not self._queue.empty():
+            self.drain()
+        try:
+            self._fallback_job = self._root.after(self._fallback_ms, self._fallback_poll)
+        except Exception:
+            self._fallback_job = None
@@ -1,78 +1,97 @@
 from __future__ import annotations
 
-import hashlib
 import os
-import queue
+import sys
 import threading
 import time
 import tkinter as tk
-import webbrowser
 from datetime import datetime
-from tkinter import ttk
-from typing import Callable
+from tkinter import messagebox, ttk
+from typing import Callable, Iterable, Iterator
 
 import customtkinter as ctk
 
 from adoptme_macro import hotkeys as hotkeys_mod
+from adoptme_macro.history import History
 from adoptme_macro.hotkeys import HotkeyConfig, HotkeyManager
-from adoptme_macro.input_backend import build_backend
-from adoptme_macro.logging_utils import configure_logging
+from adoptme_macro.input_backend import InputBackend, build_backend
+from adoptme_macro.journal import ChangeJournal
+from adoptme_macro import metrics
+from adoptme_macro.logging_utils import configure_logging, log_file_path, shutdown_logging, tail_lines
 from adoptme_macro.models import AppState, Dot
 from adoptme_macro.overlay import OverlayManager
+from adoptme_macro.profiling import SamplingProfiler
+from adoptme_macro.profile_store import PROFILE_STORES, open_profile_store
 from adoptme_macro.runner import MacroRunner, RunnerStatus
+from adoptme_macro.spatial import HIT_RADIUS, SpatialIndex, duplicate_ids
+from adoptme_macro.table_view import VirtualDotTable
+from adoptme_macro.tracing import Tracer
+from adoptme_macro.ui_queue import UiDispatcher
 from adoptme_macro import storage
+from adoptme_macro.storage_writer import StorageWriter
 from adoptme_macro.win_focus import is_foreground_process
 
 
 TOS_VERSION = 1
 DISCORD_INVITE_URL = "https://discord.com/invite/498tyUUaBw"
 ACCESS_KEY_SHA256 = "017787675c118bb908c3e4b8bf44ecb26e42beddc5ad2d153ed38c289534d3a2"
+JOURNAL_COMPACT_MS = 30_000
+LOG_VIEWER_LINES = 500
 
 
 class App(ctk.CTk):
-    def __init__(self) -> None:
+    def __init__(self, profiler: SamplingProfiler | None = None) -> None:
+        self._t_start = time.perf_counter()
+        # Started by main() for --profile so startup is covered too.
+        self._profiler = profiler
         super().__init__()
 
         self.title("Adopt Me Macro")
         self.geometry("980x680")
         self.minsize(900, 620)
 
-        self._state: AppState = storage.load_config()
+        # config.json is parsed on a worker thread; until it arrives the window
+        # shows defaults with the macro controls disabled (see _on_config_loaded).
+        self._state: AppState = AppState()
+        self._loading = True
+        self._startup_gate_needed = True
         ctk.set_appearance_mode(self._state.settings.theme)
         ctk.set_default_color_theme("blue")
 
-        try:
-            s = self._state.settings
-            accepted = int(getattr(s, "tos_accepted_version", 0) or 0)
-            self._startup_gate_needed = accepted < TOS_VERSION or not bool(getattr(s, "access_key_accepted", False))
-        except Exception:
-            self._startup_gate_needed = True
-
         self._ttk_style = ttk.Style(self)
         self._apply_ttk_theme()
 
         self._logger = configure_logging(self._state.settings)
 
-        self._ui_queue: queue.Queue[Callable[[], None]] = queue.Queue()
         self._closing = False
-        self._ui_drain_job = self.after(25, self._drain_ui_queue)
+        self._ui = UiDispatcher(self, on_error=self._on_ui_task_error)
 
         self._autosave_job = None
         self._msg_job = None
+        self._overlay_job = None
+        self._writer = StorageWriter(on_error=self._on_storage_error)
+        self._journal = ChangeJournal(storage.journal_path(), writer=self._writer)
+        self._profiles = open_profile_store("json", writer=self._writer)
         self._emergency_exit_cancel = threading.Event()
 
         self._record_dot_win: tk.Toplevel | None = None
+        self._log_viewer: tk.Toplevel | None = None
+        self._log_viewer_job = None
+        self._log_viewer_stamp: tuple | None = None
 
         self._last_run_preview = False
 
-        self._overlay = OverlayManager(self, self._state.settings, on_dot_moved=self._on_dot_moved)
-        for idx, d in enumerate(self._state.dots):
-            self._overlay.add_dot(d, idx)
+        self._overlay = OverlayManager(
+            self,
+            self._state.settings,
+            on_dot_moved=self._on_dot_moved,
+            on_dot_dragging=self._on_dot_dragging,
+        )
 
         self._dots_visible_user = True
 
         self._runner = MacroRunner(
-            backend=build_backend(self._state.settings),
+            backend=InputBackend(),
             get_settings=lambda: self._state.settings,
             get_dots=lambda: self._state.dots,
             on_status=lambda st: self._post_ui(lambda st=st: self._on_runner_status(st)),
@@ -81,7 +100,35 @@ class App(ctk.CTk):
             on_stopped=lambda: self._post_ui(self._on_runner_stopped),
         )
 
-        self._hotkeys = HotkeyManager(
+        # Created once the config is loaded, with the configured keys.
+        self._hotkeys: HotkeyManager | None = None
+        self._hotkeys_active = False
+        self._hotkeys_failed = False
+
+        self._dots_table_version = -1
+        self._spatial = SpatialIndex()
+        self._history = History()
+        self._tracer: Tracer | None = None
+
+        self._build_ui()
+        self._apply_ttk_theme()
+        self._refresh_dots_table()
+        self._update_status(RunnerStatus(state="STOPPED"))
+        self._set_controls_enabled(False)
+        self._set_message("Loading configuration...", timeout_ms=0)
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.bind("<Control-z>", lambda e: self._on_undo_key(e, redo=False), add="+")
+        self.bind("<Control-y>", lambda e: self._on_undo_key(e, redo=True), add="+")
+        self.bind("<Control-Shift-Z>", lambda e: self._on_undo_key(e, redo=True), add="+")
+        self._first_paint_bind = self.bind("<Map>", self._on_first_map, add="+")
+
+        self._focus_job = self.after(self._state.settings.window_check_interval_ms, self._focus_poll)
+
+        threading.Thread(target=self._load_config_worker, name="config-loader", daemon=True).start()
+
+    def _make_hotkeys(self) -> HotkeyManager:
+        return HotkeyManager(
             HotkeyConfig(
                 start_stop=self._state.settings.start_stop_hotkey,
                 pause_resume=self._state.settings.pause_resume_hotkey,
@@ -90,25 +137,86 @@ class App(ctk.CTk):
             on_pause_resume=self._on_hotkey_pause_resume,
             on_emergency_stop=self._on_hotkey_emergency_stop,
         )
-        self._hotkeys_active = False
-        self._hotkeys_failed = False
+
+    def _load_config_worker(self) -> None:
+        issues: list[str] = []
+        try:
+            st = storage.load_config(issues)
+        except Exception:
+            st = AppState()
+        self._post_ui(lambda st=st: self._on_config_loaded(st, issues))
+
+    def _on_config_loaded(self, st: AppState, issues: list[str] | None = None) -> None:
+        if self._closing:
+            return
+        prev_theme = self._state.settings.theme
+        st.pack_dots()
+        self._state = st
+        s = st.settings
+
+        if s.theme != prev_theme:
+            ctk.set_appearance_mode(s.theme)
+            self._apply_ttk_theme()
+        self._logger = configure_logging(s)
+        for issue in issues or ():
+            self._logger.warning(f"Config: {issue}")
+        if self._journal.resume(st) and s.autosave_config:
+            # Fold edits left over from the last session into config.json.
+            self._cancel_job("_autosave_job")
+            self._autosave_job = self.after(350, self._save_config)
+        self._history.max_bytes = int(s.undo_memory_mb) * 1024 * 1024
+        self._history.reset(st.dots)
+        self._open_profile_store(str(s.profile_store))
+
+        self._overlay.set_settings(s)
+        self._rebuild_runner()
+        self._hotkeys = self._make_hotkeys()
+
+        try:
+            accepted = int(getattr(s, "tos_accepted_version", 0) or 0)
+            self._startup_gate_needed = accepted < TOS_VERSION or not bool(getattr(s, "access_key_accepted", False))
+        except Exception:
+            self._startup_gate_needed = True
         if not self._startup_gate_needed:
+            self._set_controls_enabled(True)
             self._try_start_hotkeys()
 
-        self._build_ui()
-        self._apply_ttk_theme()
         self._sync_ui_from_state()
         self._refresh_dots_table()
-        self._update_status(RunnerStatus(state="STOPPED"))
+        self._set_message("")
+        self._loading = False
 
-        if self._startup_gate_needed:
-            self._set_controls_enabled(False)
+        self._rebuild_overlays()
+        self.after(150, self._maybe_show_first_run_modals)
 
-        self.protocol("WM_DELETE_WINDOW", self._on_close)
+    def _rebuild_overlays(self) -> None:
+        """Sync overlays with the dot list a few at a time so a big profile never blocks a frame."""
+        self._cancel_job("_overlay_job")
+        self._spatial.sync(self._state.dots)
+        self._pump_overlays(self._overlay.rebuild_steps(self._state.dots))
 
-        self._focus_job = self.after(self._state.settings.window_check_interval_ms, self._focus_poll)
+    def _pump_overlays(self, steps: Iterator[None]) -> None:
+        self._overlay_job = None
+        if self._closing:
+            return
+        deadline = time.perf_counter() + 0.008
+        for _ in steps:
+            if time.perf_counter() >= deadline:
+                self._overlay_job = self.after(1, lambda: self._pump_overlays(steps))
+                return
+        self._overlay.reindex(self._state.dots)
 
-        self.after(150, self._maybe_show_first_run_modals)
+    def _on_first_map(self, event: tk.Event) -> None:
+        # Left bound on purpose: unbind() with a funcid drops every <Map> binding.
+        if event.widget is not self or self._first_paint_bind is None:
+            return
+        self._first_paint_bind = None
+        ms = (time.perf_counter() - self._t_start) * 1000.0
+        metrics.record("startup.first_paint", ms)
+        try:
+            self._logger.debug(f"Startup: first paint after {ms:.1f} ms")
+        except Exception:
+            pass
 
     def _maybe_show_first_run_modals(self) -> None:
         if self._closing:
@@ -126,8 +234,8 @@ class App(ctk.CTk):
                 return
 
             try:
-                s.tos_accepted_version = TOS_VERSION
-                storage.save_config(self._state)
+                self._state.update_settings(tos_accepted_version=TOS_VERSION)
+                storage.save_config(self._state, writer=self._writer)
             except Exception:
                 pass
 
@@ -141,9 +249,8 @@ class App(ctk.CTk):
                 return
 
             try:
-                s.access_key_accepted = True
-                s.discord_prompt_shown = True
-                storage.save_config(self._state)
+                self._state.update_settings(access_key_accepted=True, discord_prompt_shown=True)
+                storage.save_config(self._state, writer=self._writer)
             except Exception:
                 pass
 
@@ -256,6 +363,8 @@ class App(ctk.CTk):
 
         def join_discord() -> None:
             try:
+                import webbrowser
+
                 webbrowser.open(DISCORD_INVITE_URL)
             except Exception:
                 pass
@@ -264,6 +373,8 @@ class App(ctk.CTk):
         err_var = tk.StringVar(value="")
 
         def submit() -> None:
+            import hashlib
+
             raw = (key_var.get() or "").strip()
             digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
             if digest == ACCESS_KEY_SHA256:
@@ -336,8 +447,8 @@ class App(ctk.CTk):
 
         def mark_shown_and_close() -> None:
             try:
-                s.discord_prompt_shown = True
-                storage.save_config(self._state)
+                self._state.update_settings(discord_prompt_shown=True)
+                storage.save_config(self._state, writer=self._writer)
             except Exception:
                 pass
             try:
@@ -347,6 +458,8 @@ class App(ctk.CTk):
 
         def join() -> None:
             try:
+                import webbrowser
+
                 webbrowser.open(DISCORD_INVITE_URL)
             except Exception:
                 pass
@@ -428,6 +541,7 @@ class App(ctk.CTk):
             segmented_button_selected_hover_color=tab_selected,
             segmented_button_unselected_color=tab_unselected,
             segmented_button_unselected_hover_color=tab_unselected_hover,
+            command=self._on_tab_changed,
         )
         self._tabs.grid(row=1, column=0, padx=14, pady=(0, 14), sticky="nsew")
 
@@ -440,14 +554,45 @@ class App(ctk.CTk):
         self._tab_visual = self._tabs.add("Visual")
         self._tab_roblox = self._tabs.add("Roblox")
 
-        self._build_dots_tab()
-        self._build_hotkeys_tab()
-        self._build_perf_tab()
-        self._build_profiles_tab()
-        self._build_post_tab()
-        self._build_advanced_tab()
-        self._build_visual_tab()
-        self._build_roblox_tab()
+        # Tabs other than Dots are built the first time they are opened.
+        self._tab_builders: dict[str, Callable[[], None]] = {
+            "Dots": self._build_dots_tab,
+            "Hotkeys": self._build_hotkeys_tab,
+            "Performance": self._build_perf_tab,
+            "Profiles": self._build_profiles_tab,
+            "Post Action": self._build_post_tab,
+            "Advanced": self._build_advanced_tab,
+            "Visual": self._build_visual_tab,
+            "Roblox": self._build_roblox_tab,
+        }
+        self._tab_syncers: dict[str, Callable[[], None]] = {
+            "Hotkeys": self._sync_hotkeys_tab,
+            "Performance": self._sync_perf_tab,
+            "Post Action": self._sync_post_tab,
+            "Advanced": self._sync_advanced_tab,
+            "Visual": self._sync_visual_tab,
+            "Roblox": self._sync_roblox_tab,
+        }
+        self._built_tabs: set[str] = set()
+        self._ensure_tab_built("Dots")
+
+    def _on_tab_changed(self) -> None:
+        try:
+            self._ensure_tab_built(self._tabs.get())
+        except Exception:
+            try:
+                self._logger.exception("Failed to build tab")
+            except Exception:
+                pass
+
+    def _ensure_tab_built(self, name: str) -> None:
+        if name in self._built_tabs:
+            return
+        builder = self._tab_builders.get(name)
+        if builder is None:
+            return
+        self._built_tabs.add(name)
+        builder()
 
     def _build_dots_tab(self) -> None:
         self._tab_dots.grid_columnconfigure(0, weight=1)
@@ -474,13 +619,22 @@ class App(ctk.CTk):
         reset_btn = ctk.CTkButton(bar, text="Reset Positions", command=self._reset_positions)
         reset_btn.grid(row=0, column=5, padx=10, pady=10)
 
+        merge_btn = ctk.CTkButton(bar, text="Merge Duplicates", command=self._merge_near_duplicates)
+        merge_btn.grid(row=0, column=6, padx=10, pady=10)
+
+        undo_btn = ctk.CTkButton(bar, text="Undo", width=70, command=self._undo)
+        undo_btn.grid(row=0, column=7, padx=(10, 4), pady=10)
+
+        redo_btn = ctk.CTkButton(bar, text="Redo", width=70, command=self._redo)
+        redo_btn.grid(row=0, column=8, padx=(4, 10), pady=10)
+
         self._dot_type_var = tk.StringVar(value="click")
         dot_type = ctk.CTkOptionMenu(bar, values=["click", "double", "hold", "key"], variable=self._dot_type_var)
-        dot_type.grid(row=0, column=6, padx=10, pady=10)
+        dot_type.grid(row=0, column=9, padx=10, pady=10)
 
         self._dot_key_var = tk.StringVar(value="{E}")
         self._add_key_entry = ctk.CTkEntry(bar, textvariable=self._dot_key_var, width=120)
-        self._add_key_entry.grid(row=0, column=7, padx=10, pady=10)
+        self._add_key_entry.grid(row=0, column=10, padx=10, pady=10)
 
         self._dot_type_var.trace_add("write", lambda *_: self._sync_add_dot_editor_state())
 
@@ -553,31 +707,31 @@ class App(ctk.CTk):
         table_frame = ctk.CTkFrame(self._tab_dots, corner_radius=12)
         table_frame.grid(row=2, column=0, padx=12, pady=(0, 12), sticky="nsew")
         table_frame.grid_columnconfigure(0, weight=1)
-        table_frame.grid_rowconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(1, weight=1)
 
-        self._tree = ttk.Treeview(
-            table_frame,
-            columns=("name", "x", "y", "type", "delay"),
-            show="headings",
-            selectmode="browse",
+        self._dot_filter = tk.StringVar(value="")
+        ctk.CTkEntry(table_frame, textvariable=self._dot_filter, width=220, placeholder_text="Filter dots").grid(
+            row=0, column=0, padx=10, pady=(10, 0), sticky="w"
         )
-        for col, title, w in [
-            ("name", "Dot", 180),
-            ("x", "X", 120),
-            ("y", "Y", 120),
-            ("type", "Type", 120),
-            ("delay", "Delay(ms)", 120),
-        ]:
-            self._tree.heading(col, text=title)
-            self._tree.column(col, width=w, anchor=("w" if col == "name" else "center"))
-
-        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self._tree.yview)
-        self._tree.configure(yscrollcommand=vsb.set)
+        self._dot_filter.trace_add("write", lambda *_: self._dots_table.set_filter(self._dot_filter.get()))
 
-        self._tree.bind("<<TreeviewSelect>>", lambda _e: self._on_dot_selected())
+        self._dots_table = VirtualDotTable(
+            table_frame,
+            columns=[
+                ("name", "Dot", 180),
+                ("x", "X", 120),
+                ("y", "Y", 120),
+                ("type", "Type", 120),
+                ("delay", "Delay(ms)", 120),
+            ],
+            get_dots=lambda: self._state.dots,
+            row_values=self._dot_row_values,
+            on_select=self._on_dot_selected,
+        )
+        self._tree = self._dots_table.tree
 
-        self._tree.grid(row=0, column=0, sticky="nsew", padx=(10, 0), pady=10)
-        vsb.grid(row=0, column=1, sticky="ns", pady=10, padx=(0, 10))
+        self._tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=10)
+        self._dots_table.scrollbar.grid(row=1, column=1, sticky="ns", pady=10, padx=(0, 10))
 
         self._apply_ttk_theme()
 
@@ -858,13 +1012,26 @@ class App(ctk.CTk):
         ctk.CTkButton(bar, text="Delete", command=self._delete_selected_profile).grid(row=0, column=3, padx=10, pady=10)
         ctk.CTkButton(bar, text="Refresh", command=self._refresh_profiles).grid(row=0, column=4, padx=10, pady=10)
 
-        self._profiles_list = ttk.Treeview(frame, columns=("name", "modified"), show="headings", selectmode="browse")
+        self._profile_search = tk.StringVar(value="")
+        ctk.CTkEntry(bar, textvariable=self._profile_search, width=180, placeholder_text="Search").grid(
+            row=0, column=5, padx=10, pady=10
+        )
+        self._profile_search.trace_add("write", lambda *_: self._refresh_profiles())
+
+        self._profiles_list = ttk.Treeview(
+            frame, columns=("name", "dots", "loops", "modified"), show="headings", selectmode="browse"
+        )
         self._profiles_list.heading("name", text="Profile")
+        self._profiles_list.heading("dots", text="Dots")
+        self._profiles_list.heading("loops", text="Loops / Delay")
         self._profiles_list.heading("modified", text="Modified")
         self._profiles_list.column("name", width=240, anchor="w")
-        self._profiles_list.column("modified", width=240, anchor="w")
+        self._profiles_list.column("dots", width=70, anchor="center")
+        self._profiles_list.column("loops", width=130, anchor="center")
+        self._profiles_list.column("modified", width=180, anchor="w")
         self._profiles_list.grid(row=1, column=0, padx=24, pady=(0, 24), sticky="nsew")
 
+        self._apply_ttk_theme()
         self._refresh_profiles()
 
     def _build_post_tab(self) -> None:
@@ -889,15 +1056,111 @@ class App(ctk.CTk):
         self._auto_resume = tk.BooleanVar(value=bool(s.auto_resume_on_focus))
         self._debug_mode = tk.BooleanVar(value=bool(s.debug_mode))
         self._enable_logs = tk.BooleanVar(value=bool(s.enable_logs))
+        self._trace_runs = tk.BooleanVar(value=bool(s.trace_runs))
+        self._profiling = tk.BooleanVar(value=self._profiler is not None and self._profiler.running)
         self._autosave = tk.BooleanVar(value=bool(s.autosave_config))
+        self._profile_store = tk.StringVar(value=str(s.profile_store))
 
         ctk.CTkCheckBox(frame, text="Pause on Window Change", variable=self._pause_on_focus).pack(anchor="w", padx=14, pady=(18, 8))
         ctk.CTkCheckBox(frame, text="Auto Resume on Roblox Focus", variable=self._auto_resume).pack(anchor="w", padx=14, pady=8)
         ctk.CTkCheckBox(frame, text="Enable Debug Mode", variable=self._debug_mode).pack(anchor="w", padx=14, pady=8)
         ctk.CTkCheckBox(frame, text="Enable Logs", variable=self._enable_logs).pack(anchor="w", padx=14, pady=8)
+        ctk.CTkCheckBox(frame, text="Trace Runs (writes logs/trace-*.json)", variable=self._trace_runs).pack(
+            anchor="w", padx=14, pady=8
+        )
+        ctk.CTkCheckBox(
+            frame, text="Profile App (writes logs/profile-*.txt)", variable=self._profiling, command=self._toggle_profiler
+        ).pack(anchor="w", padx=14, pady=8)
         ctk.CTkCheckBox(frame, text="Auto-save Configuration", variable=self._autosave).pack(anchor="w", padx=14, pady=8)
 
+        ctk.CTkLabel(frame, text="Profile Storage").pack(anchor="w", padx=14, pady=(14, 4))
+        ctk.CTkOptionMenu(frame, values=list(PROFILE_STORES), variable=self._profile_store, width=220).pack(
+            anchor="w", padx=14, pady=4
+        )
+
         ctk.CTkButton(frame, text="Apply Advanced", command=self._apply_advanced).pack(anchor="w", padx=14, pady=18)
+        ctk.CTkButton(frame, text="View Log", command=self._open_log_viewer).pack(anchor="w", padx=14, pady=(0, 18))
+
+    def _toggle_profiler(self) -> None:
+        if bool(self._profiling.get()):
+            if self._profiler is None:
+                self._profiler = SamplingProfiler()
+            self._profiler.start()
+            self._set_message("Profiler started")
+            return
+        profiler = self._profiler
+        if profiler is None or not profiler.running:
+            return
+        self._profiler = None
+
+        def worker() -> None:
+            # Comparing tracemalloc snapshots can take a moment; keep it off the UI thread.
+            try:
+                path = profiler.stop()
+            except Exception:
+                self._logger.exception("Failed to write profile report")
+                return
+            if path is not None:
+                self._logger.info("Wrote profile report to %s", path)
+                self._post_ui(lambda: self._set_message(f"Profile written to logs/{path.name}"))
+
+        threading.Thread(target=worker, name="profile-report", daemon=True).start()
+
+    def _open_log_viewer(self) -> None:
+        if self._log_viewer is not None:
+            try:
+                self._log_viewer.lift()
+            except Exception:
+                pass
+            return
+
+        win = tk.Toplevel(self)
+        win.title("macro.log")
+        win.geometry("900x480")
+        self._log_viewer = win
+
+        text = tk.Text(win, wrap="none", font=("Consolas", 9), state="disabled")
+        scroll = ttk.Scrollbar(win, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        text.pack(fill="both", expand=True)
+        self._log_viewer_text = text
+        self._log_viewer_stamp = None
+
+        def on_close() -> None:
+            self._cancel_job("_log_viewer_job")
+            self._log_viewer = None
+            try:
+                win.destroy()
+            except Exception:
+                pass
+
+        win.protocol("WM_DELETE_WINDOW", on_close)
+        self._refresh_log_viewer()
+
+    def _refresh_log_viewer(self) -> None:
+        """Re-tail the log when it changed; only the end of the file is read."""
+        self._log_viewer_job = None
+        if self._closing or self._log_viewer is None:
+            return
+        path = log_file_path()
+        try:
+            st = path.stat()
+            stamp = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stamp = None
+        if stamp != self._log_viewer_stamp:
+            self._log_viewer_stamp = stamp
+            lines = tail_lines(path, LOG_VIEWER_LINES) if stamp is not None else ["(no log file)"]
+            text = self._log_viewer_text
+            at_end = text.yview()[1] >= 0.999
+            text.configure(state="normal")
+            text.delete("1.0", "end")
+            text.insert("end", "\n".join(lines))
+            text.configure(state="disabled")
+            if at_end:
+                text.see("end")
+        self._log_viewer_job = self.after(1000, self._refresh_log_viewer)
 
     def _build_visual_tab(self) -> None:
         frame = ctk.CTkFrame(self._tab_visual, corner_radius=12)
@@ -949,16 +1212,61 @@ class App(ctk.CTk):
         ctk.CTkLabel(frame, textvariable=self._roblox_status).pack(anchor="w", padx=14, pady=14)
 
     def _schedule_autosave(self) -> None:
+        """Persist whatever changed since the last call.
+
+        The state's dirty flags say what that was: individual dot, removal,
+        clear and settings edits are appended to the change journal right
+        away and folded into config.json by a periodic snapshot; bulk edits
+        (every dot touched) schedule the snapshot soon instead.
+        """
+        changes = self._state.take_changes()
+        if not changes:
+            return
         if not self._state.settings.autosave_config:
             return
-        if self._closing:
+        if self._closing or self._loading:
             return
-        self._cancel_job("_autosave_job")
-        self._autosave_job = self.after(350, self._save_config)
+
+        described = not changes.all_dots
+        if described:
+            dots = [d for d in self._state.dots if d.id in changes.dots] if changes.dots else []
+            try:
+                self._journal.record(
+                    dots=dots,
+                    removed=sorted(changes.removed),
+                    settings=self._state.settings if changes.settings else None,
+                    cleared=changes.order,
+                )
+            except Exception:
+                try:
+                    self._logger.exception("Failed to append to change journal")
+                except Exception:
+                    pass
+                described = False
+
+        if not described or self._journal.needs_compaction():
+            self._cancel_job("_autosave_job")
+            self._autosave_job = self.after(350, self._save_config)
+        elif self._autosave_job is None:
+            self._autosave_job = self.after(JOURNAL_COMPACT_MS, self._save_config)
 
     def _save_config(self) -> None:
+        if self._loading:
+            # Never overwrite config.json with the placeholder state.
+            self._autosave_job = None
+            return
         try:
-            storage.save_config(self._state)
+            t0 = time.perf_counter()
+            # The snapshot covers everything still marked dirty.
+            self._state.take_changes()
+            storage.save_config(self._state, writer=self._writer)
+            metrics.record("storage.snapshot", (time.perf_counter() - t0) * 1000.0)
+            if self._state.settings.debug_mode:
+                self._logger.debug(
+                    f"Config snapshot after {self._journal.records} journal records "
+                    f"({self._journal.bytes} bytes); " + metrics.format_stats("storage.snapshot")
+                )
+            self._journal.reset(self._state)
         finally:
             self._autosave_job = None
 
@@ -1025,7 +1333,7 @@ class App(ctk.CTk):
             return
         if getattr(self, "_startup_gate_needed", False):
             return
-        if getattr(self, "_hotkeys_active", False):
+        if getattr(self, "_hotkeys_active", False) or self._hotkeys is None:
             return
 
         try:
@@ -1057,21 +1365,36 @@ class App(ctk.CTk):
             except Exception:
                 pass
 
+    def _on_storage_error(self, path, exc: BaseException) -> None:
+        # Runs on the storage writer thread.
+        try:
+            self._logger.error(f"Failed to write {path}: {exc}")
+        except Exception:
+            pass
+        name = getattr(path, "name", path)
+        self._post_ui(lambda: self._set_message(f"Failed to save {name}"))
+
     def _post_ui(self, fn: Callable[[], None]) -> None:
         if self._closing:
             return
-        self._ui_queue.put(fn)
+        self._ui.post(fn)
 
     def _on_hotkey_start_stop(self) -> None:
+        # Runs on the listener thread: stop the runner directly so a busy UI
+        # thread cannot delay it; UI cleanup arrives through on_stopped.
+        t0 = self._hotkeys.last_event_t or None
         if getattr(self, "_startup_gate_needed", False):
             self._post_ui(lambda: self._set_message("Please enter an access key to continue", timeout_ms=1800))
             return
         try:
+            if self._runner.status().state in ("RUNNING", "PAUSED"):
+                self._runner.request_stop(t0)
+            else:
+                self._runner.start(preview=False)
             try:
                 self._logger.info("Hotkey: start/stop")
             except Exception:
                 pass
-            self._runner.toggle_start_stop()
         except Exception:
             try:
                 self._logger.exception("Hotkey start/stop handler failed")
@@ -1097,6 +1420,12 @@ class App(ctk.CTk):
         self._post_ui(lambda: self._set_message("Hotkey: Pause/Resume", timeout_ms=1200))
 
     def _on_hotkey_emergency_stop(self) -> None:
+        try:
+            # Halt clicking from the listener thread first; closing the app
+            # still happens on the UI thread.
+            self._runner.request_stop(self._hotkeys.last_event_t or None)
+        except Exception:
+            pass
         try:
             try:
                 self._logger.warning("Hotkey: emergency stop")
@@ -1109,31 +1438,11 @@ class App(ctk.CTk):
             except Exception:
                 pass
 
-    def _drain_ui_queue(self) -> None:
-        if self._closing:
-            return
+    def _on_ui_task_error(self) -> None:
         try:
-            while True:
-                try:
-                    fn = self._ui_queue.get_nowait()
-                except queue.Empty:
-                    break
-                try:
-                    fn()
-                except Exception:
-                    try:
-                        self._logger.exception("UI task failed")
-                    except Exception:
-                        pass
-        finally:
-            if self._closing:
-                return
-            try:
-                if not self.winfo_exists():
-                    return
-            except Exception:
-                return
-            self._ui_drain_job = self.after(25, self._drain_ui_queue)
+            self._logger.exception("UI task failed")
+        except Exception:
+            pass
 
     def _rebuild_runner(self) -> None:
         try:
@@ -1151,71 +1460,79 @@ class App(ctk.CTk):
             on_started=lambda preview: self._post_ui(lambda preview=preview: self._on_runner_started(preview)),
             on_stopped=lambda: self._post_ui(self._on_runner_stopped),
         )
+        self._apply_tracing()
+
+    def _apply_tracing(self) -> None:
+        if self._state.settings.trace_runs:
+            if self._tracer is None:
+                self._tracer = Tracer()
+            self._runner.tracer = self._tracer
+        else:
+            self._runner.tracer = None
+            self._tracer = None
 
     def _sync_ui_from_state(self) -> None:
+        for name, sync in self._tab_syncers.items():
+            if name in self._built_tabs:
+                sync()
+
+    def _sync_hotkeys_tab(self) -> None:
         s = self._state.settings
+        self._hk_start_stop.set(s.start_stop_hotkey)
+        self._hk_pause_resume.set(s.pause_resume_hotkey)
+        self._sync_hotkey_picker_from_state()
 
-        if hasattr(self, "_hk_start_stop"):
-            self._hk_start_stop.set(s.start_stop_hotkey)
-        if hasattr(self, "_hk_pause_resume"):
-            self._hk_pause_resume.set(s.pause_resume_hotkey)
+    def _sync_perf_tab(self) -> None:
+        s = self._state.settings
+        self._loop_delay.set(int(s.loop_delay_ms))
+        self._click_delay.set(int(s.click_delay_ms))
+        self._loop_count.set(int(s.loop_count))
+        self._max_loops.set(int(s.max_loops))
+        self._mouse_speed.set(int(s.mouse_speed))
+        self._click_speed.set(int(s.click_speed_ms))
+        self._randomize.set(bool(s.randomize_order))
+        self._random_delay.set(int(s.random_delay_pct))
+        self._min_on_start.set(bool(s.minimize_on_start))
+        self._restore_on_stop.set(bool(s.restore_on_stop))
+
+    def _sync_post_tab(self) -> None:
+        self._post_action.set(str(getattr(self._state.settings, "post_action", "none")))
+
+    def _sync_advanced_tab(self) -> None:
+        s = self._state.settings
+        self._pause_on_focus.set(bool(s.pause_on_window_change))
+        self._auto_resume.set(bool(s.auto_resume_on_focus))
+        self._debug_mode.set(bool(s.debug_mode))
+        self._enable_logs.set(bool(s.enable_logs))
+        self._trace_runs.set(bool(s.trace_runs))
+        self._autosave.set(bool(s.autosave_config))
+        self._profile_store.set(str(s.profile_store))
+
+    def _sync_visual_tab(self) -> None:
+        s = self._state.settings
+        self._opacity.set(float(s.overlay_opacity))
+        self._show_numbers.set(bool(s.show_dot_numbers))
+        self._show_coords.set(bool(s.show_coordinates))
+        self._lock_dots.set(bool(s.lock_dots))
+        self._theme.set(str(s.theme))
 
-        self._sync_hotkey_picker_from_state()
+    def _sync_roblox_tab(self) -> None:
+        s = self._state.settings
+        self._roblox_mode.set(bool(s.enable_roblox_mode))
+        self._backend_var.set(str(s.click_backend))
 
-        if hasattr(self, "_loop_delay"):
-            self._loop_delay.set(int(s.loop_delay_ms))
-        if hasattr(self, "_click_delay"):
-            self._click_delay.set(int(s.click_delay_ms))
-        if hasattr(self, "_loop_count"):
-            self._loop_count.set(int(s.loop_count))
-        if hasattr(self, "_max_loops"):
-            self._max_loops.set(int(s.max_loops))
-        if hasattr(self, "_mouse_speed"):
-            self._mouse_speed.set(int(s.mouse_speed))
-        if hasattr(self, "_click_speed"):
-            self._click_speed.set(int(s.click_speed_ms))
-        if hasattr(self, "_randomize"):
-            self._randomize.set(bool(s.randomize_order))
-        if hasattr(self, "_random_delay"):
-            self._random_delay.set(int(s.random_delay_pct))
-        if hasattr(self, "_min_on_start"):
-            self._min_on_start.set(bool(s.minimize_on_start))
-        if hasattr(self, "_restore_on_stop"):
-            self._restore_on_stop.set(bool(s.restore_on_stop))
-
-        if hasattr(self, "_pause_on_focus"):
-            self._pause_on_focus.set(bool(s.pause_on_window_change))
-        if hasattr(self, "_auto_resume"):
-            self._auto_resume.set(bool(s.auto_resume_on_focus))
-        if hasattr(self, "_debug_mode"):
-            self._debug_mode.set(bool(s.debug_mode))
-        if hasattr(self, "_enable_logs"):
-            self._enable_logs.set(bool(s.enable_logs))
-        if hasattr(self, "_autosave"):
-            self._autosave.set(bool(s.autosave_config))
-
-        if hasattr(self, "_post_action"):
-            self._post_action.set(str(getattr(s, "post_action", "none")))
-
-        if hasattr(self, "_opacity"):
-            self._opacity.set(float(s.overlay_opacity))
-        if hasattr(self, "_show_numbers"):
-            self._show_numbers.set(bool(s.show_dot_numbers))
-        if hasattr(self, "_show_coords"):
-            self._show_coords.set(bool(s.show_coordinates))
-        if hasattr(self, "_lock_dots"):
-            self._lock_dots.set(bool(s.lock_dots))
-        if hasattr(self, "_theme"):
-            self._theme.set(str(s.theme))
-
-        if hasattr(self, "_roblox_mode"):
-            self._roblox_mode.set(bool(s.enable_roblox_mode))
-        if hasattr(self, "_backend_var"):
-            self._backend_var.set(str(s.click_backend))
+    def _on_dot_dragging(self, dot: Dot) -> None:
+        self._spatial.move(dot.id, dot.x, dot.y)
+        self._refresh_dots_table(changed=(dot.id,))
 
     def _on_dot_moved(self, dot: Dot) -> None:
-        self._refresh_dots_table()
+        self._state.touch_dot(dot)
+        self._spatial.move(dot.id, dot.x, dot.y)
+        self._record_history("Move Dot")
+        self._refresh_dots_table(changed=(dot.id,))
         self._schedule_autosave()
+        if self._state.settings.debug_mode:
+            self._logger.debug(metrics.format_stats("overlay.drag_latency"))
 
     def _toggle_dots(self) -> None:
         self._dots_visible_user = not self._dots_visible_user
@@ -1231,42 +1548,29 @@ class App(ctk.CTk):
         cx = w // 2
         cy = h // 2
 
-        for d in self._state.dots:
-            d.x = cx
-            d.y = cy
+        self._state.set_all_positions(cx, cy)
+        self._record_history("Reset Positions")
 
-        self._overlay.rebuild(self._state.dots)
+        self._rebuild_overlays()
         self._refresh_dots_table()
         self._schedule_autosave()
 
-    def _refresh_dots_table(self) -> None:
-        selected = self._selected_dot_id()
-        existing = set(self._tree.get_children(""))
-        for item in existing:
-            self._tree.delete(item)
-
-        for idx, d in enumerate(self._state.dots):
-            tags = ("even" if (idx % 2 == 0) else "odd",)
-            self._tree.insert(
-                "",
-                "end",
-                iid=d.id,
-                tags=tags,
-                values=(
-                    d.name,
-                    d.x,
-                    d.y,
-                    d.click_type,
-                    "" if d.delay_override_ms is None else d.delay_override_ms,
-                ),
-            )
-
-        if selected and selected in {d.id for d in self._state.dots}:
-            try:
-                self._tree.selection_set(selected)
-                self._tree.see(selected)
-            except Exception:
-                pass
+    def _refresh_dots_table(self, changed: Iterable[str] | None = None) -> None:
+        if changed is None:
+            # A full refresh is only needed when the state moved on since the last one.
+            if self._dots_table_version == self._state.version:
+                return
+            self._dots_table_version = self._state.version
+        self._dots_table.refresh(None if changed is None else list(changed))
+
+    def _dot_row_values(self, d: Dot) -> tuple:
+        return (
+            d.name,
+            d.x,
+            d.y,
+            d.click_type,
+            "" if d.delay_override_ms is None else d.delay_override_ms,
+        )
 
     def _add_dot(self) -> None:
         idx = len(self._state.dots) + 1
@@ -1285,14 +1589,12 @@ class App(ctk.CTk):
         dot.x = w // 2
         dot.y = h // 2
 
-        self._state.dots.append(dot)
+        dot = self._state.add_dot(dot)  # the stored view when dots live in a DotTable
+        self._spatial.move(dot.id, dot.x, dot.y)
+        self._record_history("Add Dot")
         self._overlay.add_dot(dot, index=len(self._state.dots) - 1)
         self._refresh_dots_table()
-        try:
-            self._tree.selection_set(dot.id)
-            self._tree.see(dot.id)
-        except Exception:
-            pass
+        self._dots_table.select(dot.id)
         self._schedule_autosave()
 
     def _start_record_dot_mode(self) -> None:
@@ -1367,28 +1669,27 @@ class App(ctk.CTk):
         dot.x = x
         dot.y = y
 
-        self._state.dots.append(dot)
+        over_id = self._spatial.hit(x, y)
+        over = self._get_dot_by_id(over_id) if over_id is not None else None
+        overlapped = (over.name or "another dot") if over is not None else None
+
+        dot = self._state.add_dot(dot)  # the stored view when dots live in a DotTable
+        self._spatial.move(dot.id, dot.x, dot.y)
+        self._record_history("Add Dot")
         self._overlay.add_dot(dot, index=len(self._state.dots) - 1)
         self._refresh_dots_table()
-        try:
-            self._tree.selection_set(dot.id)
-            self._tree.see(dot.id)
-        except Exception:
-            pass
-        self._set_message(f"Recorded dot at {x}, {y}")
+        self._dots_table.select(dot.id)
+        if overlapped is not None:
+            self._set_message(f"Recorded dot at {x}, {y} (on top of {overlapped})")
+        else:
+            self._set_message(f"Recorded dot at {x}, {y}")
         self._schedule_autosave()
 
     def _selected_dot_id(self) -> str | None:
-        sel = self._tree.selection()
-        if not sel:
-            return None
-        return str(sel[0])
+        return self._dots_table.selected_id()
 
     def _get_dot_by_id(self, dot_id: str) -> Dot | None:
-        for d in self._state.dots:
-            if d.id == dot_id:
-                return d
-        return None
+        return self._state.find_dot(dot_id)
 
     def _on_dot_selected(self) -> None:
         dot_id = self._selected_dot_id()
@@ -1412,29 +1713,28 @@ class App(ctk.CTk):
             self._set_message("Select a dot first")
             return
 
-        d.name = self._sel_dot_name.get().strip() or d.name
-        d.click_type = self._sel_dot_type.get().strip() or d.click_type
+        name = self._sel_dot_name.get().strip() or d.name
+        click_type = self._sel_dot_type.get().strip() or d.click_type
 
-        if d.click_type == "key":
-            k = self._sel_dot_key.get().strip()
-            if not k:
+        key = None
+        if click_type == "key":
+            key = self._sel_dot_key.get().strip()
+            if not key:
                 self._set_message("Key is required for type=key")
                 return
-            d.key = k
-        else:
-            d.key = None
 
         delay_txt = self._sel_dot_delay.get().strip()
-        if delay_txt == "":
-            d.delay_override_ms = None
-        else:
+        delay = None
+        if delay_txt != "":
             try:
-                d.delay_override_ms = max(0, int(delay_txt))
+                delay = max(0, int(delay_txt))
             except Exception:
                 self._set_message("Invalid delay (ms)")
                 return
 
-        self._refresh_dots_table()
+        self._state.update_dot(d.id, name=name, click_type=click_type, key=key, delay_override_ms=delay)
+        self._record_history("Edit Dot")
+        self._refresh_dots_table(changed=(d.id,))
         self._schedule_autosave()
 
     def _copy_selected_dot(self) -> None:
@@ -1453,7 +1753,9 @@ class App(ctk.CTk):
             key=d.key,
             delay_override_ms=d.delay_override_ms,
         )
-        self._state.dots.append(copy)
+        copy = self._state.add_dot(copy)
+        self._spatial.move(copy.id, copy.x, copy.y)
+        self._record_history("Copy Dot")
         self._overlay.add_dot(copy, index=len(self._state.dots) - 1)
         self._overlay.reindex(self._state.dots)
         self._refresh_dots_table()
@@ -1470,8 +1772,8 @@ class App(ctk.CTk):
         except Exception:
             self._set_message("Invalid delay (seconds)")
             return
-        for d in self._state.dots:
-            d.delay_override_ms = v
+        self._state.set_all_delays(v)
+        self._record_history("Set Delay")
         self._refresh_dots_table()
         self._schedule_autosave()
 
@@ -1479,14 +1781,84 @@ class App(ctk.CTk):
         dot_id = self._selected_dot_id()
         if not dot_id:
             return
-        self._state.dots = [d for d in self._state.dots if d.id != dot_id]
+        self._state.remove_dots((dot_id,))
+        self._spatial.remove(dot_id)
+        self._record_history("Remove Dot")
         self._overlay.remove_dot(dot_id)
         self._overlay.reindex(self._state.dots)
         self._refresh_dots_table()
         self._schedule_autosave()
 
+    def _merge_near_duplicates(self) -> None:
+        """Drop dots sitting on top of an earlier dot (within one dot radius)."""
+        if self._runner.status().state != "STOPPED":
+            return
+        drop = duplicate_ids(self._state.dots, HIT_RADIUS, index=self._spatial)
+        if not drop:
+            self._set_message("No overlapping dots")
+            return
+        if not messagebox.askyesno(
+            "Merge Duplicates",
+            f"Remove {len(drop)} dot(s) that sit on top of another dot? (Undo brings them back.)",
+            parent=self,
+        ):
+            return
+        self._state.remove_dots(drop)
+        self._record_history("Merge Duplicates")
+        for dot_id in drop:
+            self._spatial.remove(dot_id)
+            self._overlay.remove_dot(dot_id)
+        self._overlay.reindex(self._state.dots)
+        self._refresh_dots_table()
+        self._set_message(f"Merged {len(drop)} overlapping dot(s)")
+        self._schedule_autosave()
+
+    def _record_history(self, label: str) -> None:
+        try:
+            self._history.commit(self._state.dots, label)
+        except Exception:
+            try:
+                self._logger.exception("Failed to record undo step")
+            except Exception:
+                pass
+
+    def _on_undo_key(self, event: tk.Event, redo: bool) -> str | None:
+        # Text fields keep their own Ctrl+Z.
+        if isinstance(getattr(event, "widget", None), (tk.Entry, ttk.Entry, tk.Text)):
+            return None
+        if redo:
+            self._redo()
+        else:
+            self._undo()
+        return "break"
+
+    def _undo(self) -> None:
+        self._step_history(redo=False)
+
+    def _redo(self) -> None:
+        self._step_history(redo=True)
+
+    def _step_history(self, redo: bool) -> None:
+        verb = "Redo" if redo else "Undo"
+        if self._runner.status().state != "STOPPED":
+            self._set_message(f"Stop the macro before using {verb}")
+            return
+        label = self._history.redo_label() if redo else self._history.undo_label()
+        snap = self._history.redo() if redo else self._history.undo()
+        if snap is None:
+            self._set_message(f"Nothing to {verb.lower()}")
+            return
+        self._state.replace_dots(snap.to_dots())
+        self._rebuild_overlays()
+        self._refresh_dots_table()
+        self._set_message(f"{verb}: {label}" if label else verb)
+        self._schedule_autosave()
+
     def _clear_dots(self) -> None:
-        self._state.dots.clear()
+        self._state.clear_dots()
+        self._spatial.clear()
+        self._record_history("Clear All")
+        self._cancel_job("_overlay_job")
         self._overlay.clear()
         self._refresh_dots_table()
         self._schedule_autosave()
@@ -1507,6 +1879,8 @@ class App(ctk.CTk):
             return
 
         cfg = HotkeyConfig(start_stop=new_start, pause_resume=new_pause)
+        if self._hotkeys is None:
+            return
 
         try:
             self._hotkeys.update(cfg)
@@ -1514,43 +1888,51 @@ class App(ctk.CTk):
             self._set_message(f"Invalid hotkey: {e}")
             return
 
-        self._state.settings.start_stop_hotkey = new_start
-        self._state.settings.pause_resume_hotkey = new_pause
+        self._state.update_settings(start_stop_hotkey=new_start, pause_resume_hotkey=new_pause)
 
         self._set_message("Hotkeys applied")
         self._schedule_autosave()
 
     def _apply_performance(self) -> None:
         s = self._state.settings
-        s.loop_delay_ms = self._safe_int(self._loop_delay, s.loop_delay_ms)
-        s.click_delay_ms = self._safe_int(self._click_delay, s.click_delay_ms)
-        s.loop_count = self._safe_int(self._loop_count, s.loop_count)
-        s.max_loops = self._safe_int(self._max_loops, s.max_loops)
-        s.mouse_speed = self._safe_int(self._mouse_speed, s.mouse_speed)
-        s.click_speed_ms = self._safe_int(self._click_speed, s.click_speed_ms)
-        s.randomize_order = bool(self._randomize.get())
-        s.random_delay_pct = self._safe_int(self._random_delay, s.random_delay_pct)
-        s.minimize_on_start = bool(self._min_on_start.get())
-        s.restore_on_stop = bool(self._restore_on_stop.get())
+        self._state.update_settings(
+            loop_delay_ms=self._safe_int(self._loop_delay, s.loop_delay_ms),
+            click_delay_ms=self._safe_int(self._click_delay, s.click_delay_ms),
+            loop_count=self._safe_int(self._loop_count, s.loop_count),
+            max_loops=self._safe_int(self._max_loops, s.max_loops),
+            mouse_speed=self._safe_int(self._mouse_speed, s.mouse_speed),
+            click_speed_ms=self._safe_int(self._click_speed, s.click_speed_ms),
+            randomize_order=bool(self._randomize.get()),
+            random_delay_pct=self._safe_int(self._random_delay, s.random_delay_pct),
+            minimize_on_start=bool(self._min_on_start.get()),
+            restore_on_stop=bool(self._restore_on_stop.get()),
+        )
         self._set_message("Performance applied")
         self._schedule_autosave()
 
     def _apply_advanced(self) -> None:
         s = self._state.settings
-        s.pause_on_window_change = bool(self._pause_on_focus.get())
-        s.auto_resume_on_focus = bool(self._auto_resume.get())
-        s.debug_mode = bool(self._debug_mode.get())
-        s.enable_logs = bool(self._enable_logs.get())
-        s.autosave_config = bool(self._autosave.get())
+        self._state.update_settings(
+            pause_on_window_change=bool(self._pause_on_focus.get()),
+            auto_resume_on_focus=bool(self._auto_resume.get()),
+            debug_mode=bool(self._debug_mode.get()),
+            enable_logs=bool(self._enable_logs.get()),
+            trace_runs=bool(self._trace_runs.get()),
+            autosave_config=bool(self._autosave.get()),
+        )
         try:
             self._logger = configure_logging(s)
         except Exception:
             pass
+        self._apply_tracing()
+        store = str(self._profile_store.get())
+        if store in PROFILE_STORES and store != s.profile_store:
+            self._state.update_settings(profile_store=store)
+            self._open_profile_store(store, migrate=True)
         self._schedule_autosave()
 
     def _apply_post_action(self) -> None:
-        s = self._state.settings
-        s.post_action = str(self._post_action.get() or "none")
+        self._state.update_settings(post_action=str(self._post_action.get() or "none"))
         self._set_message("Post action applied")
         self._schedule_autosave()
 
@@ -1578,16 +1960,18 @@ class App(ctk.CTk):
 
     def _apply_visual_live(self) -> None:
         s = self._state.settings
-        s.overlay_opacity = float(self._opacity.get())
-        s.show_dot_numbers = bool(self._show_numbers.get())
-        s.show_coordinates = bool(self._show_coords.get())
-        s.lock_dots = bool(self._lock_dots.get())
+        self._state.update_settings(
+            overlay_opacity=float(self._opacity.get()),
+            show_dot_numbers=bool(self._show_numbers.get()),
+            show_coordinates=bool(self._show_coords.get()),
+            lock_dots=bool(self._lock_dots.get()),
+        )
         self._overlay.set_settings(s)
         self._schedule_autosave()
 
     def _apply_visual(self) -> None:
         self._apply_visual_live()
-        self._state.settings.theme = self._theme.get()
+        self._state.update_settings(theme=self._theme.get())
         ctk.set_appearance_mode(self._state.settings.theme)
         self._apply_ttk_theme()
         self._schedule_autosave()
@@ -1597,9 +1981,10 @@ class App(ctk.CTk):
             self._runner.stop()
         except Exception:
             pass
-        s = self._state.settings
-        s.enable_roblox_mode = bool(self._roblox_mode.get())
-        s.click_backend = str(self._backend_var.get())
+        self._state.update_settings(
+            enable_roblox_mode=bool(self._roblox_mode.get()),
+            click_backend=str(self._backend_var.get()),
+        )
         self._rebuild_runner()
         self._schedule_autosave()
 
@@ -1626,20 +2011,83 @@ class App(ctk.CTk):
         except Exception as e:
             self._roblox_status.set(f"Install failed: {e}")
 
+    def _open_profile_store(self, kind: str, migrate: bool = False) -> None:
+        """Switch the profile backend; with ``migrate`` the other backend's profiles are carried over."""
+        if kind == self._profiles.kind:
+            return
+        old = self._profiles
+        try:
+            new = open_profile_store(kind, writer=self._writer)
+        except Exception:
+            try:
+                self._logger.exception("Failed to open profile store")
+            except Exception:
+                pass
+            self._set_message(f"Failed to open {kind} profile store")
+            return
+        self._profiles = new
+
+        def move_profiles() -> None:
+            # Queued behind any pending profile saves; later profile tasks queue behind this.
+            try:
+                if kind == "sqlite" and (migrate or len(new) == 0):
+                    n = new.import_json()
+                    self._logger.info(f"Imported {n} JSON profiles into the SQLite store")
+                elif kind == "json" and migrate and old.kind == "sqlite":
+                    n = old.export_json()
+                    self._logger.info(f"Exported {n} SQLite profiles to JSON")
+            finally:
+                old.close()
+
+        self._profile_task("migrate", move_profiles, lambda _r: self._refresh_profiles_if_built(), "Failed to migrate profiles")
+
+    def _profile_task(
+        self, key: str, work: Callable[[], object], done: Callable[[object], None], error_message: str
+    ) -> None:
+        """Run ``work`` on the storage writer, after every save queued so far, and pass its result to ``done`` on the Tk thread."""
+
+        def task() -> None:
+            try:
+                result = work()
+            except Exception:
+                try:
+                    self._logger.exception(error_message)
+                except Exception:
+                    pass
+                self._post_ui(lambda: self._set_message(error_message))
+                return
+            self._post_ui(lambda: done(result))
+
+        try:
+            self._writer.call(("profiles", key), task)
+        except RuntimeError:
+            pass  # writer closed: the app is shutting down
+
+    def _refresh_profiles_if_built(self) -> None:
+        if "Profiles" in self._built_tabs:
+            self._refresh_profiles()
+
     def _refresh_profiles(self) -> None:
+        search = self._profile_search.get() if hasattr(self, "_profile_search") else ""
+        store = self._profiles
+        self._profile_task("list", lambda: store.list(search), self._show_profiles, "Failed to list profiles")
+
+    def _show_profiles(self, profiles) -> None:
         for item in self._profiles_list.get_children(""):
             self._profiles_list.delete(item)
-
-        for name, mtime in storage.list_profiles():
-            ts = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-            self._profiles_list.insert("", "end", iid=name, values=(name, ts))
+        for p in profiles:
+            ts = datetime.fromtimestamp(p.mtime).strftime("%Y-%m-%d %H:%M:%S")
+            loops = "inf" if p.loop_count <= 0 else str(p.loop_count)
+            self._profiles_list.insert(
+                "", "end", iid=p.name, values=(p.name, p.dot_count, f"{loops} / {p.loop_delay_ms} ms", ts)
+            )
 
     def _save_profile(self) -> None:
         name = self._profile_name.get().strip()
         if not name:
             return
         try:
-            storage.save_profile(name, self._state)
+            self._profiles.save(name, self._state)
         except Exception:
             try:
                 self._logger.exception("Failed to save profile")
@@ -1659,31 +2107,28 @@ class App(ctk.CTk):
         name = self._selected_profile()
         if not name:
             return
-        try:
-            st = storage.load_profile(name)
-        except Exception:
-            try:
-                self._logger.exception("Failed to load profile")
-            except Exception:
-                pass
-            self._set_message("Failed to load profile (file may be corrupted)")
-            return
-        self._apply_loaded_state(st)
+        store = self._profiles
+
+        def load() -> AppState:
+            t0 = time.perf_counter()
+            st = store.load(name)
+            metrics.record("profile.load", (time.perf_counter() - t0) * 1000.0)
+            return st
+
+        def done(st) -> None:
+            if self._state.settings.debug_mode:
+                self._logger.debug(f"{store.cache.stats()}; " + metrics.format_stats("profile.load"))
+            self._apply_loaded_state(st)
+
+        self._profile_task("load", load, done, "Failed to load profile (file may be corrupted)")
 
     def _delete_selected_profile(self) -> None:
         name = self._selected_profile()
         if not name:
             return
-        try:
-            storage.delete_profile(name)
-        except Exception:
-            try:
-                self._logger.exception("Failed to delete profile")
-            except Exception:
-                pass
-            self._set_message("Failed to delete profile")
-            return
-        self._refresh_profiles()
+        store = self._profiles
+        # Queued after any pending save, so that save cannot recreate the file.
+        self._profile_task("delete", lambda: store.delete(name), lambda _r: self._refresh_profiles(), "Failed to delete profile")
 
     def _apply_loaded_state(self, st: AppState) -> None:
         prev = self._state.settings
@@ -1692,61 +2137,69 @@ class App(ctk.CTk):
         prev_tos = int(getattr(prev, "tos_accepted_version", 0) or 0)
         prev_discord = bool(getattr(prev, "discord_prompt_shown", False))
         prev_key = bool(getattr(prev, "access_key_accepted", False))
+        prev_store = str(getattr(prev, "profile_store", "json"))
 
         try:
             self._runner.stop()
         except Exception:
             pass
-        self._overlay.clear()
+        st.pack_dots()
         self._state = st
 
         try:
-            self._state.settings.tos_accepted_version = prev_tos
-            self._state.settings.discord_prompt_shown = prev_discord
-            self._state.settings.access_key_accepted = prev_key
+            self._state.update_settings(
+                tos_accepted_version=prev_tos,
+                discord_prompt_shown=prev_discord,
+                access_key_accepted=prev_key,
+                profile_store=prev_store,
+            )
         except Exception:
             pass
+        self._state.touch_all()
+        # Loaded settings may carry a different undo budget.
+        self._history.max_bytes = int(self._state.settings.undo_memory_mb) * 1024 * 1024
+        self._record_history("Load Profile")
 
         ctk.set_appearance_mode(self._state.settings.theme)
         self._overlay.set_settings(self._state.settings)
-        for idx, d in enumerate(self._state.dots):
-            self._overlay.add_dot(d, idx)
+        self._rebuild_overlays()
         self._refresh_dots_table()
 
         self._sync_ui_from_state()
 
-        new_start = str(self._state.settings.start_stop_hotkey)
-        new_pause = str(self._state.settings.pause_resume_hotkey)
-        try:
-            norm_start = hotkeys_mod._normalize_hotkey(new_start)
-            norm_pause = hotkeys_mod._normalize_hotkey(new_pause)
-            if norm_start == norm_pause:
-                raise ValueError("Start/Stop and Pause/Resume hotkeys must be different")
-            self._hotkeys.update(HotkeyConfig(start_stop=new_start, pause_resume=new_pause))
-            self._hotkeys_failed = False
-            self._hotkeys_active = True
-        except Exception:
-            try:
-                self._logger.exception("Failed to apply hotkeys from profile")
-            except Exception:
-                pass
-
-            try:
-                self._state.settings.start_stop_hotkey = prev_start
-                self._state.settings.pause_resume_hotkey = prev_pause
-            except Exception:
-                pass
-
+        # Before the config has loaded there is no manager yet; it is built from these settings.
+        if self._hotkeys is not None:
+            new_start = str(self._state.settings.start_stop_hotkey)
+            new_pause = str(self._state.settings.pause_resume_hotkey)
             try:
-                self._hotkeys.update(HotkeyConfig(start_stop=prev_start, pause_resume=prev_pause))
+                norm_start = hotkeys_mod._normalize_hotkey(new_start)
+                norm_pause = hotkeys_mod._normalize_hotkey(new_pause)
+                if norm_start == norm_pause:
+                    raise ValueError("Start/Stop and Pause/Resume hotkeys must be different")
+                self._hotkeys.update(HotkeyConfig(start_stop=new_start, pause_resume=new_pause))
                 self._hotkeys_failed = False
                 self._hotkeys_active = True
             except Exception:
-                self._hotkeys_failed = True
-                self._hotkeys_active = False
+                try:
+                    self._logger.exception("Failed to apply hotkeys from profile")
+                except Exception:
+                    pass
 
-            self._sync_ui_from_state()
-            self._set_message("Profile hotkeys invalid; keeping previous hotkeys")
+                try:
+                    self._state.update_settings(start_stop_hotkey=prev_start, pause_resume_hotkey=prev_pause)
+                except Exception:
+                    pass
+
+                try:
+                    self._hotkeys.update(HotkeyConfig(start_stop=prev_start, pause_resume=prev_pause))
+                    self._hotkeys_failed = False
+                    self._hotkeys_active = True
+                except Exception:
+                    self._hotkeys_failed = True
+                    self._hotkeys_active = False
+
+                self._sync_ui_from_state()
+                self._set_message("Profile hotkeys invalid; keeping previous hotkeys")
 
         self._rebuild_runner()
 
@@ -1796,6 +2249,12 @@ class App(ctk.CTk):
         if not self._last_run_preview:
             self._run_post_action()
 
+        if self._state.settings.debug_mode:
+            try:
+                self._logger.debug(metrics.format_stats("runner.stop_latency"))
+            except Exception:
+                pass
+
     def _on_runner_status(self, st: RunnerStatus) -> None:
         self._update_status(st)
 
@@ -1916,12 +2375,15 @@ class App(ctk.CTk):
     def _on_close(self) -> None:
         self._closing = True
         self._cancel_record_dot_mode()
-        self._cancel_job("_ui_drain_job")
+        self._ui.close()
         self._cancel_job("_focus_job")
         self._cancel_job("_autosave_job")
         self._cancel_job("_msg_job")
+        self._cancel_job("_overlay_job")
+        self._cancel_job("_log_viewer_job")
         try:
-            self._hotkeys.stop()
+            if self._hotkeys is not None:
+                self._hotkeys.stop()
         except Exception:
             pass
         try:
@@ -1929,7 +2391,7 @@ class App(ctk.CTk):
         except Exception:
             pass
         try:
-            self._overlay.clear()
+            self._overlay.destroy()
         except Exception:
             pass
 
@@ -1937,12 +2399,30 @@ class App(ctk.CTk):
             self._save_config()
         except Exception:
             pass
+        try:
+            self._profiles.close()
+        except Exception:
+            pass
+        try:
+            self._writer.close()
+        except Exception:
+            pass
+        if self._profiler is not None and self._profiler.running:
+            try:
+                self._logger.info("Wrote profile report to %s", self._profiler.stop())
+            except Exception:
+                pass
+        shutdown_logging()
 
         self.destroy()
 
 
 def main() -> None:
-    app = App()
+    profiler = None
+    if "--profile" in sys.argv[1:]:
+        profiler = SamplingProfiler()
+        profiler.start()
+    app = App(profiler=profiler)
     app.mainloop()
 
 
@@ -0,0 +1,59 @@
+"""Memory and bulk-update cost of 100k dots: List[Dot] vs DotTable.
+
+Runs headless; no display needed.
+
+    python benchmarks/bench_dot_table.py [dots]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from adoptme_macro import dot_table  # noqa: E402
+from adoptme_macro.dot_table import DotTable  # noqa: E402
+from adoptme_macro.models import Dot  # noqa: E402
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    source = [Dot(name=f"Dot {i + 1}", x=i % 1920, y=i % 1080) for i in range(n)]
+    dicts = [d.to_dict() for d in source]
+
+    plain, plain_bytes = _measure(lambda: [Dot(**d) for d in dicts])
+    table, table_bytes = _measure(lambda: DotTable(source))
+
+    print(f"{n} dots")
+    print(f"{'':>10} {'bytes/dot':>10} {'set_positions':>14} {'set_delay':>10} {'scale':>8}")
+    for label, dots, size in (("list", plain, plain_bytes), ("DotTable", table, table_bytes)):
+        pos = _timed(lambda: dot_table.set_positions(dots, 960, 540))
+        delay = _timed(lambda: dot_table.set_delay(dots, 250))
+        scale = _timed(lambda: dot_table.scale_positions(dots, 1.5, 1.5))
+        print(f"{label:>10} {size / n:>10.0f} {pos:>11.1f} ms {delay:>7.1f} ms {scale:>5.1f} ms")
+
+    _, touched = _measure(lambda: sum(1 for _ in table))
+    print(f"DotTable views materialised by a full iteration: +{touched / n:.0f} bytes/dot")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Click-loop jitter with debug logging on: a synchronous FileHandler (the
+previous setup) vs the queued pipeline in logging_utils.
+
+The loop sleeps for a fixed interval and logs one debug line per "click",
+like the runner does in debug mode. The file stream stalls every
+``STALL_EVERY`` writes to stand in for a slow or busy disk. Jitter is the
+difference between the intended and the observed interval.
+
+Also times a disabled ``debug()`` call: filtered by handler level (old)
+vs by the logger's cached level (new).
+
+Runs headless; no display needed.
+
+    python benchmarks/bench_logging.py [iterations]
+"""
+
+from __future__ import annotations
+
+import logging
+import logging.handlers
+import queue
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from adoptme_macro.logging_utils import LOG_QUEUE_SIZE, DroppingQueueHandler  # noqa: E402
+
+
+INTERVAL_S = 0.002
+STALL_EVERY = 50
+STALL_S = 0.015
+
+
+class _SlowFile:
+    def __init__(self, path: Path) -> None:
+        self._f = open(path, "w", encoding="utf-8")
+        self._n = 0
+
+    def write(self, s: str) -> int:
+        self._n += 1
+        if self._n % STALL_EVERY == 0:
+            time.sleep(STALL_S)
+        return self._f.write(s)
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def _loop(logger: logging.Logger, n: int) -> list:
+    jitter = []
+    last = time.perf_counter()
+    for i in range(n):
+        time.sleep(INTERVAL_S)
+        logger.debug("Dot %d: %s at (%d, %d), wait %d ms", i % 50 + 1, "click", 100, 200, 2)
+        now = time.perf_counter()
+        jitter.append(abs((now - last) - INTERVAL_S) * 1000.0)
+        last = now
+    return jitter
+
+
+def _report(name: str, jitter: list) -> None:
+    jitter = sorted(jitter)
+    p95 = jitter[int(len(jitter) * 0.95)]
+    late = sum(1 for j in jitter if j > STALL_S * 1000.0 / 2)
+    print(
+        f"{name:<18} jitter p50={statistics.median(jitter):6.3f} ms  p95={p95:6.3f} ms  "
+        f"max={jitter[-1]:6.3f} ms  late(>{STALL_S * 500:.1f} ms)={late}"
+    )
+
+
+def _logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as td:
+        fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+
+        sync = logging.StreamHandler(_SlowFile(Path(td) / "sync.log"))
+        sync.setFormatter(fmt)
+        logger = _logger("sync")
+        logger.addHandler(sync)
+        _report("sync FileHandler", _loop(logger, n))
+        sync.close()
+
+        sink = logging.StreamHandler(_SlowFile(Path(td) / "queued.log"))
+        sink.setFormatter(fmt)
+        qh = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        listener = logging.handlers.QueueListener(qh.queue, sink)
+        listener.start()
+        logger = _logger("queued")
+        logger.addHandler(qh)
+        _report("queued", _loop(logger, n))
+        listener.stop()
+        sink.close()
+        print(f"queued: {qh.dropped} records dropped")
+
+    calls = 200_000
+    old = _logger("old")
+    old.addHandler(logging.NullHandler(level=logging.INFO))
+    new = _logger("new")
+    new.setLevel(logging.INFO)
+    new.addHandler(logging.NullHandler())
+    for name, lg in (("handler-filtered", old), ("logger-level", new)):
+        t0 = time.perf_counter()
+        for i in range(calls):
+            lg.debug("Dot %d at (%d, %d)", i, 1, 2)
+        ns = (time.perf_counter() - t0) / calls * 1e9
+        print(f"disabled debug() {name:<16} {ns:7.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare JSON and packed (.amdots) profiles: file size, save and load time.
+
+Runs headless; no display needed.
+
+    python benchmarks/bench_profile_formats.py [dots]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from adoptme_macro import binfmt, storage  # noqa: E402
+from adoptme_macro.models import AppState, Dot  # noqa: E402
+
+
+REPEATS = 5
+
+
+def _timed(fn) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    state = AppState(
+        dots=[
+            Dot(name=f"Dot {i + 1}", x=i % 1920, y=i % 1080, click_type="key" if i % 7 == 0 else "click",
+                key="{E}" if i % 7 == 0 else None)
+            for i in range(n)
+        ]
+    )
+
+    with tempfile.TemporaryDirectory() as td:
+        with patch.object(storage, "project_dir", return_value=Path(td)):
+            print(f"{n} dots, median of {REPEATS}")
+            for label, name in (("json", "bench"), ("packed", "bench" + binfmt.SUFFIX)):
+                save_ms = _timed(lambda: storage.save_profile(name, state))
+                load_ms = _timed(lambda: storage.load_profile(name))
+                size = storage.profile_path(name).stat().st_size
+                print(f"{label:>7}: {size / 1024:9.1f} KiB | save {save_ms:7.1f} ms | load {load_ms:7.1f} ms")
+                storage.delete_profile(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Round-trip (to_dict + from_dict) of a large AppState: schema-compiled
+serializers vs the previous hand-written ones (reproduced below).
+
+Runs headless; no display needed.
+
+    python benchmarks/bench_schema.py [dots]
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from adoptme_macro.models import AppState, Dot, Settings  # noqa: E402
+
+
+REPEATS = 5
+
+
+def _legacy_dot_to_dict(d: Dot) -> dict:
+    return {
+        "id": d.id,
+        "name": d.name,
+        "x": d.x,
+        "y": d.y,
+        "click_type": d.click_type,
+        "key": d.key,
+        "delay_override_ms": d.delay_override_ms,
+    }
+
+
+def _legacy_dot_from_dict(data: dict) -> Dot:
+    return Dot(
+        id=str(data.get("id") or uuid4().hex),
+        name=str(data.get("name") or ""),
+        x=int(data.get("x") or 0),
+        y=int(data.get("y") or 0),
+        click_type=str(data.get("click_type") or "click"),
+        key=data.get("key"),
+        delay_override_ms=data.get("delay_override_ms"),
+    )
+
+
+def _legacy_settings_from_dict(data: dict) -> Settings:
+    s = Settings()
+    for k, v in (data or {}).items():
+        if hasattr(s, k):
+            setattr(s, k, v)
+    return s
+
+
+def _legacy_roundtrip(state: AppState) -> AppState:
+    data = {
+        "settings": dict(vars(state.settings)),
+        "dots": [_legacy_dot_to_dict(d) for d in state.dots],
+    }
+    return AppState(
+        settings=_legacy_settings_from_dict(data["settings"]),
+        dots=[_legacy_dot_from_dict(x) for x in data["dots"]],
+    )
+
+
+def _schema_roundtrip(state: AppState) -> AppState:
+    return AppState.from_dict(state.to_dict())
+
+
+def _timed(fn, state) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        fn(state)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    state = AppState(dots=[Dot(name=f"Dot {i + 1}", x=i % 1920, y=i % 1080) for i in range(n)])
+    assert _schema_roundtrip(state) == state
+
+    print(f"{n} dots, median of {REPEATS}")
+    print(f"  legacy: {_timed(_legacy_roundtrip, state):7.1f} ms")
+    print(f"  schema: {_timed(_schema_roundtrip, state):7.1f} ms (with validation)")
+
+
+if __name__ == "__main__":
+    main()
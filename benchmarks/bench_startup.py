@@ -0,0 +1,52 @@
+"""Measure time-to-first-paint of the main window.
+
+Each run starts a fresh interpreter, builds ``App`` with the first-run
+modals suppressed and exits as soon as the window has been mapped. Needs a
+display and the app's dependencies.
+
+    python benchmarks/bench_startup.py [runs]
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _once() -> None:
+    t0 = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    import app as app_mod
+    from adoptme_macro import metrics
+
+    t_import = (time.perf_counter() - t0) * 1000.0
+    app_mod.App._maybe_show_first_run_modals = lambda self: None
+    a = app_mod.App()
+
+    def wait_paint() -> None:
+        snap = metrics.stats("startup.first_paint").snapshot()
+        if snap["count"]:
+            print(f"import {t_import:.1f} ms | first paint {snap['max']:.1f} ms after App()")
+            a._on_close()
+            return
+        a.after(5, wait_paint)
+
+    a.after(0, wait_paint)
+    a.mainloop()
+
+
+def main() -> None:
+    if "--once" in sys.argv:
+        _once()
+        return
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for _ in range(runs):
+        subprocess.run([sys.executable, __file__, "--once"], cwd=str(ROOT), check=False)
+
+
+if __name__ == "__main__":
+    main()
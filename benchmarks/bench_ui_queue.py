@@ -0,0 +1,68 @@
+"""Compare the legacy 25 ms UI queue poll with event-driven wakeups.
+
+Reports idle CPU time of the Tk process and post-to-run latency for
+callables posted from a worker thread. Needs a display.
+
+    python benchmarks/bench_ui_queue.py
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from adoptme_macro import metrics  # noqa: E402
+from adoptme_macro.ui_queue import UiDispatcher  # noqa: E402
+
+
+IDLE_SECONDS = 5.0
+POSTS = 500
+
+
+def _run(label: str, **kwargs) -> None:
+    metrics.reset()
+    root = tk.Tk()
+    root.withdraw()
+    ui = UiDispatcher(root, on_error=lambda: None, **kwargs)
+
+    def idle_phase() -> None:
+        cpu0 = time.process_time()
+        root.after(int(IDLE_SECONDS * 1000), lambda: post_phase(time.process_time() - cpu0))
+
+    def post_phase(idle_cpu: float) -> None:
+        done = threading.Event()
+
+        def worker() -> None:
+            for i in range(POSTS):
+                ui.post(lambda i=i: (i == POSTS - 1) and done.set())
+                time.sleep(0.002)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+        def wait_done() -> None:
+            if done.is_set():
+                print(f"{label:>8}: idle cpu {idle_cpu * 1000:.1f} ms over {IDLE_SECONDS:.0f}s | "
+                      + metrics.format_stats("ui_queue.post_to_run"))
+                ui.close()
+                root.destroy()
+                return
+            root.after(50, wait_done)
+
+        wait_done()
+
+    root.after(0, idle_phase)
+    root.mainloop()
+
+
+def main() -> None:
+    _run("poll", wake=False, fallback_ms=25)
+    _run("wake")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
-import importlib
+import hashlib
+import importlib.util
 import os
 import runpy
 import subprocess
@@ -6,34 +7,97 @@ import sys
 from pathlib import Path
 
 
+def _deps_fingerprint(req_path: Path) -> str:
+    h = hashlib.sha256()
+    h.update(req_path.read_bytes())
+    h.update(sys.executable.encode("utf-8", "replace"))
+    h.update(sys.version.encode("utf-8", "replace"))
+    return h.hexdigest()
+
+
 def _ensure_packages_installed() -> None:
     required = ["customtkinter", "pynput", "autoit"]
 
+    project_dir = Path(__file__).resolve().parent
+    req_path = project_dir / "requirements.txt"
+    stamp_path = project_dir / ".deps_ok"
+
+    # Skip the check entirely when requirements.txt and the interpreter are
+    # unchanged since the last successful check.
+    fingerprint = _deps_fingerprint(req_path) if req_path.exists() else None
+    if fingerprint is not None:
+        try:
+            if stamp_path.read_text(encoding="utf-8").strip() == fingerprint:
+                return
+        except OSError:
+            pass
+
     missing = []
     for pkg in required:
         try:
-            importlib.import_module(pkg)
+            if importlib.util.find_spec(pkg) is None:
+                missing.append(pkg)
         except Exception:
             missing.append(pkg)
 
-    if not missing:
-        return
+    if missing:
+        if not req_path.exists():
+            raise FileNotFoundError(f"Missing requirements.txt at {req_path}")
 
-    project_dir = Path(__file__).resolve().parent
-    req_path = project_dir / "requirements.txt"
+        subprocess.check_call(
+            [sys.executable, "-m", "pip", "install", "-r", str(req_path)],
+            cwd=str(project_dir),
+        )
+
+    if fingerprint is not None:
+        try:
+            stamp_path.write_text(fingerprint, encoding="utf-8")
+        except OSError:
+            pass
 
-    if not req_path.exists():
-        raise FileNotFoundError(f"Missing requirements.txt at {req_path}")
 
-    subprocess.check_call(
-        [sys.executable, "-m", "pip", "install", "-r", str(req_path)],
+def _startup_report(top: int = 20) -> None:
+    """Print (and save to logs/) the slowest imports of ``app`` via ``-X importtime``."""
+    project_dir = Path(__file__).resolve().parent
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
         cwd=str(project_dir),
+        capture_output=True,
+        text=True,
     )
 
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:") :].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        rows.append((int(parts[1]), int(parts[0]), parts[2]))
+
+    total_us = sum(self_us for _cum, self_us, _name in rows)
+    lines = [f"Total import time: {total_us / 1000.0:.1f} ms ({len(rows)} modules)", ""]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cum_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        lines.append(f"{cum_us / 1000.0:>14.1f} {self_us / 1000.0:>9.1f}  {name}")
+    if proc.returncode != 0:
+        lines += ["", "import app failed:", proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ""]
+
+    report = "\n".join(lines)
+    print(report)
+
+    logs = project_dir / "logs"
+    logs.mkdir(parents=True, exist_ok=True)
+    (logs / "startup_importtime.txt").write_text(report + "\n", encoding="utf-8")
+
 
 def main() -> None:
     _ensure_packages_installed()
 
+    if "--startup-report" in sys.argv[1:]:
+        _startup_report()
+        return
+
     project_dir = Path(__file__).resolve().parent
     app_path = project_dir / "app.py"
     if not app_path.exists():
@@ -0,0 +1,57 @@
+"""Real pynput keyboard objects for the hotkey tests.
+
+Without a display pynput can only load its dummy backend, whose ``Key``
+members all share one value (``Key.f6 is Key.alt``). ``windows_keys`` then
+swaps in a ``Key`` enum and modifier table shaped like pynput's win32 backend,
+built from pynput's own ``KeyCode``, so ``Listener.canonical`` runs unchanged
+and behaves as it does on Windows.
+"""
+
+import enum
+import os
+import sys
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from unittest import mock
+
+if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+    os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+try:
+    from pynput import keyboard
+except ImportError:  # pragma: no cover - pynput not installed
+    keyboard = None  # type: ignore[assignment]
+
+# Windows virtual key codes.
+_WIN32_VK = {
+    "ctrl": 0x11,
+    "ctrl_l": 0xA2,
+    "ctrl_r": 0xA3,
+    "shift": 0x10,
+    "shift_l": 0xA0,
+    "shift_r": 0xA1,
+    "f6": 0x75,
+    "f7": 0x76,
+    "f8": 0x77,
+}
+
+
+@contextmanager
+def windows_keys() -> Iterator[Optional[Any]]:
+    """Yield the pynput ``keyboard`` module with distinct ``Key`` values (None without pynput)."""
+    if keyboard is None:
+        yield None
+        return
+    if keyboard.Key.f6 is not keyboard.Key.alt:
+        yield keyboard
+        return
+    key_code = keyboard.KeyCode
+    key = enum.Enum("Key", {name: key_code.from_vk(vk) for name, vk in _WIN32_VK.items()})
+    normal = {key[f"{m}{side}"].value: key[m] for m in ("ctrl", "shift") for side in ("", "_l", "_r")}
+    with mock.patch.object(keyboard, "Key", key), mock.patch.object(keyboard, "_NORMAL_MODIFIERS", normal):
+        yield keyboard
+
+
+def char_key(char: str, vk: Optional[int] = None) -> Any:
+    """A letter key as the Windows listener reports it (``vk`` set alongside ``char``)."""
+    return keyboard.KeyCode.from_char(char, vk=vk if vk is not None else ord(char.upper()))
@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from adoptme_macro import binfmt, storage
+from adoptme_macro.models import AppState, Dot, Settings
+
+
+def _state() -> AppState:
+    return AppState(
+        settings=Settings(loop_delay_ms=42, theme="light"),
+        dots=[
+            Dot(name="A", x=1, y=2),
+            Dot(name="A", x=-5, y=70000, click_type="key", key="{E}", delay_override_ms=0),
+            Dot(name="Ünïcode", x=3, y=4, click_type="double", delay_override_ms=250),
+        ],
+    )
+
+
+class BinFmtTests(unittest.TestCase):
+    def test_roundtrip(self) -> None:
+        state = _state()
+        self.assertEqual(binfmt.loads(binfmt.dumps(state)).to_dict(), state.to_dict())
+
+    def test_roundtrip_custom_ids_and_click_types(self) -> None:
+        state = AppState(dots=[Dot(id="first", click_type="triple"), Dot(id="ABCDEF", click_type="hold")])
+        self.assertEqual(binfmt.loads(binfmt.dumps(state)).to_dict(), state.to_dict())
+
+    def test_empty(self) -> None:
+        self.assertEqual(binfmt.loads(binfmt.dumps(AppState())).to_dict(), AppState().to_dict())
+
+    def test_rejects_garbage_and_truncation(self) -> None:
+        with self.assertRaises(ValueError):
+            binfmt.loads(b"{}")
+        data = binfmt.dumps(_state())
+        with self.assertRaises(Exception):
+            binfmt.loads(data[:-3])
+
+    def test_smaller_than_json(self) -> None:
+        state = AppState(dots=[Dot(name=f"Dot {i}", x=i, y=i) for i in range(1000)])
+        packed = binfmt.dumps(state)
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(storage, "project_dir", return_value=Path(td)):
+                storage.save_profile("big", state)
+                json_size = (storage.profiles_dir() / "big.json").stat().st_size
+        self.assertLess(len(packed) * 3, json_size)
+
+
+class StorageFormatTests(unittest.TestCase):
+    def test_format_chosen_by_suffix(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(storage, "project_dir", return_value=Path(td)):
+                state = _state()
+                storage.save_profile("Farm", state)
+                self.assertTrue((storage.profiles_dir() / "Farm.json").exists())
+
+                # An explicit suffix converts the profile; later saves keep the format.
+                storage.save_profile("Farm" + binfmt.SUFFIX, state)
+                storage.save_profile("Farm", state)
+                files = sorted(p.name for p in storage.profiles_dir().iterdir())
+                self.assertEqual(files, ["Farm" + binfmt.SUFFIX])
+
+                self.assertEqual(storage.load_profile("Farm").to_dict(), state.to_dict())
+                self.assertEqual([p.name for p in storage.list_profiles()], ["Farm"])
+                storage.delete_profile("Farm")
+                self.assertEqual(storage.list_profiles(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
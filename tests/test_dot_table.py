@@ -0,0 +1,96 @@
+import unittest
+
+from adoptme_macro import dot_table
+from adoptme_macro.dot_table import DotTable, DotView
+from adoptme_macro.models import AppState, Dot
+
+
+def _dots(n: int = 4):
+    return [
+        Dot(id=f"d{i}", name=f"Dot {i}", x=i, y=10 * i, click_type="key" if i == 1 else "click",
+            key="{E}" if i == 1 else None, delay_override_ms=5 if i == 2 else None)
+        for i in range(n)
+    ]
+
+
+class DotTableTests(unittest.TestCase):
+    def test_views_read_and_write_columns(self) -> None:
+        t = DotTable(_dots())
+        self.assertEqual([d.to_dict() for d in t], [d.to_dict() for d in _dots()])
+        v = t[1]
+        self.assertIsInstance(v, DotView)
+        self.assertIs(t[1], v)
+
+        v.x = 500
+        v.click_type = "triple"
+        v.delay_override_ms = 7
+        self.assertEqual(t.row_dict(1)["x"], 500)
+        self.assertEqual(t[1].click_type, "triple")
+        self.assertEqual(t[1].delay_override_ms, 7)
+
+    def test_views_follow_rows_across_insert_delete_sort(self) -> None:
+        t = DotTable(_dots())
+        v2 = t[2]
+        del t[0]
+        self.assertEqual(v2.id, "d2")
+        t.insert(0, Dot(id="new"))
+        self.assertEqual(v2.id, "d2")
+        self.assertEqual(t[0].id, "new")
+        t.sort(key=lambda d: -d.x)
+        self.assertEqual(v2.id, "d2")
+        self.assertEqual([d.id for d in t], ["d3", "d2", "d1", "new"])
+        self.assertEqual(t.remove_ids(["d1", "missing"]), 1)
+        self.assertEqual(v2.id, "d2")
+        self.assertEqual(len(t), 3)
+
+    def test_bulk_updates_match_list_behaviour(self) -> None:
+        table = DotTable(_dots())
+        plain = _dots()
+        for dots in (table, plain):
+            dot_table.set_positions(dots, 100, 200)
+            dot_table.scale_positions(dots, 0.5, 2.0)
+            dot_table.set_delay(dots, 30)
+            dot_table.remove_ids(dots, ["d0"])
+        self.assertEqual([d.to_dict() for d in table], [d.to_dict() for d in plain])
+
+    def test_appstate_pack_roundtrip_and_copy(self) -> None:
+        state = AppState(dots=_dots(5))
+        expected = state.to_dict()
+        self.assertFalse(state.pack_dots())
+        self.assertTrue(state.pack_dots(threshold=1))
+        self.assertIsInstance(state.dots, DotTable)
+        self.assertEqual(state.to_dict(), expected)
+
+        clone = state.copy()
+        clone.dots[0].x = 999
+        self.assertEqual(state.dots[0].x, 0)
+        self.assertEqual(AppState.from_dict(state.to_dict()).to_dict(), expected)
+
+    def test_view_held_across_removal_keeps_its_own_row(self) -> None:
+        state = AppState(dots=_dots(5))
+        self.assertTrue(state.pack_dots(threshold=1))
+        held = list(state.dots)  # what the runner holds for a loop
+        state.remove_dots(["d1"])
+        self.assertEqual((held[1].id, held[1].x, held[1].y), ("d1", 1, 10))
+        self.assertEqual([d.id for d in held[2:]], ["d2", "d3", "d4"])
+        held[1].x = 99
+        self.assertEqual([d.x for d in state.dots], [0, 2, 3, 4])
+
+        t = DotTable(_dots())
+        v0, v3 = t[0], t[3]
+        del t[0]
+        self.assertEqual(v0.id, "d0")
+        t.clear()
+        self.assertEqual((v3.id, v3.x, v3.y), ("d3", 3, 30))
+
+    def test_clear_and_negative_index(self) -> None:
+        t = DotTable(_dots())
+        self.assertEqual(t[-1].id, "d3")
+        with self.assertRaises(IndexError):
+            t[4]
+        t.clear()
+        self.assertEqual(len(t), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
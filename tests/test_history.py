@@ -0,0 +1,90 @@
+import unittest
+
+from adoptme_macro.dot_table import DotTable
+from adoptme_macro.history import CHUNK, DotSnapshot, History
+from adoptme_macro.models import Dot
+
+
+def _dots(n: int):
+    return [Dot(id=f"{i:032x}", name=f"Dot {i}", x=i, y=i * 2) for i in range(n)]
+
+
+def _dicts(dots):
+    return [d.to_dict() for d in dots]
+
+
+class DotSnapshotTests(unittest.TestCase):
+    def test_round_trip_list_and_table(self) -> None:
+        dots = _dots(CHUNK * 2 + 5)
+        dots[3].delay_override_ms = 40
+        dots[4].click_type = "key"
+        dots[4].key = "{E}"
+        for src in (dots, DotTable(dots)):
+            snap, _ = DotSnapshot.build(src)
+            self.assertEqual(len(snap), len(dots))
+            self.assertEqual(_dicts(snap.to_dots()), _dicts(dots))
+
+    def test_unchanged_chunks_are_shared(self) -> None:
+        dots = _dots(CHUNK * 10)
+        first, full = DotSnapshot.build(dots)
+        dots[CHUNK * 5].x = 999
+        second, added = DotSnapshot.build(dots, first)
+        shared = sum(a is b for a, b in zip(first.chunks, second.chunks))
+        self.assertEqual(shared, 9)
+        self.assertLess(added, full // 5)
+
+    def test_rows_are_shared_after_a_delete(self) -> None:
+        dots = _dots(CHUNK * 4)
+        first, _ = DotSnapshot.build(dots)
+        del dots[0]
+        second, _ = DotSnapshot.build(dots, first)
+        self.assertTrue(all(second.row(i) is first.row(i + 1) for i in range(len(second))))
+
+
+class HistoryTests(unittest.TestCase):
+    def test_undo_redo_walks_steps(self) -> None:
+        dots = _dots(3)
+        h = History()
+        h.reset(dots)
+        self.assertFalse(h.can_undo())
+
+        dots[0].x = 50
+        self.assertTrue(h.commit(dots, "Move Dot"))
+        dots.append(Dot(id="new", name="New"))
+        self.assertTrue(h.commit(dots, "Add Dot"))
+        self.assertFalse(h.commit(dots, "No-op"))
+
+        self.assertEqual(h.undo_label(), "Add Dot")
+        self.assertEqual(len(h.undo()), 3)
+        snap = h.undo()
+        self.assertEqual(snap.row(0)[2], 0)
+        self.assertIsNone(h.undo())
+        self.assertEqual(h.redo_label(), "Move Dot")
+        self.assertEqual(h.redo().row(0)[2], 50)
+
+        # A new edit drops the redo tail.
+        dots = h.current.to_dots()
+        dots[1].name = "renamed"
+        h.commit(dots, "Edit Dot")
+        self.assertFalse(h.can_redo())
+        self.assertEqual(len(h), 3)
+
+    def test_memory_cap_drops_oldest_steps(self) -> None:
+        dots = _dots(CHUNK * 20)
+        h = History()
+        h.reset(dots)
+        base = h.bytes
+        h.max_bytes = base + 8 * 1024
+        for i in range(50):
+            dots[i % len(dots)].x = -i - 1
+            h.commit(dots, f"step {i}")
+            self.assertLessEqual(h.bytes, h.max_bytes)
+        self.assertLess(len(h), 51)
+        self.assertTrue(h.can_undo())
+        while h.can_undo():
+            h.undo()
+        self.assertEqual(h.bytes, sum(s.cost for s in h._steps))
+
+
+if __name__ == "__main__":
+    unittest.main()
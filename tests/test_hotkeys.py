@@ -1,6 +1,9 @@
+import time
 import unittest
 
 from adoptme_macro import hotkeys
+from adoptme_macro.hotkeys import HotkeyConfig, HotkeyManager, HotkeyMatcher, parse_hotkey
+from tests.pynput_keys import char_key, windows_keys
 
 
 class HotkeyNormalizeTests(unittest.TestCase):
@@ -18,5 +21,105 @@ class HotkeyNormalizeTests(unittest.TestCase):
             hotkeys._normalize_hotkey(" ")
 
 
+class HotkeyMatcherTests(unittest.TestCase):
+    def test_parse_hotkey(self) -> None:
+        self.assertEqual(parse_hotkey("ctrl+shift+s"), frozenset({"ctrl", "shift", "s"}))
+        self.assertEqual(parse_hotkey("F6"), frozenset({"f6"}))
+
+    def test_combo_fires_once_on_last_key(self) -> None:
+        fired = []
+        m = HotkeyMatcher({"<ctrl>+<shift>+s": lambda: fired.append("stop"), "f6": lambda: fired.append("f6")})
+        self.assertIsNone(m.press("ctrl_l"))
+        self.assertIsNone(m.press("shift_r"))
+        fn = m.press("s")
+        self.assertIsNotNone(fn)
+        fn()
+        self.assertIsNone(m.press("s"))  # auto-repeat
+        m.release("s")
+        m.release("shift_r")
+        m.release("ctrl_l")
+        m.press("f6")()
+        self.assertEqual(fired, ["stop", "f6"])
+
+    def test_unbound_held_key_does_not_block_match(self) -> None:
+        fired = []
+        m = HotkeyMatcher({"f6": lambda: fired.append("f6"), "ctrl+f6": lambda: fired.append("ctrl+f6")})
+        m.press("w")
+        fn = m.press("f6")
+        fn()
+        m.release("f6")
+        m.press("ctrl_l")
+        m.press("f6")()
+        self.assertEqual(fired, ["f6", "ctrl+f6"])
+
+    def test_key_with_lost_release_expires(self) -> None:
+        m = HotkeyMatcher({"f6": lambda: None, "ctrl+f6": lambda: None}, stale_s=0.05)
+        m.press("ctrl")  # its key-up never arrives
+        time.sleep(0.1)
+        self.assertIs(m.press("f6"), m.bindings()[frozenset({"f6"})])
+
+    def test_rebind_keeps_held_state_and_rejects_duplicates(self) -> None:
+        m = HotkeyMatcher({"f6": lambda: None})
+        m.press("ctrl")
+        m.bind({"ctrl+f7": lambda: None})
+        self.assertIsNotNone(m.press("f7"))
+        with self.assertRaises(ValueError):
+            m.bind({"f8": lambda: None, "<f8>": lambda: None})
+        self.assertEqual(set(m.bindings()), {frozenset({"ctrl", "f7"})})
+
+
+class HotkeyManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        ctx = windows_keys()
+        self.kb = ctx.__enter__()
+        self.addCleanup(ctx.__exit__, None, None, None)
+        if self.kb is None:
+            self.skipTest("pynput is not installed")
+        self.calls = []
+        self.mgr = HotkeyManager(
+            HotkeyConfig(start_stop="f6", pause_resume="f7"),
+            on_start_stop=lambda: self.calls.append("start_stop"),
+            on_pause_resume=lambda: self.calls.append("pause"),
+            on_emergency_stop=lambda: self.calls.append("emergency"),
+        )
+        # A real (not started) listener, so events go through its canonical().
+        self.listener = self.kb.Listener(on_press=self.mgr._on_press, on_release=self.mgr._on_release)
+        self.mgr._listener = self.listener
+
+    def tap(self, *keys) -> None:
+        for k in keys:
+            self.mgr._on_press(k)
+        for k in reversed(keys):
+            self.mgr._on_release(k)
+
+    def test_named_keys_match_after_canonical(self) -> None:
+        Key = self.kb.Key
+        # canonical() strips the name from F-keys, so naming must not rely on it.
+        self.assertIsNone(getattr(self.listener.canonical(Key.f6), "name", None))
+        self.tap(Key.f6)
+        self.tap(Key.f7)
+        self.assertEqual(self.calls, ["start_stop", "pause"])
+
+    def test_emergency_combo_with_side_modifiers_and_control_char(self) -> None:
+        Key = self.kb.Key
+        self.tap(Key.ctrl_l, Key.shift_r, char_key("S"))
+        # Windows reports Ctrl+Shift+S as "\x13" with the letter's vk.
+        self.tap(Key.ctrl_r, Key.shift_l, char_key("\x13", vk=0x53))
+        self.assertEqual(self.calls, ["emergency", "emergency"])
+
+    def test_update_swaps_bindings_without_a_new_listener(self) -> None:
+        Key = self.kb.Key
+        self.tap(Key.f6)
+        self.mgr.update(HotkeyConfig(start_stop="f8", pause_resume="f7"))
+        self.assertIs(self.mgr._listener, self.listener)
+        self.tap(Key.f6)
+        self.tap(Key.f8)
+        self.assertEqual(self.calls, ["start_stop", "start_stop"])
+
+        with self.assertRaises(ValueError):
+            self.mgr.update(HotkeyConfig(start_stop="f7", pause_resume="f7"))
+        self.assertIn(frozenset({"f8"}), self.mgr.matcher.bindings())
+
+
 if __name__ == "__main__":
     unittest.main()
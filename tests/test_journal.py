@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from adoptme_macro import storage
+from adoptme_macro.journal import ChangeJournal, replay
+from adoptme_macro.models import AppState, Dot, Settings
+
+
+def _state() -> AppState:
+    return AppState(
+        settings=Settings(theme="dark"),
+        dots=[
+            Dot(id="a", name="A", x=1, y=1),
+            Dot(id="b", name="B", x=2, y=2),
+        ],
+    )
+
+
+class ChangeJournalTests(unittest.TestCase):
+    def test_replay_applies_records_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.journal"
+            state = _state()
+            j = ChangeJournal(path)
+            j.reset(state)
+
+            state.dots[0].x = 50
+            j.record(dots=[state.dots[0]])
+            state.dots.append(Dot(id="c", name="C", x=3, y=3))
+            j.record(dots=[state.dots[-1]])
+            state.dots = [d for d in state.dots if d.id != "b"]
+            j.record(removed=["b"])
+            state.settings.theme = "light"
+            j.record(settings=state.settings)
+
+            loaded = _state()
+            self.assertEqual(replay(loaded, path), 4)
+            self.assertEqual(loaded.to_dict(), state.to_dict())
+            self.assertEqual(j.records, 4)
+
+    def test_settings_record_only_contains_changed_keys(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.journal"
+            state = _state()
+            j = ChangeJournal(path)
+            j.reset(state)
+
+            j.record(settings=state.settings)
+            self.assertFalse(path.exists())
+
+            state.settings.lock_dots = True
+            j.record(settings=state.settings)
+            self.assertIn('"values":{"lock_dots":true}', path.read_text(encoding="utf-8"))
+
+    def test_torn_last_line_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.journal"
+            state = _state()
+            j = ChangeJournal(path)
+            j.reset(state)
+            state.dots[1].y = 99
+            j.record(dots=[state.dots[1]])
+            with open(path, "ab") as f:
+                f.write(b'{"op":"clear"')
+
+            loaded = _state()
+            self.assertEqual(replay(loaded, path), 1)
+            self.assertEqual(loaded.to_dict(), state.to_dict())
+
+    def test_compaction_threshold(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            j = ChangeJournal(Path(td) / "config.journal")
+            j.reset(_state())
+            dot = Dot(id="a", name="A", x=1, y=1)
+            for i in range(ChangeJournal.COMPACT_RECORDS):
+                self.assertFalse(j.needs_compaction())
+                dot.x = i
+                j.record(dots=[dot])
+            self.assertTrue(j.needs_compaction())
+
+    def test_resume_counts_replayed_records(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "config.journal"
+            state = _state()
+            j = ChangeJournal(path)
+            j.reset(state)
+            for i in range(3):
+                state.dots[0].x = i
+                j.record(dots=[state.dots[0]])
+            size = path.stat().st_size
+
+            loaded = _state()
+            replay(loaded, path)
+            fresh = ChangeJournal(path)
+            self.assertEqual(fresh.resume(loaded), 3)
+            self.assertEqual((fresh.records, fresh.bytes), (3, size))
+            # Settings already on disk are not journaled again.
+            fresh.record(settings=loaded.settings)
+            self.assertEqual(fresh.records, 3)
+
+            self.assertEqual(ChangeJournal(Path(td) / "missing").resume(loaded), 0)
+
+    def test_load_config_replays_and_save_config_truncates(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            state = _state()
+            with patch.object(storage, "project_dir", return_value=root):
+                storage.save_config(state)
+                j = ChangeJournal(storage.journal_path())
+                j.reset(state)
+                state.dots[0].name = "Renamed"
+                j.record(dots=[state.dots[0]])
+
+                self.assertEqual(storage.load_config().to_dict(), state.to_dict())
+
+                storage.save_config(state)
+                self.assertFalse(storage.journal_path().exists())
+                self.assertEqual(storage.load_config().to_dict(), state.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
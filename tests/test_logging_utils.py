@@ -0,0 +1,159 @@
+import gzip
+import logging
+import os
+import queue
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from adoptme_macro import logging_utils
+from adoptme_macro.logging_utils import (
+    CompressingRotatingFileHandler,
+    DroppingQueueHandler,
+    configure_logging,
+    prune_logs,
+    rotated_logs,
+    shutdown_logging,
+    tail_lines,
+)
+from adoptme_macro.models import Settings
+
+
+class DroppingQueueHandlerTests(unittest.TestCase):
+    def test_full_queue_drops_instead_of_blocking(self) -> None:
+        h = DroppingQueueHandler(queue.Queue(maxsize=2))
+        logger = logging.getLogger("test.dropping")
+        logger.propagate = False
+        logger.addHandler(h)
+        try:
+            for i in range(5):
+                logger.warning("record %d", i)
+        finally:
+            logger.removeHandler(h)
+        self.assertEqual(h.queue.qsize(), 2)
+        self.assertEqual(h.dropped, 3)
+
+
+class ConfigureLoggingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.dir = Path(self._td.name)
+        p = patch.object(logging_utils, "logs_dir", return_value=self.dir)
+        p.start()
+        self.addCleanup(p.stop)
+        shutdown_logging()
+
+    def tearDown(self) -> None:
+        shutdown_logging()
+        self._td.cleanup()
+
+    def test_records_reach_the_file_through_the_queue(self) -> None:
+        with patch("sys.stderr"):
+            logger = configure_logging(Settings(enable_logs=True, debug_mode=False))
+            self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+            logger.debug("hidden")
+            logger.info("visible")
+
+            configure_logging(Settings(enable_logs=True, debug_mode=True))
+            self.assertTrue(logger.isEnabledFor(logging.DEBUG))
+            logger.debug("now shown")
+            shutdown_logging()
+
+        text = (self.dir / "macro.log").read_text(encoding="utf-8")
+        self.assertIn("visible", text)
+        self.assertIn("now shown", text)
+        self.assertNotIn("hidden", text)
+
+    def test_disabling_file_logging_detaches_the_file(self) -> None:
+        with patch("sys.stderr"):
+            logger = configure_logging(Settings(enable_logs=True))
+            configure_logging(Settings(enable_logs=False))
+            logger.info("after disable")
+            shutdown_logging()
+        self.assertNotIn("after disable", (self.dir / "macro.log").read_text(encoding="utf-8"))
+        self.assertEqual(logging_utils.dropped_records(), 0)
+
+
+class RotationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+        self.base = Path(self._td.name) / "macro.log"
+
+    def _logger(self, handler: logging.Handler) -> logging.Logger:
+        logger = logging.getLogger(f"test.rotation.{id(self)}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_size_rotation_compresses_rotated_files(self) -> None:
+        h = CompressingRotatingFileHandler(self.base, max_bytes=2_000, interval_s=0, budget_bytes=10**9)
+        logger = self._logger(h)
+        for i in range(200):
+            logger.info("line %04d %s", i, "x" * 40)
+        h.close()
+
+        rotated = rotated_logs(self.base)
+        self.assertGreater(len(rotated), 1)
+        self.assertTrue(all(p.suffix == ".gz" for p in rotated))
+        text = "".join(gzip.open(p, "rt", encoding="utf-8").read() for p in rotated)
+        text += self.base.read_text(encoding="utf-8")
+        self.assertEqual([f"line {i:04d}" in text for i in range(200)], [True] * 200)
+
+    def test_age_rotation(self) -> None:
+        h = CompressingRotatingFileHandler(self.base, max_bytes=0, interval_s=3600, budget_bytes=10**9)
+        logger = self._logger(h)
+        logger.info("old")
+        h._rollover_at = time.time() - 1
+        logger.info("new")
+        h.close()
+        self.assertEqual(len(rotated_logs(self.base)), 1)
+        self.assertEqual(self.base.read_text(encoding="utf-8").strip(), "new")
+
+    def test_age_survives_reopening_a_recently_appended_file(self) -> None:
+        h = CompressingRotatingFileHandler(self.base, max_bytes=0, interval_s=3600, budget_bytes=10**9)
+        logger = self._logger(h)
+        logger.info("old")
+        h.close()
+        logger.removeHandler(h)
+        start = self.base.with_name("macro.log-start")
+        start.write_text(f"{time.time() - 7200}\n", encoding="utf-8")
+        os.utime(self.base)  # appended to a moment ago by the last run
+
+        h = CompressingRotatingFileHandler(self.base, max_bytes=0, interval_s=3600, budget_bytes=10**9)
+        logger = self._logger(h)
+        logger.info("new")
+        h.close()
+        self.assertEqual(len(rotated_logs(self.base)), 1)
+        self.assertEqual(self.base.read_text(encoding="utf-8").strip(), "new")
+        self.assertGreater(float(start.read_text(encoding="utf-8")), time.time() - 60)
+
+    def test_prune_keeps_newest_within_budget(self) -> None:
+        for i in range(5):
+            p = self.base.with_name(f"macro.log.2024010{i}-000000.gz")
+            p.write_bytes(b"x" * 100)
+            os.utime(p, (1_000_000 + i, 1_000_000 + i))
+        self.assertEqual(prune_logs(self.base, 250), 3)
+        self.assertEqual([p.name for p in rotated_logs(self.base)], ["macro.log.20240103-000000.gz", "macro.log.20240104-000000.gz"])
+
+
+class TailLinesTests(unittest.TestCase):
+    def test_tail_reads_only_the_end(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "log.txt"
+            path.write_text("".join(f"line {i}\n" for i in range(10_000)), encoding="utf-8")
+            self.assertEqual(tail_lines(path, 3, block=64), ["line 9997", "line 9998", "line 9999"])
+            self.assertEqual(tail_lines(path, 1, block=7), ["line 9999"])
+
+            path.write_text("a\nb", encoding="utf-8")
+            self.assertEqual(tail_lines(path, 10), ["a", "b"])
+            self.assertEqual(tail_lines(path, 0), [])
+            self.assertEqual(tail_lines(Path(td) / "missing.txt", 5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from adoptme_macro import metrics
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+
+    def test_record_and_snapshot(self) -> None:
+        for ms in (1.0, 2.0, 3.0, 10.0):
+            metrics.record("t", ms)
+        snap = metrics.stats("t").snapshot()
+        self.assertEqual(snap["count"], 4)
+        self.assertAlmostEqual(snap["mean"], 4.0)
+        self.assertEqual(snap["max"], 10.0)
+        self.assertIn("t", metrics.snapshot_all())
+
+    def test_empty_stats(self) -> None:
+        self.assertEqual(metrics.stats("none").snapshot()["count"], 0)
+        self.assertIn("n=0", metrics.format_stats("none"))
+
+
+if __name__ == "__main__":
+    unittest.main()
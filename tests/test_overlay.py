@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+
+from adoptme_macro.models import Dot, Settings
+from adoptme_macro import overlay
+
+
+class _FakeOverlay:
+    created = 0
+
+    def __init__(self, root, dot, index, settings, on_moved, on_drag=None) -> None:
+        type(self).created += 1
+        self.dot = dot
+        self.index = index
+        self.settings = settings
+        self.visible = True
+        self.destroyed = False
+        self.synced = 0
+
+    def sync(self, dot, index) -> None:
+        self.synced += 1
+        self.dot = dot
+        self.index = index
+
+    def reset(self, dot, index, settings) -> None:
+        self.dot = dot
+        self.index = index
+        self.settings = settings
+
+    def set_visible(self, visible) -> None:
+        self.visible = visible
+
+    def apply_settings(self, settings) -> None:
+        self.settings = settings
+
+    def destroy(self) -> None:
+        self.destroyed = True
+
+
+class OverlayManagerRebuildTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _FakeOverlay.created = 0
+        patcher = patch.object(overlay, "DotOverlay", _FakeOverlay)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mgr = overlay.OverlayManager(root=None, settings=Settings(), on_dot_moved=lambda _d: None)
+
+    def test_rebuild_keeps_windows_for_same_ids(self) -> None:
+        dots = [Dot(id=f"d{i}", x=i, y=i) for i in range(5)]
+        self.mgr.rebuild(dots)
+        before = dict(self.mgr._overlays)
+
+        moved = [Dot(id=d.id, x=d.x + 100, y=d.y) for d in dots]
+        self.mgr.rebuild(moved)
+
+        self.assertEqual(_FakeOverlay.created, 5)
+        for d in moved:
+            self.assertIs(self.mgr._overlays[d.id], before[d.id])
+            self.assertIs(self.mgr._overlays[d.id].dot, d)
+
+    def test_rebuild_reuses_pool_and_releases_surplus(self) -> None:
+        self.mgr.rebuild([Dot(id="a"), Dot(id="b"), Dot(id="c")])
+        self.mgr.rebuild([Dot(id="a")])
+
+        self.assertEqual(sorted(self.mgr._overlays), ["a"])
+        self.assertEqual(len(self.mgr._pool), 2)
+        self.assertTrue(all(not ov.visible for ov in self.mgr._pool))
+
+        self.mgr.rebuild([Dot(id="a"), Dot(id="x"), Dot(id="y")])
+        self.assertEqual(_FakeOverlay.created, 3)
+        self.assertEqual(self.mgr._pool, [])
+        self.assertEqual(self.mgr._overlays["y"].index, 2)
+
+    def test_pool_is_bounded(self) -> None:
+        self.mgr.POOL_MAX = 1
+        self.mgr.rebuild([Dot(id="a"), Dot(id="b"), Dot(id="c")])
+        kept = list(self.mgr._overlays.values())
+        self.mgr.clear()
+
+        self.assertEqual(len(self.mgr._pool), 1)
+        self.assertEqual(sum(1 for ov in kept if ov.destroyed), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from adoptme_macro import storage
+from adoptme_macro.models import AppState, Dot, Settings
+from adoptme_macro.profile_store import JsonProfileStore, ProfileCache, SqliteProfileStore, _encode_dots
+from adoptme_macro.storage_writer import StorageWriter
+
+
+def _state(n: int = 3) -> AppState:
+    return AppState(
+        settings=Settings(loop_delay_ms=123, theme="light"),
+        dots=[
+            Dot(id=f"d{i}", name=f"Dot {i}", x=i, y=2 * i, click_type="key" if i % 2 else "click",
+                key="{E}" if i % 2 else None, delay_override_ms=i if i % 3 == 0 else None)
+            for i in range(n)
+        ],
+    )
+
+
+class SqliteProfileStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.store = SqliteProfileStore(self.root / "profiles.sqlite3")
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._td.cleanup()
+
+    def test_roundtrip_and_list_order(self) -> None:
+        self.store.save("Old", _state(1), mtime=100.0)
+        self.store.save("New", _state(5), mtime=200.0)
+        self.assertEqual([(p.name, p.mtime, p.dot_count) for p in self.store.list()], [("New", 200.0, 5), ("Old", 100.0, 1)])
+        self.assertEqual(self.store.load("New").to_dict(), _state(5).to_dict())
+        self.assertEqual(len(self.store), 2)
+
+    def test_search_by_name_and_tag(self) -> None:
+        self.store.save("Fishing", _state(), tags=["pets"])
+        self.store.save("Farming", _state(), tags=["Money", "daily"])
+        self.store.save("Other", _state())
+        self.assertEqual([p.name for p in self.store.list("fish")], ["Fishing"])
+        self.assertEqual([p.name for p in self.store.list("money")], ["Farming"])
+        self.assertEqual([p.name for p in self.store.list(tag="daily")], ["Farming"])
+        self.assertEqual([p.name for p in self.store.list("%")], [])
+
+        # Saving without tags keeps the existing ones.
+        self.store.save("Farming", _state(2))
+        self.assertEqual(self.store.tags("Farming"), ["daily", "money"])
+
+    def test_search_uses_indexes(self) -> None:
+        sql = (
+            "EXPLAIN QUERY PLAN SELECT name FROM profiles WHERE (name LIKE ? ESCAPE '\\' "
+            "OR name IN (SELECT name FROM profile_tags WHERE tag = ?))"
+        )
+        plan = " ".join(r[-1] for r in self.store._conn.execute(sql, ("fi%", "fi")).fetchall())
+        self.assertIn("profiles_name_nocase", plan)
+        self.assertIn("profile_tags_tag", plan)
+        self.assertNotIn("SCAN profiles", plan)
+
+    def test_migrates_tag_column(self) -> None:
+        path = self.root / "v1.sqlite3"
+        conn = sqlite3.connect(str(path))
+        conn.executescript(
+            "CREATE TABLE profiles (name TEXT PRIMARY KEY, mtime REAL NOT NULL, dot_count INTEGER NOT NULL, "
+            "tags TEXT NOT NULL DEFAULT '', settings TEXT NOT NULL, dots BLOB NOT NULL);"
+            "CREATE INDEX profiles_tags ON profiles (tags); PRAGMA user_version = 1;"
+        )
+        with conn:
+            conn.execute(
+                "INSERT INTO profiles VALUES ('Farming', 1.0, 0, ',daily,money,', '{}', ?)", (_encode_dots([]),)
+            )
+        conn.close()
+
+        store = SqliteProfileStore(path)
+        try:
+            self.assertEqual(store.tags("Farming"), ["daily", "money"])
+            self.assertEqual([p.name for p in store.list(tag="money")], ["Farming"])
+            store.save("Other", _state(1))
+            self.assertEqual(len(store), 2)
+        finally:
+            store.close()
+
+    def test_delete_and_missing(self) -> None:
+        self.store.save("A", _state())
+        self.store.delete("A")
+        self.assertEqual(self.store.list(), [])
+        with self.assertRaises(FileNotFoundError):
+            self.store.load("A")
+
+    def test_json_import_export_is_lossless(self) -> None:
+        with patch.object(storage, "project_dir", return_value=self.root):
+            storage.save_profile("One", _state(2))
+            storage.save_profile("Two", _state(7))
+            mtimes = {p.name: p.mtime for p in storage.list_profiles()}
+
+            self.assertEqual(self.store.import_json(), 2)
+            self.assertEqual(self.store.load("Two").to_dict(), _state(7).to_dict())
+            self.store.save("Two", _state(7), tags=["pets", "daily"], mtime=mtimes["Two"])
+
+            for p in storage.profiles_dir().glob("*.json"):
+                p.unlink()
+            self.assertEqual(self.store.export_json(), 2)
+
+            self.assertEqual(storage.load_profile("One").to_dict(), _state(2).to_dict())
+            self.assertEqual({p.name: p.mtime for p in storage.list_profiles()}, mtimes)
+
+            again = SqliteProfileStore(self.root / "again.sqlite3")
+            try:
+                self.assertEqual(again.import_json(), 2)
+                self.assertEqual(again.tags("Two"), ["daily", "pets"])
+                self.assertEqual(again.tags("One"), [])
+            finally:
+                again.close()
+
+    def test_save_through_writer(self) -> None:
+        writer = StorageWriter()
+        store = SqliteProfileStore(self.root / "w.sqlite3", writer=writer)
+        try:
+            state = _state()
+            store.save("A", state)
+            state.dots[0].x = 999  # must not leak into the queued snapshot
+            writer.flush(5)
+            self.assertEqual(store.load("A").to_dict(), _state().to_dict())
+        finally:
+            store.close()
+            writer.close()
+
+
+class JsonProfileStoreTests(unittest.TestCase):
+    def test_search_filters_names(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(storage, "project_dir", return_value=Path(td)):
+                store = JsonProfileStore()
+                store.save("Alpha", _state())
+                store.save("Beta", _state())
+                self.assertEqual([p.name for p in store.list("alp")], ["Alpha"])
+                self.assertEqual(store.load("Beta").to_dict(), _state().to_dict())
+
+
+class ProfileCacheTests(unittest.TestCase):
+    def test_lru_eviction_and_stamps(self) -> None:
+        cache = ProfileCache(max_entries=2)
+        cache.put("a", 1, _state(1))
+        cache.put("b", 1, _state(2))
+        self.assertIsNotNone(cache.get("a", 1))
+        cache.put("c", 1, _state(3))  # evicts "b", the least recently used
+        self.assertIsNone(cache.get("b", 1))
+        self.assertIsNone(cache.get("a", 2))  # stale stamp
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 2)
+
+    def test_returns_independent_copies(self) -> None:
+        cache = ProfileCache()
+        cache.put("a", 1, _state())
+        first = cache.get("a", 1)
+        first.dots[0].x = 999
+        first.settings.loop_delay_ms = 1
+        self.assertEqual(cache.get("a", 1).to_dict(), _state().to_dict())
+
+    def test_concurrent_loads_and_invalidations(self) -> None:
+        cache = ProfileCache(max_entries=4)
+        state = _state(1)
+        errors = []
+
+        def loads() -> None:
+            try:
+                for i in range(5000):
+                    key = i % 6
+                    if cache.get(key, 1) is None:
+                        cache.put(key, 1, state)
+            except Exception as e:
+                errors.append(e)
+
+        worker = threading.Thread(target=loads)
+        worker.start()
+        for i in range(5000):
+            cache.invalidate(i % 6)
+        worker.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 4)
+
+    def test_json_store_hits_until_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(storage, "project_dir", return_value=Path(td)):
+                store = JsonProfileStore()
+                storage.save_profile("A", _state(2))
+                store.load("A")
+                with patch.object(storage, "decode_profile", side_effect=AssertionError("parsed again")):
+                    self.assertEqual(store.load("A").to_dict(), _state(2).to_dict())
+                self.assertEqual(store.cache.hits, 1)
+
+                storage.save_profile("A", _state(4))  # different size -> new stamp
+                self.assertEqual(store.load("A").to_dict(), _state(4).to_dict())
+                self.assertEqual(store.cache.misses, 2)
+
+    def test_sqlite_store_hits_until_row_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            store = SqliteProfileStore(Path(td) / "p.sqlite3")
+            try:
+                store.save("A", _state(2), mtime=1.0)
+                store.load("A")
+                self.assertEqual(store.load("A").to_dict(), _state(2).to_dict())
+                self.assertEqual(store.cache.hits, 1)
+                store.save("A", _state(3), mtime=2.0)
+                self.assertEqual(store.load("A").to_dict(), _state(3).to_dict())
+            finally:
+                store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+
+from adoptme_macro.profiling import SamplingProfiler
+
+
+def _spin_in_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class SamplingProfilerTests(unittest.TestCase):
+    def test_samples_other_threads_and_writes_reports(self) -> None:
+        stop = threading.Event()
+        worker = threading.Thread(target=_spin_in_worker, args=(stop,), name="spinner")
+        prof = SamplingProfiler(interval_s=0.002, memory_interval_s=0.05)
+        prof.start()
+        worker.start()
+        try:
+            kept = [bytearray(1024) for _ in range(200)]
+            time.sleep(0.3)
+        finally:
+            stop.set()
+            worker.join()
+
+        with tempfile.TemporaryDirectory() as td:
+            report = prof.stop(Path(td))
+            self.assertIsNotNone(report)
+            text = report.read_text(encoding="utf-8")
+            folded = report.with_suffix(".folded").read_text(encoding="utf-8")
+
+        self.assertGreater(prof.samples, 10)
+        self.assertIn("spinner", text)
+        self.assertIn("_spin_in_worker", text)
+        self.assertIn("test_profiling.py", text)
+        self.assertIn("spinner;", folded)
+        self.assertIn("_spin_in_worker", folded)
+        self.assertNotIn("no snapshots", text)
+        self.assertIn("growth since start", text)
+        self.assertFalse(prof.running)
+        self.assertFalse(tracemalloc.is_tracing())
+        del kept
+
+    def test_overlapping_profilers_share_tracemalloc(self) -> None:
+        old = SamplingProfiler(interval_s=0.01, memory_interval_s=60.0)
+        new = SamplingProfiler(interval_s=0.01, memory_interval_s=60.0)
+        old.start()
+        new.start()
+        with tempfile.TemporaryDirectory() as td:
+            old.stop(Path(td))
+            self.assertTrue(tracemalloc.is_tracing())
+            kept = [bytearray(1024) for _ in range(200)]
+            text = new.stop(Path(td) / "new").read_text(encoding="utf-8")
+        self.assertNotIn("no snapshots", text)
+        self.assertFalse(tracemalloc.is_tracing())
+        del kept
+
+    def test_threads_parked_in_a_wait_are_skipped(self) -> None:
+        release = threading.Event()
+        waiter = threading.Thread(target=release.wait, name="idle-waiter")
+        waiter.start()
+        prof = SamplingProfiler(interval_s=0.002, memory_interval_s=60.0)
+        prof.start()
+        try:
+            time.sleep(0.1)
+        finally:
+            release.set()
+            waiter.join()
+        with tempfile.TemporaryDirectory() as td:
+            text = prof.stop(Path(td)).read_text(encoding="utf-8")
+        self.assertGreater(prof.idle, 0)
+        self.assertNotIn("idle-waiter", text)
+        self.assertIn("wall clock", text)
+
+    def test_stop_without_start(self) -> None:
+        self.assertIsNone(SamplingProfiler().stop())
+
+
+if __name__ == "__main__":
+    unittest.main()
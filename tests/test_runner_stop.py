@@ -0,0 +1,133 @@
+import threading
+import time
+import unittest
+
+from adoptme_macro import metrics
+from adoptme_macro.hotkeys import HotkeyConfig, HotkeyManager
+from adoptme_macro.input_backend import InputBackend
+from adoptme_macro.models import Dot, Settings
+from adoptme_macro.runner import MacroRunner
+from tests.pynput_keys import char_key, windows_keys
+
+# Upper bound for key event -> run loop exit; the loop waits on an Event, so
+# the real figure is well under a millisecond.
+MAX_STOP_LATENCY_MS = 100.0
+
+
+class _Backend(InputBackend):
+    def __init__(self) -> None:
+        self.clicked = threading.Event()
+
+    def move(self, x: int, y: int, speed: int) -> None:
+        pass
+
+    def click(self, x: int, y: int) -> None:
+        self.clicked.set()
+
+
+class RunnerStopTests(unittest.TestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+        self.backend = _Backend()
+        self.stopped = threading.Event()
+        self.runner = MacroRunner(
+            backend=self.backend,
+            get_settings=lambda: Settings(click_delay_ms=10_000, loop_delay_ms=10_000),
+            get_dots=lambda: [Dot(id="a"), Dot(id="b")],
+            on_status=lambda st: None,
+            on_flash_dot=lambda dot_id: None,
+            on_started=lambda preview: None,
+            on_stopped=self.stopped.set,
+        )
+
+    def tearDown(self) -> None:
+        self.runner.stop()
+
+    def _manager(self) -> HotkeyManager:
+        mgr = HotkeyManager(
+            HotkeyConfig(start_stop="f6", pause_resume="f7"),
+            on_start_stop=lambda: None,
+            on_pause_resume=lambda: None,
+            on_emergency_stop=lambda: self.runner.request_stop(mgr.last_event_t),
+        )
+        # A real (not started) listener, so events go through its canonical().
+        mgr._listener = self.kb.Listener(on_press=mgr._on_press, on_release=mgr._on_release)
+        return mgr
+
+    def test_emergency_hotkey_halts_runner_from_listener_thread(self) -> None:
+        ctx = windows_keys()
+        self.kb = ctx.__enter__()
+        self.addCleanup(ctx.__exit__, None, None, None)
+        if self.kb is None:
+            self.skipTest("pynput is not installed")
+        mgr = self._manager()
+        self.runner.start()
+        self.assertTrue(self.backend.clicked.wait(2.0))
+
+        # Press the combo on a separate "listener" thread while this thread
+        # (standing in for the UI) does nothing to help.
+        def listener() -> None:
+            for key in (self.kb.Key.ctrl_l, self.kb.Key.shift_l):
+                mgr._on_press(key)
+            mgr._on_press(char_key("s"))
+
+        t = threading.Thread(target=listener)
+        t.start()
+        t.join(2.0)
+
+        self.assertTrue(self.stopped.wait(2.0))
+        self.assertEqual(self.runner.status().state, "STOPPED")
+        stats = metrics.stats("runner.stop_latency").snapshot()
+        self.assertEqual(stats["count"], 1)
+        self.assertLess(stats["max"], MAX_STOP_LATENCY_MS)
+        self.assertEqual(metrics.stats("runner.stop_signal").snapshot()["count"], 1)
+
+    def test_paused_runner_stops_too(self) -> None:
+        self.runner.start()
+        self.assertTrue(self.backend.clicked.wait(2.0))
+        self.runner.pause()
+        self.assertTrue(self.runner.request_stop(time.perf_counter()))
+        self.assertTrue(self.stopped.wait(2.0))
+        self.assertLess(metrics.stats("runner.stop_latency").snapshot()["max"], MAX_STOP_LATENCY_MS)
+
+    def test_request_stop_when_idle_is_a_no_op(self) -> None:
+        self.assertFalse(self.runner.request_stop())
+        self.assertFalse(self.stopped.is_set())
+        self.assertEqual(metrics.stats("runner.stop_latency").snapshot()["count"], 0)
+
+
+class RunnerSnapshotTests(unittest.TestCase):
+    def test_run_uses_dots_as_they_were_at_start(self) -> None:
+        live = [Dot(id="a", x=1, y=1), Dot(id="b", x=2, y=2)]
+        clicks = []
+        first = threading.Event()
+        resume = threading.Event()
+        stopped = threading.Event()
+
+        class Backend(_Backend):
+            def click(self, x: int, y: int) -> None:
+                clicks.append((x, y))
+                if len(clicks) == 1:
+                    first.set()
+                    resume.wait(2.0)
+
+        runner = MacroRunner(
+            backend=Backend(),
+            get_settings=lambda: Settings(click_delay_ms=0, loop_delay_ms=0, loop_count=2),
+            get_dots=lambda: live,
+            on_status=lambda st: None,
+            on_flash_dot=lambda dot_id: None,
+            on_started=lambda preview: None,
+            on_stopped=stopped.set,
+        )
+        runner.start()
+        self.assertTrue(first.wait(2.0))
+        live[1].x = 99
+        del live[0]
+        resume.set()
+        self.assertTrue(stopped.wait(2.0))
+        self.assertEqual(clicks, [(1, 1), (2, 2), (1, 1), (2, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from adoptme_macro.models import AppState, Dot, Settings
+from adoptme_macro.schema import SCHEMA_VERSION
+
+
+class SchemaTests(unittest.TestCase):
+    def test_roundtrip_is_identity(self) -> None:
+        state = AppState(
+            settings=Settings(theme="light", overlay_opacity=0.5, loop_count=3),
+            dots=[Dot(id="a", name="A", x=-3, y=7, click_type="key", key="{E}", delay_override_ms=0)],
+        )
+        issues = []
+        loaded = AppState.from_dict(state.to_dict(), issues)
+        self.assertEqual(loaded, state)
+        self.assertEqual(issues, [])
+        self.assertEqual(state.to_dict()["schema_version"], SCHEMA_VERSION)
+
+    def test_coerces_strings_and_clamps(self) -> None:
+        issues = []
+        s = Settings.from_dict(
+            {
+                "loop_delay_ms": "500",
+                "randomize_order": "yes",
+                "overlay_opacity": 5,
+                "random_delay_pct": -4,
+                "mouse_speed": 2.6,
+                "click_delay_ms": "soon",
+            },
+            issues,
+        )
+        self.assertEqual(s.loop_delay_ms, 500)
+        self.assertIs(s.randomize_order, True)
+        self.assertEqual(s.overlay_opacity, 1.0)
+        self.assertEqual(s.random_delay_pct, 0)
+        self.assertEqual(s.mouse_speed, 3)
+        self.assertEqual(s.click_delay_ms, Settings().click_delay_ms)
+        self.assertEqual(len(issues), 6)
+        self.assertTrue(any("click_delay_ms" in i and "invalid" in i for i in issues))
+
+    def test_int_for_float_field_is_silent(self) -> None:
+        issues = []
+        self.assertEqual(Settings.from_dict({"overlay_opacity": 1}, issues).overlay_opacity, 1.0)
+        self.assertEqual(issues, [])
+
+    def test_choices_and_unknown_keys(self) -> None:
+        issues = []
+        state = AppState.from_dict(
+            {
+                "schema_version": SCHEMA_VERSION + 1,
+                "extra": 1,
+                "settings": {"theme": "neon", "legacy_flag": True},
+                "dots": [{"id": "", "click_type": "triple", "delay_override_ms": None, "color": "red"}],
+            },
+            issues,
+        )
+        self.assertEqual(state.settings.theme, "dark")
+        self.assertEqual(state.dots[0].click_type, "click")
+        self.assertIsNone(state.dots[0].delay_override_ms)
+        self.assertEqual(len(state.dots[0].id), 32)
+        joined = "\n".join(issues)
+        for needle in ("newer", "'extra'", "'legacy_flag'", "'color'", "neon", "triple"):
+            self.assertIn(needle, joined)
+
+    def test_missing_and_malformed_sections_use_defaults(self) -> None:
+        self.assertEqual(AppState.from_dict({}).settings, Settings())
+        issues = []
+        self.assertEqual(Settings.from_dict(["not", "a", "dict"], issues), Settings())
+        self.assertEqual(len(issues), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from adoptme_macro.models import Dot
+from adoptme_macro.spatial import HIT_RADIUS, SpatialIndex, duplicate_ids
+
+
+def _brute(dots, x, y, r):
+    return sorted(d.id for d in dots if (d.x - x) ** 2 + (d.y - y) ** 2 <= r * r)
+
+
+class SpatialIndexTests(unittest.TestCase):
+    def test_within_matches_linear_scan(self) -> None:
+        rng = random.Random(7)
+        dots = [Dot(id=f"d{i}", x=rng.randint(-50, 1920), y=rng.randint(-50, 1080)) for i in range(500)]
+        idx = SpatialIndex(cell=32)
+        idx.sync(dots)
+        for _ in range(200):
+            x, y, r = rng.randint(0, 1920), rng.randint(0, 1080), rng.choice([0, 5, 16, 40, 150])
+            self.assertEqual(sorted(idx.within(x, y, r)), _brute(dots, x, y, r))
+
+    def test_results_are_nearest_first(self) -> None:
+        idx = SpatialIndex()
+        idx.move("far", 110, 100)
+        idx.move("near", 102, 100)
+        self.assertEqual(idx.within(100, 100, 20), ["near", "far"])
+        self.assertEqual(idx.hit(100, 100), "near")
+        self.assertIsNone(idx.hit(500, 500))
+
+    def test_move_remove_and_sync(self) -> None:
+        idx = SpatialIndex(cell=10)
+        idx.move("a", 5, 5)
+        idx.move("a", 95, 95)
+        self.assertEqual(idx.within(5, 5, 3), [])
+        self.assertEqual(idx.within(95, 95, 0), ["a"])
+        idx.remove("a")
+        self.assertNotIn("a", idx)
+        self.assertEqual(idx._cells, {})
+
+        dots = [Dot(id="a", x=1, y=1), Dot(id="b", x=2, y=2)]
+        idx.sync(dots)
+        self.assertEqual(len(idx), 2)
+        idx.sync(dots[1:])
+        self.assertEqual(len(idx), 1)
+        self.assertEqual(idx.position("b"), (2, 2))
+
+    def test_near_duplicates_and_duplicate_ids(self) -> None:
+        dots = [
+            Dot(id="a", x=100, y=100),
+            Dot(id="b", x=300, y=300),
+            Dot(id="c", x=104, y=103),
+            Dot(id="d", x=112, y=100),  # touches "c" only, which is dropped; "d" stays
+            Dot(id="e", x=301, y=300),
+        ]
+        idx = SpatialIndex()
+        idx.sync(dots)
+        self.assertEqual(idx.near_duplicates([d.id for d in dots], 10), {"a": ["c"], "b": ["e"]})
+        self.assertEqual(duplicate_ids(dots, 10), ["c", "e"])
+        self.assertEqual(duplicate_ids(dots, 0), [])
+
+    def test_duplicates_are_not_chained(self) -> None:
+        row = [Dot(id=f"d{i}", x=15 * i, y=0) for i in range(10)]
+        drop = duplicate_ids(row, HIT_RADIUS)
+        self.assertEqual(drop, ["d1", "d3", "d5", "d7", "d9"])
+        kept = [d for d in row if d.id not in drop]
+        for d in row:
+            if d.id in drop:
+                self.assertTrue(any(abs(d.x - k.x) <= HIT_RADIUS for k in kept))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from adoptme_macro.dot_table import DotTable
+from adoptme_macro.models import AppState, Dot, Settings
+
+
+def _state(table: bool = False) -> AppState:
+    dots = [Dot(id="a", name="A", x=1, y=1), Dot(id="b", name="B", x=2, y=2)]
+    return AppState(settings=Settings(), dots=DotTable(dots) if table else dots)
+
+
+class StateVersioningTests(unittest.TestCase):
+    def test_versions_are_unique_and_increase(self) -> None:
+        a = _state()
+        b = _state()
+        self.assertNotEqual(a.version, b.version)
+        v = a.version
+        a.update_settings(loop_count=3)
+        self.assertGreater(a.version, v)
+        self.assertGreater(a.copy().version, a.version)
+
+    def test_unchanged_settings_keep_version(self) -> None:
+        st = _state()
+        v = st.version
+        self.assertFalse(st.update_settings(theme=st.settings.theme))
+        self.assertEqual(st.version, v)
+        self.assertFalse(st.take_changes())
+        with self.assertRaises(AttributeError):
+            st.update_settings(no_such_setting=1)
+
+    def test_take_changes_reports_and_resets(self) -> None:
+        st = _state()
+        st.update_settings(loop_count=3)
+        st.update_dot("a", x=10)
+        added = st.add_dot(Dot(id="c", name="C"))
+        st.remove_dots(["b"])
+        changes = st.take_changes()
+        self.assertTrue(changes.settings)
+        self.assertEqual(changes.dots, {"a", "c"})
+        self.assertEqual(changes.removed, {"b"})
+        self.assertFalse(changes.order or changes.all_dots)
+        self.assertIs(st.find_dot("c"), added)
+        self.assertEqual(st.find_dot("a").x, 10)
+        self.assertFalse(st.take_changes())
+
+    def test_remove_then_readd_and_clear(self) -> None:
+        st = _state()
+        st.remove_dots(["a"])
+        st.add_dot(Dot(id="a", name="A again"))
+        changes = st.take_changes()
+        self.assertEqual(changes.dots, {"a"})
+        self.assertEqual(changes.removed, set())
+
+        st.update_dot("a", name="x")
+        st.clear_dots()
+        changes = st.take_changes()
+        self.assertTrue(changes.order)
+        self.assertEqual(changes.dots, set())
+        self.assertEqual(len(st.dots), 0)
+
+    def test_missing_dot_is_not_a_change(self) -> None:
+        st = _state()
+        v = st.version
+        self.assertIsNone(st.update_dot("zz", x=1))
+        self.assertEqual(st.remove_dots(["zz"]), 0)
+        self.assertEqual(st.version, v)
+        with self.assertRaises(AttributeError):
+            st.update_dot("a", id="b")
+
+    def test_bulk_edits_on_list_and_table(self) -> None:
+        for table in (False, True):
+            st = _state(table)
+            st.set_all_positions(5, 6)
+            st.set_all_delays(250)
+            self.assertTrue(st.take_changes().all_dots)
+            self.assertEqual([(d.x, d.y, d.delay_override_ms) for d in st.dots], [(5, 6, 250)] * 2)
+
+    def test_version_is_not_part_of_equality_or_dict(self) -> None:
+        a = _state()
+        b = _state()
+        a.update_settings(loop_count=1)
+        b.update_settings(loop_count=1)
+        self.assertEqual(a, b)
+        self.assertNotIn("version", a.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
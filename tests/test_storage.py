@@ -38,11 +38,63 @@ class StorageTests(unittest.TestCase):
             with patch.object(storage, "project_dir", return_value=root):
                 storage.save_profile("MyProfile", state)
                 loaded = storage.load_profile("MyProfile")
-                names = [n for (n, _mt) in storage.list_profiles()]
+                names = [p.name for p in storage.list_profiles()]
 
             self.assertEqual(loaded.to_dict(), state.to_dict())
             self.assertIn("MyProfile", names)
 
+    def test_list_profiles_reads_headers_and_caches_index(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            state = AppState(
+                settings=Settings(loop_count=3, loop_delay_ms=900),
+                dots=[Dot(id=f"d{i}", name="A") for i in range(4)],
+            )
+
+            with patch.object(storage, "project_dir", return_value=root):
+                storage.save_profile("Json", state)
+                storage.save_profile("Packed.amdots", state)
+                (storage.profiles_dir() / "Legacy.json").write_text(
+                    '{"settings": {"loop_count": 2}, "dots": [{"id": "x"}]}', encoding="utf-8"
+                )
+
+                with patch.object(storage, "decode_profile", wraps=storage.decode_profile) as decode:
+                    summaries = {p.name: p for p in storage.list_profiles()}
+                    self.assertEqual(decode.call_count, 1)  # only the header-less legacy file
+
+                self.assertEqual(summaries["Json"].dot_count, 4)
+                self.assertEqual(summaries["Json"].loop_count, 3)
+                self.assertEqual(summaries["Packed"].loop_delay_ms, 900)
+                self.assertEqual((summaries["Legacy"].dot_count, summaries["Legacy"].loop_count), (1, 2))
+
+                with patch.object(storage, "read_profile_header", side_effect=AssertionError("re-read")):
+                    self.assertEqual(len(storage.list_profiles()), 3)
+
+                storage.save_profile("Json", AppState())
+                self.assertEqual({p.name: p.dot_count for p in storage.list_profiles()}["Json"], 0)
+
+    def test_header_must_lead_the_object(self) -> None:
+        self.assertEqual(storage._leading_header(' {\n  "header": {"dot_count": 2}, "dots": []}'), {"dot_count": 2})
+        self.assertIsNone(storage._leading_header('{"dots": [{"id": "x", "name": "header"}], "header": {"dot_count": 9}}'))
+        self.assertIsNone(storage._leading_header('{"header": {"dot_count": 2'))  # cut off by the probe
+
+    def test_list_profiles_saves_index_through_writer(self) -> None:
+        class Writer:
+            def __init__(self) -> None:
+                self.writes = []
+
+            def write_json(self, path, data, covers=()) -> None:
+                self.writes.append((path, data))
+
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(storage, "project_dir", return_value=Path(td)):
+                storage.save_profile("One", AppState(dots=[Dot(id="a")]))
+                writer = Writer()
+                self.assertEqual([p.dot_count for p in storage.list_profiles(writer=writer)], [1])
+                self.assertFalse(storage.profile_index_path().exists())
+                self.assertEqual([w[0] for w in writer.writes], [storage.profile_index_path()])
+                self.assertIn("One.json", writer.writes[0][1]["files"])
+
 
 if __name__ == "__main__":
     unittest.main()
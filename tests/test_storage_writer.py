@@ -0,0 +1,111 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from adoptme_macro import storage
+from adoptme_macro import storage_writer
+from adoptme_macro.journal import ChangeJournal
+from adoptme_macro.models import AppState, Dot
+from adoptme_macro.storage_writer import StorageWriter
+
+
+class StorageWriterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        self.writer = StorageWriter()
+
+    def tearDown(self) -> None:
+        self.writer.close()
+        self._td.cleanup()
+
+    def _hold_writer(self) -> threading.Event:
+        """Block the writer thread inside its next write until the returned event is set."""
+        release = threading.Event()
+        real = storage_writer.atomic_write_bytes
+
+        def slow(path, data):
+            release.wait(5)
+            real(path, data)
+
+        p = patch.object(storage_writer, "atomic_write_bytes", side_effect=slow)
+        p.start()
+        self.addCleanup(p.stop)
+        return release
+
+    def test_pending_writes_to_same_path_coalesce(self) -> None:
+        release = self._hold_writer()
+        first = self.root / "first.json"
+        target = self.root / "a.json"
+        self.writer.write_json(first, {"n": 0})
+        for i in range(10):
+            self.writer.write_json(target, {"n": i})
+        release.set()
+        self.assertTrue(self.writer.flush(5))
+
+        self.assertEqual(json.loads(target.read_text(encoding="utf-8")), {"n": 9})
+        self.assertEqual(self.writer.written, 2)
+        self.assertEqual(self.writer.coalesced, 9)
+
+    def test_unchanged_content_is_skipped(self) -> None:
+        target = self.root / "a.json"
+        self.writer.write_json(target, {"n": 1})
+        self.writer.flush(5)
+        self.writer.write_json(target, {"n": 1})
+        self.writer.flush(5)
+        self.assertEqual(self.writer.written, 1)
+        self.assertEqual(self.writer.skipped, 1)
+
+    def test_snapshot_drops_covered_journal_appends(self) -> None:
+        release = self._hold_writer()
+        with patch.object(storage, "project_dir", return_value=self.root):
+            state = AppState(dots=[Dot(id="a", name="A", x=1, y=1)])
+            storage.save_profile("blocker", state, writer=self.writer)
+            j = ChangeJournal(storage.journal_path(), writer=self.writer)
+            j.reset(state)
+
+            state.dots[0].x = 5
+            j.record(dots=state.dots)
+            storage.save_config(state, writer=self.writer)
+            state.dots[0].x = 9
+            j.record(dots=state.dots)
+
+            release.set()
+            self.assertTrue(self.writer.flush(5))
+
+            self.assertEqual(storage.journal_path().read_text(encoding="utf-8").count("\n"), 1)
+            self.assertEqual(storage.load_config().to_dict(), state.to_dict())
+
+    def test_write_errors_are_reported(self) -> None:
+        errors = []
+        writer = StorageWriter(on_error=lambda path, e: errors.append(path))
+        self.addCleanup(writer.close)
+        blocked = self.root / "file"
+        blocked.write_text("x", encoding="utf-8")
+        writer.write_json(blocked / "a.json", {})
+        writer.flush(5)
+        self.assertEqual(errors, [blocked / "a.json"])
+
+    def test_call_runs_after_queued_writes_and_may_flush(self) -> None:
+        release = self._hold_writer()
+        path = self.root / "p.json"
+        self.writer.write_json(path, {"v": 1})
+        seen = []
+        done = threading.Event()
+
+        def task() -> None:
+            seen.append(json.loads(path.read_text(encoding="utf-8")))
+            seen.append(self.writer.flush(timeout=5.0))
+            done.set()
+
+        self.writer.call("read", task)
+        release.set()
+        self.assertTrue(done.wait(2.0))
+        self.assertEqual(seen, [{"v": 1}, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
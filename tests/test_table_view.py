@@ -0,0 +1,101 @@
+import unittest
+
+from adoptme_macro.models import Dot
+from adoptme_macro.table_view import DOT_SORT_KEYS, RowIndex, _dot_matches, sync_window
+
+
+class RowIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dots = [
+            Dot(id="a", name="Feed", x=30, y=1),
+            Dot(id="b", name="Bath", x=10, y=2),
+            Dot(id="c", name="Feed again", x=20, y=3, click_type="key", key="{E}"),
+        ]
+        self.index = RowIndex(DOT_SORT_KEYS, _dot_matches)
+        self.index.rebuild(self.dots)
+
+    def test_identity_window(self) -> None:
+        self.assertTrue(self.index.is_identity())
+        self.assertEqual([d.id for d in self.index.window(1, 5)], ["b", "c"])
+        self.assertEqual(self.index.row_of("c"), 2)
+
+    def test_sort_toggles_direction_then_clears(self) -> None:
+        self.index.set_sort("x")
+        self.assertEqual([d.id for d in self.index.window(0, 3)], ["b", "c", "a"])
+        self.index.set_sort("x")
+        self.assertEqual([d.id for d in self.index.window(0, 3)], ["a", "c", "b"])
+        self.index.set_sort("x")
+        self.assertTrue(self.index.is_identity())
+
+    def test_filter_and_row_lookup(self) -> None:
+        self.index.set_filter("feed")
+        self.assertEqual(len(self.index), 2)
+        self.assertIsNone(self.index.row_of("b"))
+        self.assertEqual(self.index.row_of("c"), 1)
+
+        self.index.set_filter("{e}")
+        self.assertEqual([d.id for d in self.index.window(0, 5)], ["c"])
+
+
+class _FakeTree:
+    """Just enough of ttk.Treeview to record what sync_window does."""
+
+    def __init__(self) -> None:
+        self.items = []
+        self.values = {}
+        self.ops = []
+
+    def delete(self, *iids) -> None:
+        self.ops.append(("delete",) + iids)
+        self.items = [i for i in self.items if i not in iids]
+
+    def insert(self, parent, index, iid) -> None:
+        self.ops.append(("insert", iid))
+        self.items.insert(index, iid)
+
+    def move(self, iid, parent, index) -> None:
+        self.ops.append(("move", iid))
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+    def item(self, iid, values=None, tags=None) -> None:
+        self.ops.append(("item", iid, values is not None))
+        if values is not None:
+            self.values[iid] = values
+
+
+class SyncWindowTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dots = [Dot(id=f"d{i}", name=f"Dot {i}", x=i) for i in range(10)]
+        self.tree = _FakeTree()
+        self.rows = {}
+        self.shown = []
+
+    def _sync(self, window, first_row=0):
+        self.tree.ops.clear()
+        self.shown = sync_window(self.tree, self.shown, self.rows, window, lambda d: (d.name, d.x), first_row)
+        self.assertEqual(self.tree.items, [d.id for d in window])
+        self.assertEqual(set(self.rows), set(self.tree.items))
+
+    def test_scroll_only_inserts_and_deletes_the_edges(self) -> None:
+        self._sync(self.dots[0:5])
+        self._sync(self.dots[2:7], first_row=2)
+        self.assertEqual([op for op in self.tree.ops if op[0] != "item"], [("delete", "d0", "d1"), ("insert", "d5"), ("insert", "d6")])
+        # Survivors keep their values; all rows keep their stripe since the offset moved by 2.
+        self.assertEqual([op[1] for op in self.tree.ops if op[0] == "item"], ["d5", "d6"])
+
+    def test_changed_dot_rewrites_only_its_row(self) -> None:
+        self._sync(self.dots[0:5])
+        self.dots[3].x = 300
+        self._sync(self.dots[0:5])
+        self.assertEqual(self.tree.ops, [("item", "d3", True)])
+
+    def test_reorder_moves_rows(self) -> None:
+        self._sync(self.dots[0:5])
+        self._sync(list(reversed(self.dots[0:5])))
+        self.assertTrue(any(op[0] == "move" for op in self.tree.ops))
+        self.assertNotIn("insert", [op[0] for op in self.tree.ops])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from adoptme_macro import runner as runner_mod
+from adoptme_macro.input_backend import InputBackend
+from adoptme_macro.models import Dot, Settings
+from adoptme_macro.runner import MacroRunner
+from adoptme_macro.tracing import Tracer
+
+
+class TracerTests(unittest.TestCase):
+    def test_ring_keeps_newest_events_in_order(self) -> None:
+        tr = Tracer(capacity=4)
+        for i in range(6):
+            tr.complete(f"e{i}", "test", tr.now())
+        self.assertEqual([e[0] for e in tr.events()], ["e2", "e3", "e4", "e5"])
+        self.assertEqual((tr.count, tr.dropped), (4, 2))
+        tr.clear()
+        self.assertEqual((tr.events(), tr.count, tr.dropped), ([], 0, 0))
+
+    def test_chrome_format(self) -> None:
+        tr = Tracer()
+        with tr.span("work", "test", n=3):
+            pass
+        tr.instant("mark", "test")
+        data = tr.to_chrome()
+        events = data["traceEvents"]
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["args"], {"n": 3})
+        self.assertGreaterEqual(events[0]["dur"], 0)
+        self.assertEqual(events[1]["ph"], "i")
+        meta = [e for e in events if e["ph"] == "M"]
+        self.assertEqual(meta[0]["args"]["name"], threading.current_thread().name)
+
+        with tempfile.TemporaryDirectory() as td:
+            path = tr.dump(Path(td) / "sub" / "trace.json")
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8"))["traceEvents"][0]["name"], "work")
+
+
+class _Backend(InputBackend):
+    def __init__(self) -> None:
+        self.clicks = 0
+
+    def move(self, x: int, y: int, speed: int) -> None:
+        pass
+
+    def click(self, x: int, y: int) -> None:
+        self.clicks += 1
+
+
+class RunnerTraceTests(unittest.TestCase):
+    def _runner(self, stopped: threading.Event) -> MacroRunner:
+        return MacroRunner(
+            backend=_Backend(),
+            get_settings=lambda: Settings(click_delay_ms=0, loop_delay_ms=0, loop_count=2),
+            get_dots=lambda: [Dot(id="a"), Dot(id="b", click_type="double")],
+            on_status=lambda st: None,
+            on_flash_dot=lambda dot_id: None,
+            on_started=lambda preview: None,
+            on_stopped=stopped.set,
+        )
+
+    def test_run_writes_trace_to_logs(self) -> None:
+        stopped = threading.Event()
+        r = self._runner(stopped)
+        r._backend.double_click = lambda x, y, click_speed_ms: None  # type: ignore[method-assign]
+        r.tracer = Tracer()
+        with tempfile.TemporaryDirectory() as td:
+            with patch.object(runner_mod, "trace_path", return_value=Path(td) / "trace.json"):
+                r.start()
+                self.assertTrue(stopped.wait(2.0))
+                r._thread.join(2.0)
+            events = json.loads((Path(td) / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+        names = [e["name"] for e in events if e["ph"] == "X"]
+        self.assertEqual(names.count("loop"), 2)
+        self.assertEqual(names.count("dot"), 4)
+        self.assertEqual(names.count("move"), 4)
+        self.assertEqual(names.count("click"), 2)
+        self.assertEqual(names.count("double_click"), 2)
+        self.assertIn("wait", names)
+        self.assertEqual(r.tracer.count, 0)
+
+    def test_no_trace_when_off(self) -> None:
+        stopped = threading.Event()
+        r = self._runner(stopped)
+        r._backend.double_click = lambda x, y, click_speed_ms: None  # type: ignore[method-assign]
+        with patch.object(runner_mod, "trace_path") as tp:
+            r.start()
+            self.assertTrue(stopped.wait(2.0))
+            r._thread.join(2.0)
+        tp.assert_not_called()
+        self.assertEqual(r._backend.clicks, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
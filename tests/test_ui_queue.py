@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+
+from adoptme_macro.ui_queue import UiDispatcher
+
+
+class _FakeRoot:
+    def __init__(self) -> None:
+        self.jobs = {}
+        self.bindings = {}
+        self.generated = threading.Event()
+        self.errors = []
+        self._next = 0
+
+    def after(self, ms, fn):
+        self._next += 1
+        self.jobs[self._next] = (ms, fn)
+        return self._next
+
+    def after_cancel(self, job) -> None:
+        self.jobs.pop(job, None)
+
+    def bind(self, seq, fn, add=None) -> None:
+        self.bindings[seq] = fn
+
+    def event_generate(self, seq, when=None) -> None:
+        if self.errors:
+            raise self.errors.pop(0)
+        self.generated.set()
+
+
+class UiDispatcherTests(unittest.TestCase):
+    def test_drain_runs_in_bounded_batches(self) -> None:
+        root = _FakeRoot()
+        ui = UiDispatcher(root, on_error=lambda: None, batch_max=2, wake=False)
+        ran = []
+        for i in range(5):
+            ui.post(lambda i=i: ran.append(i))
+
+        ui.drain()
+        self.assertEqual(ran, [0, 1])
+        self.assertIsNotNone(ui._continue_job)
+
+        ui.drain()
+        ui.drain()
+        self.assertEqual(ran, [0, 1, 2, 3, 4])
+        ui.close()
+        self.assertEqual(root.jobs, {})
+
+    def test_errors_are_reported_and_draining_continues(self) -> None:
+        errors = []
+        ui = UiDispatcher(_FakeRoot(), on_error=lambda: errors.append(1), wake=False)
+        ran = []
+        ui.post(lambda: 1 / 0)
+        ui.post(lambda: ran.append("ok"))
+        ui.drain()
+        self.assertEqual((errors, ran), ([1], ["ok"]))
+
+    def test_post_from_thread_wakes_tk(self) -> None:
+        root = _FakeRoot()
+        ui = UiDispatcher(root, on_error=lambda: None)
+        threading.Thread(target=lambda: ui.post(lambda: None)).start()
+        self.assertTrue(root.generated.wait(2.0))
+        self.assertIn(UiDispatcher.WAKE_EVENT, root.bindings)
+        ui.close()
+
+    def test_transient_wake_failures_are_retried(self) -> None:
+        root = _FakeRoot()
+        root.errors = [RuntimeError("main thread is not in main loop")] * 2
+        ui = UiDispatcher(root, on_error=lambda: None)
+        ui.WAKE_RETRY_S = 0.001
+        ui.post(lambda: None)
+        self.assertTrue(root.generated.wait(2.0))
+        deadline = time.monotonic() + 2.0
+        while ui._fallback_ms != ui._base_fallback_ms and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertIsNotNone(ui._waker)
+        self.assertEqual(ui._fallback_ms, ui._base_fallback_ms)
+        ui.close()
+
+    def test_non_threaded_tcl_stops_the_waker(self) -> None:
+        root = _FakeRoot()
+        root.errors = [RuntimeError("Calling Tcl from different apartment")]
+        ui = UiDispatcher(root, on_error=lambda: None)
+        waker = ui._waker
+        ui.post(lambda: None)
+        waker.join(2.0)
+        self.assertIsNone(ui._waker)
+        self.assertEqual(ui._fallback_ms, 25)
+        ui.post(lambda: None)
+        self.assertFalse(ui._wake.is_set())
+        ui.close()
+
+
+if __name__ == "__main__":
+    unittest.main()